@@ -0,0 +1,247 @@
+"""
+Non-interactive bulk generation from a section schedule.
+
+    python -m backend.cli schedule.csv -o out/
+    python -m backend.cli schedule.ndjson -o out/ --executor process --workers 8
+    cat schedule.ndjson | python -m backend.cli - -o out/
+
+CSV files need a `component_type` column plus one column per parameter
+(cells that don't apply to a row's type are left blank). NDJSON lines are
+either `{"component_type": ..., "params": {...}}` or flat objects with the
+parameters next to `component_type`. An optional `name` field sets the
+output filename; otherwise files are numbered by input row. Names that
+repeat, or that only differ in characters not allowed in filenames, get a
+numeric suffix (`B-1.dxf`, `B-1_2.dxf`) and a note on stderr.
+
+Rows are read lazily and validated one at a time, valid rows are written by a
+bounded window of worker chunks, and invalid rows are reported on stderr, so
+apart from the set of output names memory use does not depend on the length
+of the schedule.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .interfaces.validator import Validator
+from .services.dxf_service import DXFService, EXECUTOR_MODES, WRITER_MODES
+
+INPUT_FORMATS = ("csv", "ndjson")
+# Columns that describe the row rather than the component's parameters
+RESERVED_FIELDS = ("component_type", "name")
+
+class SpecRecord:
+    __slots__ = ("line", "component_type", "params", "name", "error")
+
+    def __init__(self, line: int, component_type: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                 name: Optional[str] = None, error: Optional[str] = None):
+        self.line = line
+        self.component_type = component_type
+        self.params = params
+        self.name = name
+        self.error = error
+
+def detect_format(path: str, first_line: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    return "ndjson" if first_line.lstrip().startswith("{") else "csv"
+
+def _record(line: int, fields: Dict[str, Any], params: Dict[str, Any]) -> SpecRecord:
+    component_type = fields.get("component_type")
+    if not component_type:
+        return SpecRecord(line, error="Missing component_type")
+    name = fields.get("name") or None
+    return SpecRecord(line, str(component_type).strip().lower(), params, name)
+
+def iter_csv_records(lines: Iterable[str]) -> Iterator[SpecRecord]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        params = {}
+        error = None
+        for key, value in row.items():
+            if key in RESERVED_FIELDS or key is None or value is None or not value.strip():
+                continue
+            try:
+                params[key.strip()] = float(value)
+            except ValueError:
+                error = f"Error: {key} must be a number."
+                break
+        if error is not None:
+            yield SpecRecord(reader.line_num, error=error)
+        else:
+            yield _record(reader.line_num, row, params)
+
+def iter_ndjson_records(lines: Iterable[str]) -> Iterator[SpecRecord]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield SpecRecord(line_number, error=f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(item, dict):
+            yield SpecRecord(line_number, error="Expected a JSON object")
+            continue
+        params = item.get("params")
+        if params is None:
+            params = {key: value for key, value in item.items() if key not in RESERVED_FIELDS}
+        if not isinstance(params, dict):
+            yield SpecRecord(line_number, error="params must be an object")
+            continue
+        yield _record(line_number, item, params)
+
+def iter_records(stream: IO[str], input_format: Optional[str] = None, path: str = "-") -> Iterator[SpecRecord]:
+    """Lazily parses a CSV or NDJSON schedule, detecting the format when not given."""
+    first_line = stream.readline()
+    lines = itertools.chain([first_line], stream)
+    if input_format is None:
+        input_format = detect_format(path, first_line)
+    if input_format == "csv":
+        return iter_csv_records(lines)
+    return iter_ndjson_records(lines)
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+def output_filename(output_dir: str, index: int, record: SpecRecord) -> str:
+    if record.name:
+        stem = _UNSAFE_FILENAME.sub("_", record.name).strip("._") or f"{index:06d}"
+    else:
+        stem = f"{index:06d}_{record.component_type}"
+    if not stem.lower().endswith(".dxf"):
+        stem += ".dxf"
+    return os.path.join(output_dir, stem)
+
+def claim_filename(filename: str, taken: Set[str]) -> str:
+    """
+    `filename`, or the first free `<stem>_<n>.dxf` when it is already in
+    `taken`. Names are compared case-insensitively so they stay distinct on
+    case-insensitive filesystems; the chosen name is added to `taken`.
+    """
+    stem, extension = os.path.splitext(filename)
+    candidate = filename
+    suffix = 1
+    while candidate.lower() in taken:
+        suffix += 1
+        candidate = f"{stem}_{suffix}{extension}"
+    taken.add(candidate.lower())
+    return candidate
+
+class PipelineStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.read = 0
+        self.invalid = 0
+        self.written = 0
+        self.failed = 0
+        self.bytes = 0
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "read": self.read,
+            "written": self.written,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "elapsed_s": round(elapsed, 3),
+            "items_per_sec": round(self.written / elapsed, 1) if elapsed > 0 else 0.0,
+            "mb_per_sec": round(self.bytes / elapsed / 1e6, 2) if elapsed > 0 else 0.0,
+        }
+
+    def line(self) -> str:
+        s = self.summary()
+        return (f"{s['read']} read, {s['written']} written, {s['invalid']} invalid, {s['failed']} failed "
+                f"in {s['elapsed_s']:.1f}s ({s['items_per_sec']:.0f} items/s, {s['mb_per_sec']:.1f} MB/s)")
+
+def run_pipeline(records: Iterable[SpecRecord], output_dir: Optional[str], service: DXFService,
+                 stats: PipelineStats, progress_every: int = 0, window: Optional[int] = None,
+                 err: Optional[IO[str]] = None) -> PipelineStats:
+    """
+    Validates records and streams the valid ones through `service`. With no
+    `output_dir` the schedule is only validated. Problems go to `err` (stderr).
+    """
+    err = err or sys.stderr
+    taken: Set[str] = set()
+
+    def valid_items() -> Iterator[Tuple[Tuple[str, Tuple], str]]:
+        for record in records:
+            stats.read += 1
+            if record.error is None:
+                result = Validator.check(record.component_type, record.params)
+                if not result.ok:
+                    record.error = result.message
+            if record.error is not None:
+                stats.invalid += 1
+                print(f"line {record.line}: {record.error}", file=err)
+                continue
+            if output_dir is None:
+                continue
+            requested = output_filename(output_dir, stats.read, record)
+            filename = claim_filename(requested, taken)
+            if filename != requested:
+                print(f"line {record.line}: {os.path.basename(requested)} is already used, "
+                      f"writing {os.path.basename(filename)}", file=err)
+            yield (record.component_type, tuple(record.params.items())), filename
+
+    if output_dir is None:
+        for _ in valid_items():
+            pass
+        return stats
+
+    os.makedirs(output_dir, exist_ok=True)
+    for filename, error in service.iter_save_stream(valid_items(), window=window):
+        if error is not None:
+            stats.failed += 1
+            print(f"Error generating DXF: {error}", file=err)
+            continue
+        stats.written += 1
+        stats.bytes += os.path.getsize(filename)
+        if progress_every and stats.written % progress_every == 0:
+            print(stats.line(), file=err, flush=True)
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate DXF files from a CSV or NDJSON section schedule.")
+    parser.add_argument("input", help="schedule file, or - for stdin")
+    parser.add_argument("-o", "--output-dir", help="directory for the generated files (omit with --dry-run)")
+    parser.add_argument("--format", choices=INPUT_FORMATS, help="input format (default: detect)")
+    parser.add_argument("--executor", choices=EXECUTOR_MODES, default="process",
+                        help="where drawings are rendered (default: process)")
+    parser.add_argument("--writer", choices=WRITER_MODES, help="DXF serializer (default: DXF_WRITER or ezdxf)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--chunk-size", type=int, help="items per worker task")
+    parser.add_argument("--window", type=int, help="worker tasks in flight (default: 2 per worker)")
+    parser.add_argument("--progress", type=int, default=0, metavar="N", help="print progress every N files")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--json", action="store_true", help="print the final statistics as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.dry_run and not args.output_dir:
+        parser.error("--output-dir is required unless --dry-run is given")
+
+    stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    stats = PipelineStats()
+    try:
+        with DXFService(max_workers=args.workers, executor=args.executor, batch_chunksize=args.chunk_size,
+                        writer=args.writer) as service:
+            records = iter_records(stream, args.format, args.input)
+            run_pipeline(records, None if args.dry_run else args.output_dir, service, stats,
+                         progress_every=args.progress, window=args.window)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(json.dumps(stats.summary()) if args.json else stats.line())
+    return 1 if stats.invalid or stats.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,5 @@
 from .beam import IBeam
-from .column import Column # Assuming a Column class will be added later
\ No newline at end of file
+from .column import Column
+from .hollow import HollowSection
+from .registry import (register_component, get_spec, find_spec, spec_for, spec_for_vertex_count, specs_for_vertex_count,
+                       component_types)
@@ -1,7 +1,24 @@
 class BaseComponent:
+    # Lets slotted subclasses (e.g. batch item views) stay free of a __dict__
+    __slots__ = ()
+
     def __init__(self):
         pass
 
+    def get_points(self):
+        """
+        This method should be implemented by subclasses to return the closed
+        profile outline as a list of (x, y) tuples.
+        """
+        raise NotImplementedError("Subclasses must implement the 'get_points' method")
+
+    def get_outlines(self):
+        """
+        The closed polylines `draw` adds. Single-outline profiles draw just
+        `get_points()`; profiles with holes override this.
+        """
+        return [self.get_points()]
+
     def draw(self, msp):
         """
         This method should be implemented by subclasses to draw the component
@@ -0,0 +1,153 @@
+from typing import Any, Dict, Iterable, Iterator, List, Union
+import numpy as np
+from .base_component import BaseComponent
+from .registry import ComponentSpec, get_spec, spec_for
+from ..interfaces.validator import BatchValidation, Validator
+from ..services.section_properties import PROPERTY_NAMES, batch_polygon_properties
+
+# Items per vectorized vertex block; bounds the (N, M, 2) temporaries
+VERTEX_CHUNK_SIZE = 65536
+
+class ComponentView(BaseComponent):
+    """
+    One item of a ComponentBatch. Holds only the batch and an index, and
+    behaves like the component it stands for: parameters are attributes and
+    `get_points` / `draw` match the regular class.
+    """
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "ComponentBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def component_spec(self) -> ComponentSpec:
+        return self._batch.spec
+
+    def __getattr__(self, name: str) -> float:
+        # Only reached for names that aren't slots, i.e. component parameters
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return float(self._batch.columns[name][self._index])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def params(self) -> Dict[str, float]:
+        return {name: float(column[self._index]) for name, column in self._batch.columns.items()}
+
+    def get_points(self) -> List[tuple]:
+        i = self._index
+        points = self._batch.spec.points_array({name: column[i:i + 1] for name, column in self._batch.columns.items()})
+        return [tuple(point) for point in points[0].tolist()]
+
+    def get_outlines(self) -> List[List[tuple]]:
+        return self._batch.spec.outlines(self.get_points())
+
+    def draw(self, msp):
+        for outline in self.get_outlines():
+            msp.add_lwpolyline(outline, close=True)
+
+    def __repr__(self) -> str:
+        return f"ComponentView({self._batch.spec.component_type!r}, {self.params()!r})"
+
+class ComponentBatch:
+    """
+    Many components of one registered type stored column-wise: one contiguous
+    float64 array per parameter instead of one Python object per item.
+
+    Vertices, validation and section properties are computed for the whole
+    batch with vectorized calls. Indexing with an int gives a ComponentView;
+    slices, masks and index arrays give another batch (slices share memory).
+    Because a batch is a sequence of components, it can be handed to
+    DXFService batch methods and SheetLayout as is.
+    """
+    __slots__ = ("spec", "columns", "_length")
+
+    def __init__(self, component_type: str, columns: Dict[str, Any]):
+        self.spec = get_spec(component_type)
+        missing = set(self.spec.param_names) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns for {component_type}: {sorted(missing)}")
+        self.columns = {name: np.ascontiguousarray(columns[name], dtype=np.float64).reshape(-1)
+                        for name in self.spec.param_names}
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("Columns must have equal length")
+        self._length = lengths.pop()
+
+    @classmethod
+    def from_records(cls, component_type: str, records: Iterable[Dict[str, Any]]) -> "ComponentBatch":
+        """Builds a batch from parameter dicts without keeping them around."""
+        spec = get_spec(component_type)
+        rows = np.array([[record[name] for name in spec.param_names] for record in records], dtype=np.float64)
+        rows = rows.reshape(-1, len(spec.param_names))
+        return cls(component_type, {name: rows[:, i] for i, name in enumerate(spec.param_names)})
+
+    @classmethod
+    def from_components(cls, components: Iterable[Any]) -> "ComponentBatch":
+        components = list(components)
+        if not components:
+            raise ValueError("Cannot infer the component type of an empty batch")
+        spec = spec_for(components[0])
+        if spec is None or any(spec_for(component) is not spec for component in components):
+            raise ValueError("All components must be of the same registered type")
+        return cls.from_records(spec.component_type, (spec.describe(component) for component in components))
+
+    @property
+    def component_type(self) -> str:
+        return self.spec.component_type
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray, List[int]]) -> Union[ComponentView, "ComponentBatch"]:
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("ComponentBatch index out of range")
+            return ComponentView(self, index)
+        return ComponentBatch(self.spec.component_type, {name: column[key] for name, column in self.columns.items()})
+
+    def __iter__(self) -> Iterator[ComponentView]:
+        for index in range(self._length):
+            yield ComponentView(self, index)
+
+    def params(self, index: int) -> Dict[str, float]:
+        return self[index].params()
+
+    def vertices(self) -> np.ndarray:
+        """(N, M, 2) outlines of every item in one vectorized call."""
+        return self.spec.points_array(self.columns)
+
+    def iter_vertices(self, chunk_size: int = VERTEX_CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """Outlines in (chunk, M, 2) blocks, for consumers that shouldn't hold all N at once."""
+        for start in range(0, self._length, chunk_size):
+            yield self.spec.points_array({name: column[start:start + chunk_size] for name, column in self.columns.items()})
+
+    def validate(self) -> BatchValidation:
+        return Validator.check_batch(self.spec.component_type, self.columns)
+
+    def section_properties(self, chunk_size: int = VERTEX_CHUNK_SIZE, allow_degenerate: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Section properties of every item, evaluated block by block to bound
+        memory. With `allow_degenerate`, zero-area items get NaN instead of
+        failing the whole batch.
+        """
+        blocks = [batch_polygon_properties(vertices, allow_degenerate) for vertices in self.iter_vertices(chunk_size)]
+        if not blocks:
+            return {name: np.empty(0) for name in PROPERTY_NAMES}
+        return {name: np.concatenate([block[name] for block in blocks]) for name in PROPERTY_NAMES}
+
+    def __reduce__(self):
+        # Specs hold registry callables, so pickle by component type
+        return ComponentBatch, (self.spec.component_type, self.columns)
+
+    def __repr__(self) -> str:
+        return f"ComponentBatch({self.spec.component_type!r}, {self._length} items)"
@@ -1,7 +1,31 @@
-import ezdxf
+import numpy as np
 from .base_component import BaseComponent
+from .registry import register_component
 
+@register_component
 class IBeam(BaseComponent):
+    component_type = "beam"
+    # (name, min, max, description) in constructor order
+    parameters = (
+        ("H", 1, 100000, "Total depth (H)"),
+        ("B", 1, 100000, "Flange width (B)"),
+        ("tw", 1, 100000, "Web thickness (tw)"),
+        ("tf", 1, 100000, "Flange thickness (tf)"),
+    )
+    vertex_count = 12
+    # Thicker plates make the outline cross itself
+    constraint_rules = (
+        ("Error: Web thickness (tw) must be less than the flange width (B).",
+         lambda p: p["tw"] >= p["B"]),
+        ("Error: Flange thickness (tf) must be less than half of the depth (H).",
+         lambda p: 2 * p["tf"] >= p["H"]),
+    )
+    # Advisories for valid but unusual proportions; predicates also accept arrays
+    warning_rules = (
+        ("H/B ratio exceeds 10, which is unusual for standard I-beams. Consider revising dimensions.",
+         lambda p: p["H"] > 10 * p["B"]),
+    )
+
     def __init__(self, H, B, tw, tf):
         """
         H  = Total depth of I-beam
@@ -14,8 +38,7 @@ class IBeam(BaseComponent):
         self.tw = tw
         self.tf = tf
 
-    def draw(self, msp):
-
+    def get_points(self):
         # Calculations for drawing
         half_B = self.B / 2
         half_tw = self.tw / 2
@@ -35,5 +58,37 @@ class IBeam(BaseComponent):
             (-half_tw, half_H - self.tf),
             (-half_B,  half_H - self.tf),
         ]
+        return points
+
+    @staticmethod
+    def points_array(H, B, tw, tf):
+        """
+        Vectorized get_points: takes equal-length arrays of parameters and
+        returns an (N, 12, 2) array with the same vertex order.
+        """
+        half_B = np.asarray(B, dtype=float) / 2
+        half_tw = np.asarray(tw, dtype=float) / 2
+        half_H = np.asarray(H, dtype=float) / 2
+        tf = np.asarray(tf, dtype=float)
+        xs = np.stack([-half_B, half_B, half_B, half_tw, half_tw, half_B,
+                       half_B, -half_B, -half_B, -half_tw, -half_tw, -half_B], axis=-1)
+        ys = np.stack([half_H, half_H, half_H - tf, half_H - tf, -half_H + tf, -half_H + tf,
+                       -half_H, -half_H, -half_H + tf, -half_H + tf, half_H - tf, half_H - tf], axis=-1)
+        return np.stack([xs, ys], axis=-1)
 
-        msp.add_lwpolyline(points, close=True)
+    @staticmethod
+    def params_from_points(coords):
+        """
+        Inverse of points_array for parsing: recovers H, B, tw, tf from an
+        (N, 12, 2) array of outlines in the same vertex order.
+        """
+        extent = coords.max(axis=1) - coords.min(axis=1)
+        return {
+            'H': extent[:, 1],
+            'B': extent[:, 0],
+            'tw': np.abs(coords[:, 3, 0] - coords[:, 10, 0]),
+            'tf': np.abs(coords[:, 0, 1] - coords[:, 11, 1]),
+        }
+
+    def draw(self, msp):
+        msp.add_lwpolyline(self.get_points(), close=True)
@@ -1,17 +1,48 @@
 from .base_component import BaseComponent
-import ezdxf
+from .registry import register_component
+import numpy as np
 
+@register_component
 class Column(BaseComponent):
+    component_type = "column"
+    # (name, min, max, description) in constructor order
+    parameters = (
+        ("width", 1, 100000, "Width"),
+        ("height", 1, 100000, "Height"),
+    )
+    vertex_count = 4
+
     def __init__(self, width, height):
         self.width = width
         self.height = height
 
-    def draw(self, msp):
-        # Draw a simple rectangle for the column
-        points = [
+    def get_points(self):
+        # A simple rectangle for the column
+        return [
             (0, 0),
             (self.width, 0),
             (self.width, self.height),
             (0, self.height)
         ]
-        msp.add_lwpolyline(points, close=True)
\ No newline at end of file
+
+    @staticmethod
+    def points_array(width, height):
+        """
+        Vectorized get_points: takes equal-length arrays of parameters and
+        returns an (N, 4, 2) array with the same vertex order.
+        """
+        width = np.asarray(width, dtype=float)
+        height = np.asarray(height, dtype=float)
+        zeros = np.zeros_like(width + height)
+        xs = np.stack([zeros, width + zeros, width + zeros, zeros], axis=-1)
+        ys = np.stack([zeros, zeros, height + zeros, height + zeros], axis=-1)
+        return np.stack([xs, ys], axis=-1)
+
+    @staticmethod
+    def params_from_points(coords):
+        """Inverse of points_array for parsing: width and height from (N, 4, 2) outlines."""
+        extent = coords.max(axis=1) - coords.min(axis=1)
+        return {'width': extent[:, 0], 'height': extent[:, 1]}
+
+    def draw(self, msp):
+        msp.add_lwpolyline(self.get_points(), close=True)
\ No newline at end of file
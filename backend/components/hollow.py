@@ -0,0 +1,96 @@
+import numpy as np
+from .base_component import BaseComponent
+from .registry import register_component
+
+@register_component
+class HollowSection(BaseComponent):
+    """
+    Rectangular or square hollow section (RHS / SHS) with sharp corners,
+    centred on the origin and drawn as an outer and an inner closed polyline.
+    """
+    component_type = "hollow"
+    # (name, min, max, description) in constructor order
+    parameters = (
+        ("H", 1, 100000, "Total depth (H)"),
+        ("B", 1, 100000, "Width (B)"),
+        ("t", 0.1, 100000, "Wall thickness (t)"),
+    )
+    # Two polylines, so it can't be recognized from a single one
+    vertex_count = None
+    constraint_rules = (
+        ("Error: Wall thickness (t) must be less than half of the depth and width.",
+         lambda p: (2 * p["t"] >= p["H"]) | (2 * p["t"] >= p["B"])),
+    )
+
+    def __init__(self, H, B, t):
+        """
+        H = Total depth
+        B = Width
+        t = Wall thickness
+        """
+        self.H = H
+        self.B = B
+        self.t = t
+
+    def get_points(self):
+        """
+        Keyhole outline: the outer rectangle counter-clockwise, then the inner
+        one clockwise, joined by a zero-width slit. As one polygon it has the
+        hollow section's area and inertia, so the shoelace formulas apply.
+        """
+        return [tuple(point) for point in self.points_array(self.H, self.B, self.t)[0].tolist()]
+
+    @staticmethod
+    def points_array(H, B, t):
+        """
+        Vectorized get_points: takes equal-length arrays of parameters and
+        returns an (N, 10, 2) array of keyhole outlines.
+        """
+        half_H = np.atleast_1d(np.asarray(H, dtype=float)) / 2
+        half_B = np.atleast_1d(np.asarray(B, dtype=float)) / 2
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        inner_H = half_H - t
+        inner_B = half_B - t
+        xs = np.stack([-half_B, half_B, half_B, -half_B, -half_B,
+                       -inner_B, -inner_B, inner_B, inner_B, -inner_B], axis=-1)
+        ys = np.stack([-half_H, -half_H, half_H, half_H, -half_H,
+                       -inner_H, inner_H, inner_H, -inner_H, -inner_H], axis=-1)
+        return np.stack([xs, ys], axis=-1)
+
+    @staticmethod
+    def split_outlines(points):
+        """Outer and inner rectangles of a keyhole outline."""
+        return [list(points[0:4]), list(points[5:9])]
+
+    @staticmethod
+    def params_from_outlines(outer, inner, tolerance=1e-4):
+        """
+        Inverse of split_outlines for parsing: H, B and t from (N, 4, 2) outer
+        and inner outlines. Rows that aren't a hollow section (not axis-aligned
+        rectangles, or walls differing by more than `tolerance` times the
+        section size) get NaN for every parameter.
+        """
+        low, high = outer.min(axis=1), outer.max(axis=1)
+        inner_low, inner_high = inner.min(axis=1), inner.max(axis=1)
+        extent = high - low
+        tol = tolerance * extent.max(axis=1)
+
+        def is_rectangle(coords, low, high):
+            # Each vertex on a distinct corner of its own bounding box
+            at_low = np.abs(coords - low[:, None, :]) <= tol[:, None, None]
+            at_high = np.abs(coords - high[:, None, :]) <= tol[:, None, None]
+            corners = np.sort(at_high[..., 0] + 2 * at_high[..., 1], axis=1)
+            return (at_low | at_high).all(axis=(1, 2)) & (corners == np.arange(4)).all(axis=1)
+
+        walls = np.concatenate([inner_low - low, high - inner_high], axis=1)
+        valid = (is_rectangle(outer, low, high) & is_rectangle(inner, inner_low, inner_high)
+                 & (walls.min(axis=1) > 0) & (np.ptp(walls, axis=1) <= tol))
+        params = {'H': extent[:, 1], 'B': extent[:, 0], 't': walls.mean(axis=1)}
+        return {name: np.where(valid, column, np.nan) for name, column in params.items()}
+
+    def get_outlines(self):
+        return self.split_outlines(self.get_points())
+
+    def draw(self, msp):
+        for outline in self.get_outlines():
+            msp.add_lwpolyline(outline, close=True)
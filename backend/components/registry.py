@@ -0,0 +1,175 @@
+import functools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+class ParamSpec:
+    __slots__ = ("name", "min", "max", "description")
+
+    def __init__(self, name: str, min: float, max: float, description: str):
+        self.name = name
+        self.min = min
+        self.max = max
+        self.description = description
+
+    def rule(self) -> Dict[str, Any]:
+        return {'min': self.min, 'max': self.max, 'description': self.description}
+
+class ComponentSpec:
+    """
+    Everything the request path needs to know about one component type, built
+    when the class is registered (validation rules on first use):
+
+        parameters    - ordered ParamSpecs with validation bounds
+        build         - constructs the component from a params dict
+        describe      - recovers the params dict from a component
+        points_array  - vectorized outline generator over parameter columns
+        vertex_count  - outline size used to recognize the profile when parsing
+                        (None if it can't be recognized from one polyline)
+        params_from_points - vectorized inverse of points_array for parsing
+        constraint_rules - `(message, predicate)` cross-parameter errors; the
+                        predicate is true for invalid params
+        warning_rules - `(message, predicate)` advisories
+        split_outlines - turns `get_points()` into the closed polylines drawn
+
+    Predicates take a params mapping of scalars or of equal-length arrays.
+    """
+    def __init__(self, component_type: str, cls: type, parameters: Tuple[ParamSpec, ...], vertex_count: Optional[int],
+                 points_array: Callable, params_from_points: Optional[Callable],
+                 warning_rules: Tuple[Tuple[str, Callable], ...] = (),
+                 constraint_rules: Tuple[Tuple[str, Callable], ...] = (),
+                 split_outlines: Optional[Callable] = None):
+        self.component_type = component_type
+        self.cls = cls
+        self.parameters = parameters
+        self.param_names = tuple(p.name for p in parameters)
+        self.vertex_count = vertex_count
+        self._points_array = points_array
+        self._params_from_points = params_from_points
+        self.warning_rules = warning_rules
+        self.constraint_rules = constraint_rules
+        self._split_outlines = split_outlines
+
+    @functools.cached_property
+    def rules(self) -> Dict[str, Dict[str, Any]]:
+        """`{param: {"min", "max", "description"}}`, the legacy validation rule format."""
+        return {p.name: p.rule() for p in self.parameters}
+
+    def build(self, params: Dict[str, Any]) -> Any:
+        return self.cls(*[params[name] for name in self.param_names])
+
+    def describe(self, component: Any) -> Dict[str, Any]:
+        return {name: getattr(component, name) for name in self.param_names}
+
+    def points_array(self, columns: Dict[str, Any]) -> np.ndarray:
+        return self._points_array(*[columns[name] for name in self.param_names])
+
+    def params_from_points(self, coords: np.ndarray) -> Dict[str, np.ndarray]:
+        return self._params_from_points(coords)
+
+    def reproduces(self, coords: np.ndarray, columns: Dict[str, np.ndarray], tolerance: float = 1e-4) -> np.ndarray:
+        """
+        Per row of (N, vertex_count, 2) `coords`, whether the outline drawn
+        from `columns` has the same shape, vertex by vertex, up to translation
+        and `tolerance` times the outline size.
+        """
+        drawn = self.points_array(columns)
+        offset = (coords - coords[:, :1]) - (drawn - drawn[:, :1])
+        size = (coords.max(axis=1) - coords.min(axis=1)).max(axis=1)
+        with np.errstate(invalid="ignore"):
+            return np.abs(offset).max(axis=(1, 2)) <= tolerance * size
+
+    def outlines(self, points: List[Any]) -> List[List[Any]]:
+        """Closed polylines that `draw` adds for an item whose `get_points()` is `points`."""
+        if self._split_outlines is None:
+            return [points]
+        return self._split_outlines(points)
+
+    def warnings(self, params: Dict[str, Any]) -> List[str]:
+        """Advisory messages for params that already passed validation."""
+        return [message for message, predicate in self.warning_rules if predicate(params)]
+
+_by_type: Dict[str, ComponentSpec] = {}
+_by_class: Dict[type, ComponentSpec] = {}
+# Several components may share an outline size; classification tries them in registration order
+_by_vertex_count: Dict[int, List[ComponentSpec]] = {}
+
+def register_component(cls: type) -> type:
+    """
+    Class decorator adding a component to the registry. The class declares:
+
+        component_type = "beam"
+        parameters = (("H", min, max, "Total depth (H)"), ...)   # constructor order
+        vertex_count = 12
+        points_array(*columns)         staticmethod, (N, vertex_count, 2) outlines
+        params_from_points(coords)     staticmethod, dict of parameter arrays
+        constraint_rules = ((message, predicate), ...)           # optional
+        warning_rules = ((message, predicate), ...)              # optional
+        split_outlines(points)         optional staticmethod
+
+    `draw` must add exactly the closed polylines given by `split_outlines`
+    (by default the single `get_points()` outline). Components that can't be
+    recognized from one polyline set `vertex_count = None` and may omit
+    params_from_points.
+    """
+    component_type = cls.component_type
+    if component_type in _by_type:
+        raise ValueError(f"Component type '{component_type}' is already registered")
+    spec = ComponentSpec(
+        component_type,
+        cls,
+        tuple(ParamSpec(*p) for p in cls.parameters),
+        cls.vertex_count,
+        cls.points_array,
+        getattr(cls, "params_from_points", None),
+        tuple(getattr(cls, "warning_rules", ())),
+        tuple(getattr(cls, "constraint_rules", ())),
+        getattr(cls, "split_outlines", None),
+    )
+    _by_type[component_type] = spec
+    _by_class[cls] = spec
+    if spec.vertex_count is not None:
+        _by_vertex_count.setdefault(spec.vertex_count, []).append(spec)
+    return cls
+
+def get_spec(component_type: str) -> ComponentSpec:
+    spec = _by_type.get(component_type)
+    if spec is None:
+        raise ValueError("Unsupported component type")
+    return spec
+
+def find_spec(component_type: str) -> Optional[ComponentSpec]:
+    return _by_type.get(component_type)
+
+def spec_for(component: Any) -> Optional[ComponentSpec]:
+    """
+    Spec of the component's exact class; subclasses are not assumed to share it.
+    Stand-ins such as batch item views name their spec via `component_spec`.
+    """
+    spec = _by_class.get(type(component))
+    if spec is None:
+        spec = getattr(component, "component_spec", None)
+    return spec
+
+def specs_for_vertex_count(vertex_count: int) -> List[ComponentSpec]:
+    """Every component whose outline has `vertex_count` points, in registration order."""
+    return list(_by_vertex_count.get(vertex_count, ()))
+
+def spec_for_vertex_count(vertex_count: int) -> Optional[ComponentSpec]:
+    """The first registered component with that outline size."""
+    specs = _by_vertex_count.get(vertex_count)
+    return specs[0] if specs else None
+
+def all_specs() -> List[ComponentSpec]:
+    return list(_by_type.values())
+
+def component_types() -> List[str]:
+    return list(_by_type)
+
+def unregister_component(component_type: str) -> None:
+    spec = _by_type.pop(component_type)
+    del _by_class[spec.cls]
+    specs = _by_vertex_count.get(spec.vertex_count, [])
+    if spec in specs:
+        specs.remove(spec)
+        if not specs:
+            del _by_vertex_count[spec.vertex_count]
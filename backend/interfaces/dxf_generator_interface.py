@@ -1,5 +1,5 @@
-from ..components.beam import IBeam
-from ..components.column import Column
+from typing import Any, Dict, Optional, Tuple
+from ..components.registry import get_spec, spec_for
 
 class DXFGeneratorInterface:
     def __init__(self, component_type: str, params: dict):
@@ -7,9 +7,15 @@ class DXFGeneratorInterface:
         self.params = params
 
     def get_component(self):
-        if self.component_type == "beam":
-            return IBeam(self.params['H'], self.params['B'], self.params['tw'], self.params['tf'])
-        elif self.component_type == "column":
-            return Column(self.params['width'], self.params['height'])
-        else:
-            raise ValueError("Unsupported component type")
\ No newline at end of file
+        return get_spec(self.component_type).build(self.params)
+
+    @staticmethod
+    def describe(component: Any) -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Returns the `(component_type, params)` pair that rebuilds the component
+        through `get_component`, or None for classes this factory doesn't know.
+        """
+        spec = spec_for(component)
+        if spec is None:
+            return None
+        return spec.component_type, spec.describe(component)
@@ -1,16 +1,18 @@
 from typing import Dict, Any
-from interfaces.validator import Validator # Import the Validator class
+from ..components.registry import component_types, find_spec
+from .validator import Validator # Import the Validator class
 
 class UserInputInterface:
     def __init__(self):
         pass
 
     def get_component_choice(self) -> str:
+        choices = component_types()
         while True:
-            component = input("Select Component Type (beam/column): ").strip().lower()
-            if component in ("beam", "column"):
+            component = input(f"Select Component Type ({'/'.join(choices)}): ").strip().lower()
+            if component in choices:
                 return component
-            print("Invalid component. Type 'beam' or 'column'.")
+            print(f"Invalid component. Type one of: {', '.join(choices)}.")
 
     def get_generation_mode(self) -> str:
         while True:
@@ -32,27 +34,16 @@ class UserInputInterface:
                 print("Error: Invalid number. Please enter a valid number.")
 
     def get_params(self, component: str) -> Dict[str, float]:
-        params = {}
-        if component == "beam":
-            print("Enter parameters for I-beam:")
-            params["H"] = self._get_float_input("Enter total depth (H): ")
-            params["B"] = self._get_float_input("Enter flange width (B): ")
-            params["tw"] = self._get_float_input("Enter web thickness (tw): ")
-            params["tf"] = self._get_float_input("Enter flange thickness (tf): ")
-            # Validate beam parameters using the Validator class
-            is_valid, error_msg = Validator.validate_beam(params)
-            if not is_valid:
-                print(f"Beam parameters are invalid: {error_msg}")
-                return self.get_params(component) # Re-prompt for input
-        elif component == "column":
-            print("Enter parameters for column:")
-            params["width"] = self._get_float_input("Enter width: ")
-            params["height"] = self._get_float_input("Enter height: ")
-            # Validate column parameters using the Validator class
-            is_valid, error_msg = Validator.validate_column(params)
-            if not is_valid:
-                print(f"Column parameters are invalid: {error_msg}")
-                return self.get_params(component) # Re-prompt for input
-        else:
+        spec = find_spec(component)
+        if spec is None:
             raise ValueError("Invalid component selected.")
-        return params
\ No newline at end of file
+        params = {}
+        print(f"Enter parameters for {component}:")
+        for param in spec.parameters:
+            params[param.name] = self._get_float_input(f"Enter {param.description}: ")
+        # Validate parameters using the Validator class
+        is_valid, error_msg = Validator.validate(component, params)
+        if not is_valid:
+            print(f"{component.capitalize()} parameters are invalid: {error_msg}")
+            return self.get_params(component) # Re-prompt for input
+        return params
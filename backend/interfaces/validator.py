@@ -1,48 +1,179 @@
-import re
-from typing import Dict, Any
+import logging
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from ..components.registry import ComponentSpec, all_specs, find_spec
+
+logger = logging.getLogger(__name__)
+
+class _RegistryRules(Mapping):
+    """
+    Read-only `{component_type: {param: rule}}` view over the component
+    registry, so components registered later are validated without edits here.
+    """
+    def __getitem__(self, component_type: str) -> Dict[str, Dict[str, Any]]:
+        spec = find_spec(component_type)
+        if spec is None:
+            raise KeyError(component_type)
+        return spec.rules
+
+    def __iter__(self):
+        return iter([spec.component_type for spec in all_specs()])
+
+    def __len__(self) -> int:
+        return len(all_specs())
+
+class ValidationResult:
+    """Every violation found for one item, plus advisory warnings when it is valid."""
+    __slots__ = ("errors", "warnings")
+
+    def __init__(self, errors: List[str], warnings: List[str]):
+        self.errors = errors
+        self.warnings = warnings
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def message(self) -> str:
+        return " ".join(self.errors)
+
+class BatchValidation:
+    """
+    Outcome of validating columnar parameters: `invalid` and `warned` are
+    boolean arrays with one entry per item; messages are built on demand.
+    """
+    def __init__(self, rules: "CompiledRules", violations: np.ndarray, warned: np.ndarray):
+        self.rules = rules
+        # (checks, N) and (warning rules, N) boolean masks
+        self.violations = violations
+        self.warned_by_rule = warned
+        self.invalid = violations.any(axis=0) if violations.size else np.zeros(violations.shape[1], dtype=bool)
+        self.warned = warned.any(axis=0) if warned.size else np.zeros(violations.shape[1], dtype=bool)
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid.any()
+
+    @property
+    def invalid_count(self) -> int:
+        return int(np.count_nonzero(self.invalid))
+
+    def errors(self, limit: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+        """`(index, messages)` for the first `limit` invalid items, in input order."""
+        indices = np.flatnonzero(self.invalid)[:limit]
+        messages = self.rules.batch_messages
+        return [(int(i), [messages[c] for c in np.flatnonzero(self.violations[:, i])]) for i in indices]
+
+    def warnings(self, limit: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+        indices = np.flatnonzero(self.warned)[:limit]
+        return [(int(i), [self.rules.warning_rules[w][0] for w in np.flatnonzero(self.warned_by_rule[:, i])]) for i in indices]
+
+class CompiledRules:
+    """
+    A component's rules flattened once into tuples of
+    `(name, min, max, not_a_number_message, out_of_range_message)` so
+    validation is a tight loop with preformatted messages. Cross-parameter
+    constraints are only evaluated once every parameter is in range.
+    """
+    def __init__(self, spec: ComponentSpec):
+        self.spec = spec
+        self.component_type = spec.component_type
+        self.checks = tuple(
+            (param.name, param.min, param.max,
+             f"Error: {param.description} must be a number.",
+             f"Error: {param.description} must be between {param.min} and {param.max} mm.")
+            for param in spec.parameters
+        )
+        self.constraint_rules = spec.constraint_rules
+        self.warning_rules = spec.warning_rules
+        # One message per row of BatchValidation.violations
+        self.batch_messages = tuple(check[4] for check in self.checks) + tuple(m for m, _ in self.constraint_rules)
+
+    def validate(self, params: Dict[str, Any]) -> ValidationResult:
+        errors = []
+        for name, low, high, type_error, range_error in self.checks:
+            value = params.get(name)
+            # bool is an int subclass but never a dimension
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value != value:
+                errors.append(type_error)
+            elif not (low <= value <= high):
+                errors.append(range_error)
+        if errors:
+            return ValidationResult(errors, [])
+        errors = [message for message, predicate in self.constraint_rules if predicate(params)]
+        if errors:
+            return ValidationResult(errors, [])
+        return ValidationResult([], [message for message, predicate in self.warning_rules if predicate(params)])
+
+    def validate_columns(self, columns: Dict[str, Any]) -> BatchValidation:
+        """
+        Validates N items given as one equal-length array per parameter in a
+        single vectorized pass. NaN counts as "not a number".
+        """
+        arrays = {name: np.asarray(columns[name], dtype=float) for name, *_ in self.checks}
+        violations = np.array([
+            # Written as a negated in-range test so NaN is flagged too
+            ~((arrays[name] >= low) & (arrays[name] <= high))
+            for name, low, high, *_ in self.checks
+        ], dtype=bool).reshape(len(self.checks), -1)
+        out_of_range = violations.any(axis=0)
+        if self.constraint_rules:
+            constraints = np.array([
+                np.broadcast_to(predicate(arrays), out_of_range.shape) & ~out_of_range
+                for _, predicate in self.constraint_rules
+            ], dtype=bool)
+            violations = np.concatenate([violations, constraints])
+        invalid = violations.any(axis=0)
+        warned = np.array([
+            np.broadcast_to(predicate(arrays), invalid.shape) & ~invalid
+            for _, predicate in self.warning_rules
+        ], dtype=bool).reshape(len(self.warning_rules), invalid.size)
+        return BatchValidation(self, violations, warned)
 
 class Validator:
-    validation_rules = {
-        'beam': {
-            'H': {'min': 1, 'max': 100000, 'description': 'Total depth (H)'},
-            'B': {'min': 1, 'max': 100000, 'description': 'Flange width (B)'},
-            'tw': {'min': 1, 'max': 100000, 'description': 'Web thickness (tw)'},
-            'tf': {'min': 1, 'max': 100000, 'description': 'Flange thickness (tf)'}
-        },
-        'column': {
-            'width': {'min': 1, 'max': 100000, 'description': 'Width'},
-            'height': {'min': 1, 'max': 100000, 'description': 'Height'}
-        }
-    }
+    validation_rules = _RegistryRules()
+    _compiled: Dict[str, CompiledRules] = {}
+
+    @staticmethod
+    def compile(component_type: str) -> Optional[CompiledRules]:
+        """Compiled rules for a registered type (built once per spec), or None."""
+        spec = find_spec(component_type)
+        if spec is None:
+            return None
+        compiled = Validator._compiled.get(component_type)
+        if compiled is None or compiled.spec is not spec:
+            compiled = Validator._compiled[component_type] = CompiledRules(spec)
+        return compiled
+
+    @staticmethod
+    def check(component_type: str, params: Dict[str, Any]) -> ValidationResult:
+        """Validates one item, collecting every violation instead of stopping at the first."""
+        compiled = Validator.compile(component_type)
+        if compiled is None:
+            return ValidationResult(["Invalid component type"], [])
+        return compiled.validate(params)
+
+    @staticmethod
+    def check_batch(component_type: str, columns: Dict[str, Any]) -> Optional[BatchValidation]:
+        """Columnar validation of many items of one type; None for unknown types."""
+        compiled = Validator.compile(component_type)
+        if compiled is None:
+            return None
+        return compiled.validate_columns(columns)
 
     @staticmethod
-    def _validate_float(value: Any, rule: Dict[str, Any]) -> bool:
-        if not isinstance(value, (int, float)):
-            return False, f"Error: {rule['description']} must be a number."
-        if not (rule['min'] <= value <= rule['max']):
-            return False, f"Error: {rule['description']} must be between {rule['min']} and {rule['max']} mm."
-        return True, ""
+    def validate(component_type: str, params: Dict[str, float]) -> tuple[bool, str]:
+        result = Validator.check(component_type, params)
+        for warning in result.warnings:
+            logger.warning("%s: %s", component_type, warning)
+        return result.ok, result.message
 
     @staticmethod
     def validate_beam(params: Dict[str, float]) -> tuple[bool, str]:
-        print("Validating beam parameters...")
-        for key, rule in Validator.validation_rules['beam'].items():
-            is_valid, error_msg = Validator._validate_float(params.get(key), rule)
-            if not is_valid:
-                return False, error_msg
-
-        # Add beam proportion validation
-        H = params.get("H")
-        B = params.get("B")
-        if B is not None and B > 0 and H is not None and H / B > 10:
-            print("Warning: H/B ratio exceeds 10, which is unusual for standard I-beams. Consider revising dimensions.")
-        return True, ""
+        return Validator.validate("beam", params)
 
     @staticmethod
     def validate_column(params: Dict[str, float]) -> tuple[bool, str]:
-        print("Validating column parameters...")
-        for key, rule in Validator.validation_rules['column'].items():
-            is_valid, error_msg = Validator._validate_float(params.get(key), rule)
-            if not is_valid:
-                return False, error_msg
-        return True, ""
\ No newline at end of file
+        return Validator.validate("column", params)
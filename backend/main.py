@@ -1,13 +1,21 @@
+import logging
 import os
-from typing import Dict, Any, Union, List
-from fastapi import FastAPI, HTTPException, BackgroundTasks, File, UploadFile
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Any, Union, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, File, UploadFile, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tempfile
-import uuid
+import hashlib
 import mimetypes
+import zipfile
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
 import ezdxf
 
 # Ensure absolute paths relative to this file
@@ -15,11 +23,124 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(base_dir, "static")
 assets_dir = os.path.join(static_dir, "assets")
 
+logger = logging.getLogger(__name__)
+
 from .interfaces.dxf_generator_interface import DXFGeneratorInterface
+from .components.batch import ComponentBatch
 from .services.dxf_service import DXFService
-from .interfaces.validator import Validator
+from .services.dxf_cache import DXFCache
+from .services.dxf_template import get_template_pool
+from .services.artifact_store import store_from_env
+from .services.parse_cache import parse_cache_from_env
+from .services.archive import ZipStreamWriter
+from .services.layout_service import SheetLayout
+from .services.worker_pool import WorkerPool, PoolSaturatedError
+from .services.metrics import registry, span, timed_iter, profiles
+from .services.section_properties import component_properties, to_lists
+from .services.section_catalog import get_section_catalog
+from .services.job_queue import JobContext, JobQueue, job_queue_from_env
+from .services.sweep import ParameterSweep, SWEEP_FORMATS
+from .services.dxf_encoding import compress, negotiate_encoding, savings_headers
+from .services.preview import (PreviewRenderer, PREVIEW_FORMATS, MEDIA_TYPES, MAX_SPRITE_PIXELS, component_outlines,
+                               sprite_grid)
+from .services.dxf_parser import read_first_lwpolyline, classify_points, iter_lwpolylines, iter_profiles, parse_nested
+from .interfaces.validator import Validator, ValidationResult
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Job workers run only in a serving process, never as a side effect of importing this module
+    if job_queue is not None:
+        job_queue.start()
+    yield
+    if job_queue is not None:
+        job_queue.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# Shared cache of rendered drawings, keyed by component type and parameters
+dxf_cache = DXFCache(max_entries=512, max_bytes=64 * 1024 * 1024)
+
+# Rendered SVG/PNG previews, keyed by parameter hash, format and size
+preview_cache = DXFCache(max_entries=4096, max_bytes=32 * 1024 * 1024)
+
+# Optional on-disk store shared by all uvicorn workers (enabled by DXF_STORE_DIR)
+dxf_store = store_from_env()
+
+# Parse results by upload content hash (persisted when DXF_PARSE_CACHE_DIR is set)
+parse_cache = parse_cache_from_env()
+
+# Build the pre-serialized template documents once at startup
+dxf_template = get_template_pool()
+
+# Standard sections (IPE/HEA/HEB/SHS/RHS), prerendered so catalog downloads are memory reads
+section_catalog = get_section_catalog()
+section_catalog.warm(DXFService(template=dxf_template).to_bytes)
+
+# Dedicated executor for CPU-bound ezdxf work, sized by DXF_WORKERS / DXF_MAX_QUEUE
+worker_pool = WorkerPool()
+
+# Negotiated gzip/brotli Content-Encoding; disable with DXF_COMPRESSION=0 behind a compressing proxy
+COMPRESSION_ENABLED = os.environ.get("DXF_COMPRESSION", "1") == "1"
+
+# Per-request sampling profiles (X-DXF-Profile header) are only honoured when DXF_PROFILING=1
+PROFILING_ENABLED = os.environ.get("DXF_PROFILING", "0") == "1"
+
+request_duration = registry.histogram(
+    "dxf_request_duration_seconds",
+    "End-to-end request handling time until the response starts.",
+    ("method", "route", "status"),
+)
+
+def _temp_dir_usage():
+    usage = shutil.disk_usage(tempfile.gettempdir())
+    return [({"kind": "used"}, usage.used), ({"kind": "free"}, usage.free)]
+
+def _cache_counter(field: str):
+    return lambda: dxf_cache.stats()[field]
+
+registry.register_callback("dxf_worker_queue_depth", "Jobs waiting for a worker thread.", lambda: worker_pool.queue_depth)
+registry.register_callback("dxf_worker_in_flight", "Jobs admitted to the worker pool (running or queued).", lambda: worker_pool.in_flight)
+registry.register_callback("dxf_worker_capacity", "Worker threads plus queue slots.", lambda: worker_pool.max_workers + worker_pool.max_queue)
+registry.register_callback("dxf_temp_dir_bytes", "Disk usage of the filesystem holding the temp directory.", _temp_dir_usage)
+registry.register_callback("dxf_cache_hits_total", "DXF cache hits.", _cache_counter("hits"), "counter")
+registry.register_callback("dxf_cache_misses_total", "DXF cache misses.", _cache_counter("misses"), "counter")
+registry.register_callback("dxf_cache_bytes", "Bytes held by the DXF cache.", _cache_counter("bytes"))
+if dxf_store is not None:
+    registry.register_callback("dxf_store_bytes", "Bytes held by the on-disk artifact store.", lambda: dxf_store.stats()["bytes"])
+    registry.register_callback("dxf_store_hits_total", "Artifact store hits in this worker.", lambda: dxf_store.hits, "counter")
+    registry.register_callback("dxf_store_evictions_total", "Artifact store entries evicted by this worker's janitor.", lambda: dxf_store.evictions, "counter")
 
-app = FastAPI()
+def _parse_cache_counter(field: str):
+    return lambda: parse_cache.stats()[field]
+
+registry.register_callback("dxf_parse_cache_hits_total", "Parse results served from cache.", _parse_cache_counter("hits"), "counter")
+registry.register_callback("dxf_parse_cache_misses_total", "Uploads that had to be parsed.", _parse_cache_counter("misses"), "counter")
+registry.register_callback("dxf_parse_cache_hit_ratio", "Share of parse requests answered from cache.", _parse_cache_counter("hit_ratio"))
+registry.register_callback("dxf_parse_cache_bytes", "Bytes of parse results held in memory.", _parse_cache_counter("bytes"))
+
+def _profiling_requested(header_value: Optional[str]) -> bool:
+    return PROFILING_ENABLED and header_value not in (None, "", "0")
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    request_duration.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    )
+    return response
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # Add CORS middleware
 app.add_middleware(
@@ -28,6 +149,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    # Lets the frontend read validation warnings, sweep sizes and sprite layout
+    expose_headers=["X-Validation-Warnings", "X-Uncompressed-Length", "X-Bytes-Saved", "X-Compression-Ratio", "X-Sweep-Combinations", "X-Sweep-Valid", "X-Sweep-Invalid", "X-Sweep-Estimated-Bytes",
+                    "X-Sprite-Columns", "X-Sprite-Tile", "X-Sprite-Invalid"],
 )
 
 # Fix for Windows MIME types
@@ -48,106 +172,796 @@ async def read_vite_svg():
 async def read_index():
     return FileResponse(os.path.join(static_dir, "index.html"))
 
+def _require_content(stream) -> None:
+    if not stream.read(1):
+        raise HTTPException(status_code=400, detail="File is empty")
+    stream.seek(0)
+
+def _parse_upload(stream) -> Dict[str, Any]:
+    _require_content(stream)
+    # The upload is read while it is scanned, so this stage covers reading too
+    with span("parse_scan"):
+        points = read_first_lwpolyline(stream)
+    if points is None:
+        raise HTTPException(status_code=400, detail="No polyline found in DXF")
+
+    try:
+        with span("parse_classify"):
+            return classify_points(points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _parse_upload_bulk(stream) -> List[Dict[str, Any]]:
+    _require_content(stream)
+    return list(iter_profiles(iter_lwpolylines(stream)))
+
+def _parse_upload_nested(stream) -> List[Dict[str, Any]]:
+    _require_content(stream)
+    return parse_nested(iter_lwpolylines(stream))
+
+def _cached_parse(parse, mode: str):
+    """
+    Wraps a parse function so identical uploads are answered from the parse
+    cache: the upload is hashed chunk by chunk first and only parsed on a
+    miss. Returns `(result, cache_status)`.
+    """
+    def wrapper(stream):
+        with span("parse_hash"):
+            key = parse_cache.key(stream, mode)
+        result = parse_cache.get(key)
+        if result is not None:
+            return result, "HIT"
+        result = parse(stream)
+        parse_cache.put(key, result)
+        return result, "MISS"
+    return wrapper
+
 @app.post("/parse-dxf")
-async def parse_dxf(file: UploadFile = File(...)):
+async def parse_dxf(response: Response, file: UploadFile = File(...), x_dxf_profile: Optional[str] = Header(None)):
     """
     Parses an uploaded DXF file to extract parameters.
     """
     if not file.filename.lower().endswith('.dxf'):
         raise HTTPException(status_code=400, detail="Only DXF files are allowed")
 
-    tmp_path = None
     try:
-        suffix = os.path.splitext(file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            if not content:
-                raise HTTPException(status_code=400, detail="File is empty")
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        doc = ezdxf.readfile(tmp_path)
-        msp = doc.modelspace()
-        
-        polylines = msp.query('LWPOLYLINE')
-        if not polylines:
-            raise HTTPException(status_code=400, detail="No polyline found in DXF")
-        
-        pline = polylines[0]
-        points = pline.get_points()
-        num_points = len(points)
-
-        if num_points == 12:
-            coords = [(p[0], p[1]) for p in points]
-            xs = [p[0] for p in coords]
-            ys = [p[1] for p in coords]
-            H = max(ys) - min(ys)
-            B = max(xs) - min(xs)
-            tf = abs(coords[0][1] - coords[11][1])
-            tw = abs(coords[3][0] - coords[10][0])
-            return {
-                "type": "beam",
-                "params": {"H": round(H, 2), "B": round(B, 2), "tw": round(tw, 2), "tf": round(tf, 2)}
-            }
-        elif num_points == 4:
-            coords = [(p[0], p[1]) for p in points]
-            xs = [p[0] for p in coords]
-            ys = [p[1] for p in coords]
-            width = max(xs) - min(xs)
-            height = max(ys) - min(ys)
-            return {
-                "type": "column",
-                "params": {"width": round(width, 2), "height": round(height, 2)}
-            }
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported polyline structure ({num_points} points)")
+        parse = _cached_parse(_parse_upload, "first")
+        if _profiling_requested(x_dxf_profile):
+            parse, profile_id = profiles.profiled(parse)
+            response.headers["X-DXF-Profile-Id"] = profile_id
+        # Hashing, reading the spooled upload and scanning it all block, so keep them off the event loop
+        result, response.headers["X-Cache"] = await worker_pool.run(parse, file.file)
+        return result
 
     except ezdxf.DXFError as e:
         raise HTTPException(status_code=400, detail=f"Invalid DXF file: {str(e)}")
-    except HTTPException as e:
-        raise e
+    except (HTTPException, PoolSaturatedError):
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error parsing DXF: {str(e)}")
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+
+@app.post("/parse-dxf/bulk")
+async def parse_dxf_bulk(file: UploadFile = File(...), format: str = "ndjson", nested: bool = False):
+    """
+    Classifies every LWPOLYLINE in the uploaded DXF file. By default results
+    are streamed as NDJSON while the file is still being scanned; use
+    `format=json` to receive a single JSON list instead.
+
+    With `nested=true` polylines inside other polylines are resolved first:
+    hollow sections come back as one "hollow" profile and other enclosed
+    profiles carry their "parent" handle. This needs the whole drawing, so
+    NDJSON output starts only once the file has been scanned.
+    """
+    if not file.filename.lower().endswith('.dxf'):
+        raise HTTPException(status_code=400, detail="Only DXF files are allowed")
+    if format not in ("ndjson", "json"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'json'")
+
+    stream = file.file
+    if format == "json" or nested:
+        parse = _cached_parse(_parse_upload_nested, "nested") if nested else _cached_parse(_parse_upload_bulk, "bulk")
+        try:
+            result, cache_status = await worker_pool.run(parse, stream)
+        except ezdxf.DXFError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid DXF file: {str(e)}")
+        if format == "json":
+            return JSONResponse(result, headers={"X-Cache": cache_status})
+        lines = (json.dumps(profile) + "\n" for profile in result)
+        return StreamingResponse(lines, media_type="application/x-ndjson", headers={"X-Cache": cache_status})
+
+    await worker_pool.run(_require_content, stream)
+    key = await worker_pool.run(parse_cache.key, stream, "bulk")
+    cached = parse_cache.get(key)
+    if cached is not None:
+        lines = (json.dumps(profile) + "\n" for profile in cached)
+        return StreamingResponse(lines, media_type="application/x-ndjson", headers={"X-Cache": "HIT"})
+
+    def ndjson_lines():
+        # Stepped on the worker pool by admit_stream, never on the event loop
+        profiles_seen: Optional[List[Dict[str, Any]]] = []
+        size = 0
+        try:
+            for profile in iter_profiles(iter_lwpolylines(stream)):
+                line = json.dumps(profile) + "\n"
+                if profiles_seen is not None:
+                    size += len(line)
+                    # Results too large to cache aren't kept around while streaming
+                    profiles_seen = profiles_seen if size <= parse_cache.memory.max_bytes else None
+                    if profiles_seen is not None:
+                        profiles_seen.append(profile)
+                yield line
+        except ezdxf.DXFError as e:
+            # Headers are already sent, so report the failure in-band
+            yield json.dumps({"error": f"Invalid DXF file: {str(e)}"}) + "\n"
+            return
+        if profiles_seen is not None:
+            parse_cache.put(key, profiles_seen)
+
+    # Scanning happens while streaming, so the body holds a worker pool slot until it ends
+    return StreamingResponse(worker_pool.admit_stream(ndjson_lines()), media_type="application/x-ndjson",
+                             headers={"X-Cache": "MISS"})
 
 class GenerateRequest(BaseModel):
     component_type: str
     params: Dict[str, float]
 
+class OutputOptions(BaseModel):
+    # "ascii" or "binary" DXF; precision rounds entity coordinates to that many decimals
+    output: str = "ascii"
+    precision: Optional[int] = None
+
+class DXFRequest(GenerateRequest, OutputOptions):
+    pass
+
+class BatchGenerateRequest(OutputOptions):
+    items: List[GenerateRequest]
+
+class LayoutRequest(OutputOptions):
+    items: List[GenerateRequest]
+    mode: str = "shelf"
+    spacing: float = 50.0
+    sheet_width: Optional[float] = None
+
+class SweepRequest(BaseModel):
+    component_type: str
+    # Per parameter: a fixed value, a list of values or {"start", "stop", "step"} (inclusive)
+    params: Dict[str, Union[float, List[float], Dict[str, float]]]
+    format: str = "layout"
+    spacing: float = 50.0
+    columns: Optional[int] = None
+
+class PreviewRequest(BaseModel):
+    component_type: str
+    params: Dict[str, float]
+    format: str = "svg"
+    size: int = 256
+
+class SpriteRequest(BaseModel):
+    items: List[GenerateRequest] = []
+    # Standard sections from the catalog, placed after `items`
+    designations: List[str] = []
+    format: str = "png"
+    size: int = 128
+    columns: Optional[int] = None
+
+class JobRequest(OutputOptions):
+    items: List[GenerateRequest]
+    priority: int = 0
+
+class SectionBatchRequest(BaseModel):
+    component_type: str
+    params: Dict[str, List[float]]
+
+MAX_BATCH_ITEMS = 5000
+MAX_JOB_ITEMS = 200000
+MAX_SWEEP_COMBINATIONS = 50_000_000
+MAX_SPRITE_ITEMS = 1024
+# A ZIP's central directory grows with every entry; larger sweeps should use the layout format
+MAX_SWEEP_ZIP_ITEMS = 100_000
+MAX_PROPERTY_ITEMS = 1_000_000
+
+# Cap on per-item errors / warnings echoed back by the columnar batch endpoints
+MAX_REPORTED_ISSUES = 100
+
+def validate_component(component_type: str, params: Dict[str, float]) -> ValidationResult:
+    """Validates one item; every violation is collected and warnings are logged."""
+    result = Validator.check(component_type, params)
+    for warning in result.warnings:
+        logger.info("%s %s: %s", component_type, params, warning)
+    return result
+
+def _render_and_store(render, key: str):
+    """Wraps a render function so the result is also written to the disk store, on the worker thread."""
+    def wrapper(component):
+        content = render(component)
+        with span("store_write"):
+            dxf_store.put(key, content)
+        return content
+    return wrapper
+
+def _store_lookup(key: str, read: bool) -> Tuple[Optional[Tuple[str, os.stat_result]], Optional[bytes]]:
+    """
+    Disk store lookup, run off the event loop: the entry's `(path, stat)` and,
+    when `read` is set, its bytes (None if the janitor evicted it meanwhile).
+    """
+    stored = dxf_store.get_path(key)
+    if stored is None or not read:
+        return stored, None
+    try:
+        with open(stored[0], "rb") as f:
+            return stored, f.read()
+    except FileNotFoundError:
+        return stored, None
+
+def _output_service(options: OutputOptions) -> DXFService:
+    """
+    DXFService producing the requested output format and precision; 400 for
+    bad options. Request work already runs in a worker pool slot, so batches
+    render inline there instead of on a thread pool of their own.
+    """
+    try:
+        return DXFService(template=dxf_template, executor="inline", output=options.output, precision=options.precision)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _variant_key(key: str, options: OutputOptions) -> str:
+    """Cache/store key of one output variant; plain ASCII keeps the bare parameter hash."""
+    if options.output == "ascii" and options.precision is None:
+        return key
+    return f"{key}-{options.output}-p{options.precision}"
+
+async def _encode_body(content: bytes, key: Optional[str], accept_encoding: Optional[str], headers: Dict[str, str]) -> bytes:
+    """
+    Applies the negotiated Content-Encoding (compressed on the worker pool,
+    and cached per coding when `key` is given) and reports the savings in
+    `headers`.
+    """
+    headers["Vary"] = "Accept-Encoding"
+    coding = negotiate_encoding(accept_encoding) if COMPRESSION_ENABLED else None
+    if coding is None:
+        return content
+    encoded_key = f"{key}-{coding}" if key is not None else None
+    encoded = dxf_cache.get(encoded_key) if encoded_key is not None else None
+    if encoded is None:
+        with span("compress"):
+            encoded = await worker_pool.run(compress, content, coding)
+        if encoded_key is not None:
+            dxf_cache.put(encoded_key, encoded)
+    headers["Content-Encoding"] = coding
+    headers.update(savings_headers(len(content), len(encoded)))
+    return encoded
+
 @app.post("/generate")
-def generate_dxf(request: GenerateRequest, background_tasks: BackgroundTasks):
+async def generate_dxf(request: DXFRequest, if_none_match: Optional[str] = Header(None),
+                       x_dxf_profile: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     try:
-        if request.component_type == "beam":
-            is_valid, error_msg = Validator.validate_beam(request.params)
-            if not is_valid: raise HTTPException(status_code=400, detail=error_msg)
-        elif request.component_type == "column":
-             is_valid, error_msg = Validator.validate_column(request.params)
-             if not is_valid: raise HTTPException(status_code=400, detail=error_msg)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid component type")
-
-        dxf_service = DXFService()
-        generated_filename = f"{uuid.uuid4()}.dxf"
-        tmp_path = os.path.join(tempfile.gettempdir(), generated_filename)
-        
-        generator = DXFGeneratorInterface(request.component_type, request.params)
-        component = generator.get_component()
-        saved_file = dxf_service.save(component, filename=tmp_path)
-        
-        background_tasks.add_task(os.remove, saved_file)
-        return FileResponse(path=saved_file, filename=f"{request.component_type}.dxf", media_type='application/dxf')
-
-    except HTTPException as e:
-        raise e
+        with span("validate"):
+            validation = validate_component(request.component_type, request.params)
+        if not validation.ok: raise HTTPException(status_code=400, detail=validation.message)
+        dxf_service = _output_service(request)
+
+        cache_key = _variant_key(DXFCache.make_key(request.component_type, request.params), request)
+        etag = DXFCache.etag(cache_key)
+        if DXFCache.etag_matches(if_none_match, cache_key):
+            return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+        with span("cache_lookup"):
+            content = dxf_cache.get(cache_key)
+        cache_status = "HIT"
+        headers = {}
+        if validation.warnings:
+            headers["X-Validation-Warnings"] = "; ".join(validation.warnings)
+        coding = negotiate_encoding(accept_encoding) if COMPRESSION_ENABLED else None
+        if content is None and dxf_store is not None:
+            with span("store_lookup"):
+                # Compressed responses need the bytes; plain ones are sent from the file
+                stored, content = await run_in_threadpool(_store_lookup, cache_key, coding is not None)
+            if stored is not None and coding is None:
+                # Served with sendfile; the janitor owns the file, so nothing is deleted here
+                path, stat_result = stored
+                headers.update({"ETag": etag, "X-Cache": "DISK", "Vary": "Accept-Encoding"})
+                return FileResponse(path, media_type='application/dxf', filename=f"{request.component_type}.dxf",
+                                    headers=headers, stat_result=stat_result)
+            if content is not None:
+                cache_status = "DISK"
+                dxf_cache.put(cache_key, content)
+        if content is None:
+            cache_status = "MISS"
+            with span("get_component"):
+                generator = DXFGeneratorInterface(request.component_type, request.params)
+                component = generator.get_component()
+            render = dxf_service.to_bytes
+            if dxf_store is not None:
+                render = _render_and_store(render, cache_key)
+            if _profiling_requested(x_dxf_profile):
+                render, headers["X-DXF-Profile-Id"] = profiles.profiled(render)
+            content = await worker_pool.run(render, component)
+            dxf_cache.put(cache_key, content)
+
+        body = await _encode_body(content, cache_key, accept_encoding, headers)
+        headers.update({
+            "Content-Disposition": f'attachment; filename="{request.component_type}.dxf"',
+            "Content-Length": str(len(body)),
+            "ETag": etag,
+            "X-Cache": cache_status,
+        })
+        return StreamingResponse(timed_iter("transfer", dxf_service.iter_chunks(body)), media_type='application/dxf', headers=headers)
+
+    except (HTTPException, PoolSaturatedError):
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/generate")
+async def generate_catalog_dxf(designation: str, if_none_match: Optional[str] = Header(None),
+                               accept_encoding: Optional[str] = Header(None)):
+    """Serves a standard section's prerendered drawing, e.g. /generate?designation=IPE200."""
+    entry = section_catalog.get(designation)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown section designation '{designation}'")
+    etag = DXFCache.etag(entry.key)
+    if DXFCache.etag_matches(if_none_match, entry.key):
+        return Response(status_code=304, headers={"ETag": etag})
+    headers = {
+        "Content-Disposition": f'attachment; filename="{entry.designation}.dxf"',
+        "ETag": etag,
+        "X-Cache": "CATALOG",
+    }
+    body = await _encode_body(section_catalog.dxf(entry), entry.key, accept_encoding, headers)
+    return Response(body, media_type='application/dxf', headers=headers)
+
+CATALOG_QUERY_FIELDS = ("H", "B", "tw", "tf", "t", "area", "Ix", "Iy", "Sx", "Sy", "rx", "ry", "mass")
+
+@app.get("/catalog")
+def catalog_query(request: Request, family: Optional[str] = None, sort: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Range query over the standard sections. Bounds are passed as
+    `<field>_min` / `<field>_max`, e.g. /catalog?family=HEA&Ix_min=1e8&sort=mass.
+    """
+    ranges = {}
+    for field in CATALOG_QUERY_FIELDS:
+        bounds = []
+        for suffix in ("_min", "_max"):
+            raw = request.query_params.get(field + suffix)
+            try:
+                bounds.append(None if raw is None else float(raw))
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"{field + suffix} must be a number")
+        if bounds != [None, None]:
+            ranges[field] = tuple(bounds)
+    try:
+        entries = section_catalog.query(ranges, family=family, sort=sort, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": len(entries), "sections": [entry.to_dict() for entry in entries]}
+
+@app.get("/catalog/{designation}")
+def catalog_entry(designation: str):
+    entry = section_catalog.get(designation)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown section designation '{designation}'")
+    return entry.to_dict()
+
+def _prepare_batch(items: List[GenerateRequest], options: OutputOptions):
+    """Validates batch items and builds their components; returns the manifest and `{index: component}`."""
+    manifest = []
+    components = {}
+    for index, item in enumerate(items):
+        entry = {"index": index, "component_type": item.component_type, "params": item.params,
+                 "filename": None, "status": "pending", "error": None}
+        validation = validate_component(item.component_type, item.params)
+        if validation.warnings:
+            entry["warnings"] = validation.warnings
+        if not validation.ok:
+            entry["status"] = "invalid"
+            entry["error"] = validation.message
+        else:
+            entry["key"] = _variant_key(DXFCache.make_key(item.component_type, item.params), options)
+            try:
+                components[index] = DXFGeneratorInterface(item.component_type, item.params).get_component()
+            except Exception as e:
+                entry["status"] = "invalid"
+                entry["error"] = str(e)
+        manifest.append(entry)
+    return manifest, components
+
+def _batch_archive(manifest: List[Dict[str, Any]], components: Dict[int, Any], dxf_service: DXFService,
+                   progress: Optional[Callable[[int, int], None]] = None):
+    """
+    Yields the ZIP archive for a prepared batch, rendered by `dxf_service`.
+    Each entry is deflated or stored, whichever pays off; the manifest
+    records both sizes. `progress(done, failed)` is called after every
+    rendered or failed item.
+    """
+    writer = ZipStreamWriter(adaptive=True)
+    counts = [0, len(manifest) - len(components)]
+
+    def add_entry(index: int, content: bytes) -> bytes:
+        entry = manifest[index]
+        entry["filename"] = f"{index + 1:04d}_{entry['component_type']}.dxf"
+        entry["status"] = "ok"
+        entry["size"] = len(content)
+        data = writer.add(entry["filename"], content)
+        entry["compressed_size"] = writer.last_entry.compress_size
+        entry["compression"] = "deflate" if writer.last_entry.compress_type == zipfile.ZIP_DEFLATED else "store"
+        counts[0] += 1
+        if progress is not None:
+            progress(*counts)
+        return data
+
+    misses = []
+    for index in components:
+        content = dxf_cache.get(manifest[index]["key"])
+        if content is None:
+            misses.append(index)
+        else:
+            yield add_entry(index, content)
+
+    with dxf_service:
+        for position, content, error in dxf_service.iter_batch_bytes([components[i] for i in misses]):
+            index = misses[position]
+            if error is not None:
+                manifest[index]["status"] = "error"
+                manifest[index]["error"] = error
+                counts[1] += 1
+                if progress is not None:
+                    progress(*counts)
+                continue
+            dxf_cache.put(manifest[index]["key"], content)
+            yield add_entry(index, content)
+
+    for entry in manifest:
+        entry.pop("key", None)
+    yield writer.add_json("manifest.json", manifest)
+    yield writer.close()
+
+@app.post("/generate/batch")
+async def generate_dxf_batch(request: BatchGenerateRequest):
+    """
+    Generates many drawings in one call and streams them back as a ZIP archive.
+    Items are validated up front; invalid or failing items are reported in
+    manifest.json instead of aborting the batch.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds {MAX_BATCH_ITEMS} items")
+
+    dxf_service = _output_service(request)
+    manifest, components = await worker_pool.run(_prepare_batch, request.items, request)
+    headers = {"Content-Disposition": 'attachment; filename="batch.zip"'}
+    # Rendering happens while streaming, one item per step on the worker pool
+    body = worker_pool.admit_stream(_batch_archive(manifest, components, dxf_service))
+    return StreamingResponse(body, media_type="application/zip", headers=headers)
+
+def _run_batch_job(job: JobContext) -> None:
+    """Job handler: renders a stored batch into the job's result archive."""
+    items = [GenerateRequest(**item) for item in job.payload["items"]]
+    options = OutputOptions(**job.payload.get("options", {}))
+    manifest, components = _prepare_batch(items, options)
+    dxf_service = DXFService(template=dxf_template, output=options.output, precision=options.precision)
+    with open(job.result_path, "wb") as result:
+        for data in _batch_archive(manifest, components, dxf_service, progress=job.progress):
+            result.write(data)
+
+# Persistent background jobs for batches too large for one request (enabled by DXF_JOBS_DIR)
+job_queue = job_queue_from_env({"batch": _run_batch_job})
+registry.register_callback("dxf_jobs", "Background jobs by status.",
+                           lambda: [({"status": status}, count) for status, count in job_queue.stats().items()]
+                           if job_queue is not None else [])
+
+def _jobs() -> JobQueue:
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Background jobs are disabled; set DXF_JOBS_DIR to enable them")
+    return job_queue
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    """Queues a batch for background generation; poll GET /jobs/{id} and download GET /jobs/{id}/result."""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(request.items) > MAX_JOB_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Job exceeds {MAX_JOB_ITEMS} items")
+    queue = _jobs()
+    _output_service(request)
+    payload = {"items": [item.model_dump() for item in request.items],
+               "options": {"output": request.output, "precision": request.precision}}
+    job_id = queue.submit("batch", payload, total=len(request.items), priority=request.priority)
+    return {"id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = _jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job["progress"] = (job["done"] + job["failed"]) / job["total"] if job["total"] else 0.0
+    if job["status"] == "done":
+        job["result_url"] = f"/jobs/{job_id}/result"
+    return job
+
+@app.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    queue = _jobs()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = queue.result_path(job_id) if job["status"] == "done" else None
+    if path is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return FileResponse(path, media_type="application/zip", filename=f"batch-{job_id}.zip")
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancels a queued or running job, or deletes a finished job and its result."""
+    state = _jobs().cancel(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"id": job_id, "status": state}
+
+@app.post("/generate/layout")
+async def generate_layout(request: LayoutRequest, accept_encoding: Optional[str] = Header(None)):
+    """
+    Places every item on one sheet and returns a single DXF. Repeated sections
+    share one BLOCK definition referenced by INSERTs.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Layout is empty")
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Layout exceeds {MAX_BATCH_ITEMS} items")
+
+    errors = []
+    for index, item in enumerate(request.items):
+        validation = validate_component(item.component_type, item.params)
+        if not validation.ok:
+            errors.append({"index": index, "error": validation.message})
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    try:
+        layout = SheetLayout(mode=request.mode, spacing=request.spacing, sheet_width=request.sheet_width)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    dxf_service = _output_service(request)
+
+    try:
+        components = [DXFGeneratorInterface(item.component_type, item.params).get_component() for item in request.items]
+        content = await worker_pool.run(lambda: dxf_service.encode(layout.to_bytes(components)))
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        logger.exception("Layout generation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"Content-Disposition": 'attachment; filename="layout.dxf"'}
+    body = await _encode_body(content, None, accept_encoding, headers)
+    headers["Content-Length"] = str(len(body))
+    return StreamingResponse(dxf_service.iter_chunks(body), media_type='application/dxf', headers=headers)
+
+def _build_sweep(request: SweepRequest) -> ParameterSweep:
+    if request.format not in SWEEP_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{request.format}', expected one of {SWEEP_FORMATS}")
+    try:
+        return ParameterSweep(request.component_type, request.params, max_combinations=MAX_SWEEP_COMBINATIONS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/generate/sweep/estimate")
+async def estimate_sweep(request: SweepRequest):
+    """Counts the valid combinations of a sweep and estimates its output size without drawing anything."""
+    sweep = _build_sweep(request)
+    return await worker_pool.run(sweep.estimate, DXFService(template=dxf_template).fast_writer)
+
+@app.post("/generate/sweep")
+async def generate_sweep(request: SweepRequest):
+    """
+    Generates every valid combination of per-parameter ranges, streamed as
+    one grid layout DXF or as a ZIP with one DXF per combination. Invalid
+    combinations are skipped; their count is reported in X-Sweep-Invalid.
+    """
+    sweep = _build_sweep(request)
+    if request.spacing < 0:
+        raise HTTPException(status_code=400, detail="Spacing cannot be negative")
+    if request.columns is not None and request.columns < 1:
+        raise HTTPException(status_code=400, detail="Columns must be at least 1")
+    writer = DXFService(template=dxf_template).fast_writer
+    estimate = await worker_pool.run(sweep.estimate, writer)
+    if not estimate["valid"]:
+        raise HTTPException(status_code=400, detail="No valid combinations in sweep")
+    headers = {
+        "X-Sweep-Combinations": str(estimate["combinations"]),
+        "X-Sweep-Valid": str(estimate["valid"]),
+        "X-Sweep-Invalid": str(estimate["invalid"]),
+    }
+    if request.format == "zip":
+        if estimate["valid"] > MAX_SWEEP_ZIP_ITEMS:
+            raise HTTPException(status_code=400, detail=f"ZIP sweeps are limited to {MAX_SWEEP_ZIP_ITEMS} valid combinations; use the layout format")
+        headers["X-Sweep-Estimated-Bytes"] = str(estimate["zip_bytes"])
+        headers["Content-Disposition"] = f'attachment; filename="{sweep.component_type}_sweep.zip"'
+        return StreamingResponse(worker_pool.admit_stream(sweep.iter_zip(writer)), media_type="application/zip", headers=headers)
+    headers["X-Sweep-Estimated-Bytes"] = str(estimate["layout_bytes"])
+    headers["Content-Disposition"] = f'attachment; filename="{sweep.component_type}_sweep.dxf"'
+    body = worker_pool.admit_stream(sweep.iter_layout(writer, spacing=request.spacing, columns=request.columns))
+    return StreamingResponse(body, media_type="application/dxf", headers=headers)
+
+def _preview_renderer(format: str, size: int) -> PreviewRenderer:
+    if format not in PREVIEW_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}', expected one of {PREVIEW_FORMATS}")
+    try:
+        return PreviewRenderer(size=size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _preview_response(component_type: str, params: Dict[str, float], format: str, size: int,
+                            if_none_match: Optional[str]):
+    renderer = _preview_renderer(format, size)
+    validation = validate_component(component_type, params)
+    if not validation.ok:
+        raise HTTPException(status_code=400, detail=validation.message)
+    key = f"{DXFCache.make_key(component_type, params)}-{format}-{size}"
+    headers = {"ETag": DXFCache.etag(key), "Cache-Control": "public, max-age=86400"}
+    if DXFCache.etag_matches(if_none_match, key):
+        return Response(status_code=304, headers=headers)
+    content = preview_cache.get(key)
+    headers["X-Cache"] = "HIT"
+    if content is None:
+        headers["X-Cache"] = "MISS"
+        outlines = component_outlines(component_type, params)
+        # SVG is a string join; rasterizing belongs on the worker pool
+        content = renderer.svg(outlines) if format == "svg" else await worker_pool.run(renderer.png, outlines)
+        preview_cache.put(key, content)
+    return Response(content, media_type=MEDIA_TYPES[format], headers=headers)
+
+@app.post("/preview")
+async def preview(request: PreviewRequest, if_none_match: Optional[str] = Header(None)):
+    """Thumbnail of a section's outline as SVG (default) or PNG, without building a DXF."""
+    return await _preview_response(request.component_type, request.params, request.format, request.size, if_none_match)
+
+@app.get("/preview/{component_type}")
+async def preview_get(component_type: str, request: Request, format: str = "svg", size: int = 256,
+                      if_none_match: Optional[str] = Header(None)):
+    """
+    Same as POST /preview with the parameters in the query string, so it can
+    be used as an image URL, e.g. /preview/beam?H=200&B=100&tw=10&tf=15.
+    """
+    params = {}
+    for name, value in request.query_params.items():
+        if name in ("format", "size"):
+            continue
+        try:
+            params[name] = float(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Parameter '{name}' must be a number")
+    return await _preview_response(component_type, params, format, size, if_none_match)
+
+@app.post("/preview/sprite")
+async def preview_sprite(request: SpriteRequest):
+    """
+    Renders many thumbnails into one sprite sheet. Tile i is at
+    ((i % columns) * size, (i // columns) * size) with the column count in
+    X-Sprite-Columns; tiles of invalid items stay empty and are listed in
+    X-Sprite-Invalid.
+    """
+    renderer = _preview_renderer(request.format, request.size)
+    items = [(item.component_type, item.params) for item in request.items]
+    invalid = []
+    for designation in request.designations:
+        entry = section_catalog.get(designation)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Unknown section designation '{designation}'")
+        items.append((entry.component_type, entry.params))
+    if not items:
+        raise HTTPException(status_code=400, detail="Sprite is empty")
+    if len(items) > MAX_SPRITE_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Sprite exceeds {MAX_SPRITE_ITEMS} items")
+    if request.columns is not None and request.columns < 1:
+        raise HTTPException(status_code=400, detail="Columns must be at least 1")
+    columns, rows = sprite_grid(len(items), request.columns)
+    if request.format == "png" and columns * rows * request.size ** 2 > MAX_SPRITE_PIXELS:
+        raise HTTPException(status_code=400, detail=f"Sprite would be {columns * request.size}x{rows * request.size} pixels, "
+                                                    f"the limit is {MAX_SPRITE_PIXELS}; use fewer items or a smaller size")
+
+    tiles = []
+    for index, (component_type, params) in enumerate(items):
+        if validate_component(component_type, params).ok:
+            tiles.append(component_outlines(component_type, params))
+        else:
+            tiles.append(None)
+            invalid.append(index)
+    # Ordered tile keys plus layout; repeated items are part of the key
+    digest = hashlib.sha256()
+    for component_type, params in items:
+        digest.update(DXFCache.make_key(component_type, params).encode("ascii"))
+    key = f"sprite-{digest.hexdigest()}-{request.format}-{request.size}-{columns}"
+    content = preview_cache.get(key)
+    cached = content is not None
+    if not cached:
+        content, _ = await worker_pool.run(renderer.sprite, tiles, request.format, columns)
+        preview_cache.put(key, content)
+    headers = {
+        "X-Sprite-Columns": str(columns),
+        "X-Sprite-Tile": str(request.size),
+        "X-Sprite-Invalid": ",".join(map(str, invalid)),
+        "X-Cache": "HIT" if cached else "MISS",
+    }
+    return Response(content, media_type=MEDIA_TYPES[request.format], headers=headers)
+
+@app.post("/section-properties")
+def section_properties(request: GenerateRequest):
+    """
+    Returns area, centroid, second moments, section moduli and radii of
+    gyration of the profile outline, in mm based units.
+    """
+    validation = validate_component(request.component_type, request.params)
+    if not validation.ok:
+        raise HTTPException(status_code=400, detail=validation.message)
+    component = DXFGeneratorInterface(request.component_type, request.params).get_component()
+    try:
+        properties = component_properties(component)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Degenerate section: {str(e)}")
+    return {"type": request.component_type, "params": request.params, "properties": properties,
+            "warnings": validation.warnings}
+
+def _section_properties_batch(request: SectionBatchRequest, count: int) -> Dict[str, Any]:
+    batch = ComponentBatch(request.component_type, request.params)
+    validation = batch.validate()
+    if not validation.ok:
+        errors = "; ".join(f"Item {index}: {' '.join(messages)}" for index, messages in validation.errors(MAX_REPORTED_ISSUES))
+        raise HTTPException(status_code=400, detail=f"{validation.invalid_count} invalid item(s). {errors}")
+
+    properties = batch.section_properties(allow_degenerate=True)
+    degenerate = np.flatnonzero(np.isnan(properties["area"]))
+    if len(degenerate):
+        errors = "; ".join(f"Item {index}: Degenerate section with zero area." for index in degenerate[:MAX_REPORTED_ISSUES])
+        raise HTTPException(status_code=400, detail=f"{len(degenerate)} invalid item(s). {errors}")
+    warnings = [{"index": index, "warnings": messages} for index, messages in validation.warnings(MAX_REPORTED_ISSUES)]
+    return {"type": request.component_type, "count": count, "properties": to_lists(properties),
+            "warning_count": int(np.count_nonzero(validation.warned)), "warnings": warnings}
+
+@app.post("/section-properties/batch")
+async def section_properties_batch(request: SectionBatchRequest):
+    """
+    Evaluates many parameter sets of one component type in a single vectorized
+    pass. `params` maps each parameter to a list of values; the response holds
+    one list per property in the same order.
+    """
+    rules = Validator.validation_rules.get(request.component_type)
+    if rules is None:
+        raise HTTPException(status_code=400, detail="Invalid component type")
+    lengths = {len(values) for values in request.params.values()}
+    if set(request.params) != set(rules) or len(lengths) != 1:
+        raise HTTPException(status_code=400, detail=f"Params must be equal-length lists for {sorted(rules)}")
+    count = lengths.pop()
+    if count == 0 or count > MAX_PROPERTY_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch must contain between 1 and {MAX_PROPERTY_ITEMS} items")
+
+    return await worker_pool.run(_section_properties_batch, request, count)
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of stage timings, request latency and pool / cache gauges."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    report = profiles.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
+
+@app.get("/cache/stats")
+def cache_stats():
+    stats = {"dxf": dxf_cache.stats(), "preview": preview_cache.stats(), "parse": parse_cache.stats(), "catalog": {"entries": len(section_catalog), "bytes": section_catalog.warmed_bytes}}
+    if dxf_store is not None:
+        stats["disk"] = dxf_store.stats()
+    if job_queue is not None:
+        stats["jobs"] = job_queue.stats()
+    return stats
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,56 @@
+import io
+import json
+import zipfile
+from typing import Any, Optional
+from .dxf_encoding import worth_deflating
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that collects bytes until drained."""
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally without a seekable file.
+
+    Each `add` returns the archive bytes produced for that entry, so callers
+    can forward them to the client as soon as an entry is finished. `close`
+    returns the trailing central directory.
+
+    With `adaptive`, each entry is deflated only if a sample of it shrinks
+    noticeably (binary DXF, for one, compresses far less than ASCII) and
+    stored otherwise. `last_entry` is the ZipInfo of the latest entry.
+    """
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, adaptive: bool = False):
+        self.compression = compression
+        self.adaptive = adaptive
+        self.last_entry: Optional[zipfile.ZipInfo] = None
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        compression = self.compression
+        if self.adaptive and compression != zipfile.ZIP_STORED and not worth_deflating(data):
+            compression = zipfile.ZIP_STORED
+        self._zip.writestr(name, data, compress_type=compression)
+        self.last_entry = self._zip.infolist()[-1]
+        return self._sink.drain()
+
+    def add_json(self, name: str, payload: Any) -> bytes:
+        return self.add(name, json.dumps(payload, indent=2).encode("utf-8"))
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._sink.drain()
@@ -0,0 +1,217 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+TEMP_PREFIX = ".tmp-"
+
+logger = logging.getLogger(__name__)
+
+class ArtifactStore:
+    """
+    Content-addressed store of generated files on local disk, shared by every
+    worker process pointed at the same `root`.
+
+    Entries live at `<root>/<key[:2]>/<key><suffix>`. Writers stream into a
+    temp file in the same directory and `os.replace` it into place, so readers
+    in any process see either the complete file or nothing. Reads bump the
+    file's access time explicitly (mounts are often noatime), which is what the
+    janitor uses to evict least recently used entries once the total size
+    exceeds `max_bytes`. Entries touched within `min_age` seconds are never
+    evicted, so a path handed to a response is not unlinked before it is sent.
+    """
+    def __init__(self, root: str, max_bytes: int = 1024 * 1024 * 1024, suffix: str = ".dxf",
+                 janitor_interval: float = 60.0, min_age: float = 60.0, low_watermark: float = 0.9):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.janitor_interval = janitor_interval
+        self.min_age = min_age
+        self.low_watermark = low_watermark
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._janitor: Optional[threading.Thread] = None
+        # Refreshed by every sweep; writes in other processes are picked up on the next one
+        self._size, self._count = self._scan_totals()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + self.suffix)
+
+    def get_path(self, key: str) -> Optional[Tuple[str, os.stat_result]]:
+        """Returns `(path, stat)` of a stored entry and marks it recently used, or None."""
+        path = self.path(key)
+        try:
+            stat = os.stat(path)
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path, stat
+
+    def get(self, key: str) -> Optional[bytes]:
+        found = self.get_path(key)
+        if found is None:
+            return None
+        try:
+            with open(found[0], "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> str:
+        """Atomically stores `data` under `key`; existing entries are left untouched."""
+        path = self.path(key)
+        if os.path.exists(path):
+            return path
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self.writes += 1
+            self._size += len(data)
+            self._count += 1
+            over_quota = self._size > self.max_bytes
+        if over_quota:
+            self._wake.set()
+        return path
+
+    def _iter_files(self):
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file():
+                    yield entry
+
+    def _scan_totals(self) -> Tuple[int, int]:
+        size = count = 0
+        for entry in self._iter_files():
+            if not entry.name.startswith(TEMP_PREFIX):
+                size += entry.stat().st_size
+                count += 1
+        return size, count
+
+    def sweep(self) -> int:
+        """
+        One janitor pass: removes abandoned temp files and, if the store is over
+        quota, evicts by oldest access time down to `low_watermark * max_bytes`.
+        Returns the number of entries evicted.
+        """
+        now = time.time()
+        entries: List[Tuple[float, int, str]] = []
+        total = 0
+        for entry in self._iter_files():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.startswith(TEMP_PREFIX):
+                # Left behind by a writer that crashed mid-write
+                if now - stat.st_mtime > 3600:
+                    self._remove(entry.path)
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        evicted = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * self.low_watermark
+            entries.sort()
+            for atime, size, path in entries:
+                if total <= target:
+                    break
+                if now - atime < self.min_age:
+                    continue
+                if self._remove(path):
+                    total -= size
+                    evicted += 1
+        with self._lock:
+            self._size = total
+            self._count = len(entries) - evicted
+            self.evictions += evicted
+        return evicted
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            # Another worker's janitor got there first
+            return False
+
+    def _run_janitor(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.janitor_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.sweep()
+            except OSError as e:
+                logger.warning("Artifact store sweep failed: %s", e)
+
+    def start_janitor(self) -> None:
+        if self._janitor is None:
+            self._janitor = threading.Thread(target=self._run_janitor, name="dxf-store-janitor", daemon=True)
+            self._janitor.start()
+
+    def stop_janitor(self) -> None:
+        if self._janitor is not None:
+            self._stop.set()
+            self._wake.set()
+            self._janitor.join()
+            self._janitor = None
+            self._stop.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "root": self.root,
+                "entries": self._count,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+def store_from_env() -> Optional[ArtifactStore]:
+    """
+    Builds the store configured by DXF_STORE_DIR (disabled when unset),
+    DXF_STORE_MAX_BYTES and DXF_STORE_JANITOR_INTERVAL, with its janitor running.
+    """
+    root = os.environ.get("DXF_STORE_DIR")
+    if not root:
+        return None
+    store = ArtifactStore(
+        root,
+        max_bytes=int(os.environ.get("DXF_STORE_MAX_BYTES", 1024 * 1024 * 1024)),
+        janitor_interval=float(os.environ.get("DXF_STORE_JANITOR_INTERVAL", 60)),
+    )
+    store.start_janitor()
+    return store
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class DXFCache:
+    """
+    Bounded in-memory cache of rendered DXF bytes.
+
+    Entries are keyed by a canonical hash of the component type and its
+    normalized parameters, so repeat requests for the same section return the
+    identical bytes. The least recently used entries are evicted once either
+    `max_entries` or `max_bytes` is exceeded.
+    """
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(component_type: str, params: Dict[str, Any]) -> str:
+        # 200, 200.0 and "200" describe the same section, so hash floats only
+        normalized = {str(name): float(value) for name, value in params.items()}
+        payload = json.dumps([component_type, normalized], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def etag(key: str) -> str:
+        # Weak validator: the geometry is identical, but a re-rendered document
+        # carries fresh timestamps after eviction or restart.
+        return f'W/"{key}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag.strip('"') == key:
+                return True
+        return False
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
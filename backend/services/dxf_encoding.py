@@ -0,0 +1,97 @@
+import gzip
+import io
+import re
+import zlib
+from typing import Dict, Optional
+from ezdxf.lldxf.tagwriter import BinaryTagWriter
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+OUTPUT_FORMATS = ("ascii", "binary")
+# Server preference when the client accepts several with the same q-value
+CONTENT_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# Deflate sample used to decide whether an archive entry is worth compressing
+SAMPLE_BYTES = 16 * 1024
+MIN_DEFLATE_RATIO = 0.9
+
+GEOMETRY_SECTION = re.compile(r"(  0\nSECTION\n  2\n(?:BLOCKS|ENTITIES)\n)(.*?)(  0\nENDSEC\n)", re.S)
+# Group codes 10-39 are point coordinates
+COORDINATE_TAG = re.compile(r"^( *[123][0-9]\n)(-?[0-9]+\.[0-9]+(?:[eE][-+]?[0-9]+)?)$", re.M)
+
+def trim_precision(content: bytes, precision: int, encoding: str = "utf-8") -> bytes:
+    """
+    Rounds every entity coordinate (in ENTITIES and BLOCKS) to `precision`
+    decimal places and writes it in its shortest form, e.g.
+    33.333333333333336 becomes 33.333 with precision 3. The header, tables
+    and objects are left as they are.
+    """
+    def round_value(match: re.Match) -> str:
+        return match.group(1) + repr(round(float(match.group(2)), precision))
+
+    def round_section(match: re.Match) -> str:
+        return match.group(1) + COORDINATE_TAG.sub(round_value, match.group(2)) + match.group(3)
+
+    return GEOMETRY_SECTION.sub(round_section, content.decode(encoding)).encode(encoding)
+
+def to_binary(content: bytes, dxfversion: str, encoding: str = "utf-8") -> bytes:
+    """Re-encodes an ASCII DXF as binary DXF, tag by tag; the drawing is unchanged."""
+    buffer = io.BytesIO()
+    writer = BinaryTagWriter(buffer, dxfversion=dxfversion, encoding=encoding)
+    writer.write_signature()
+    writer.write_str(content.decode(encoding).rstrip("\n"))
+    return buffer.getvalue()
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the Content-Encoding for an Accept-Encoding header: the supported
+    coding with the highest q-value, ties broken by CONTENT_ENCODINGS order.
+    None means identity.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name.strip().lower()] = quality
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in CONTENT_ENCODINGS:
+        quality = weights.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "gzip":
+        # mtime=0 keeps the output deterministic, so cached variants stay byte-identical
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if coding == "br" and brotli is not None:
+        return brotli.compress(data, quality=5)
+    raise ValueError(f"Unsupported content encoding '{coding}'")
+
+def worth_deflating(data: bytes) -> bool:
+    """Whether a ZIP entry shrinks enough under deflate, judged on a leading sample."""
+    sample = data[:SAMPLE_BYTES]
+    if not sample:
+        return False
+    return len(zlib.compress(sample, 1)) < MIN_DEFLATE_RATIO * len(sample)
+
+def savings_headers(original_length: int, encoded_length: int) -> Dict[str, str]:
+    """Reports what an encoding saved on the wire."""
+    saved = original_length - encoded_length
+    return {
+        "X-Uncompressed-Length": str(original_length),
+        "X-Bytes-Saved": str(saved),
+        "X-Compression-Ratio": f"{encoded_length / original_length:.3f}" if original_length else "1.000",
+    }
@@ -0,0 +1,118 @@
+import io
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+import ezdxf
+from ..components.registry import spec_for
+from .dxf_template import DXFTemplatePool
+
+# Closed LWPOLYLINE on layer 0, as ezdxf exports it for DXF R2000+
+LWPOLYLINE_HEAD = "  0\nLWPOLYLINE\n  5\n{handle:X}\n330\n{owner}\n100\nAcDbEntity\n  8\n0\n100\nAcDbPolyline\n 90\n{count}\n 70\n1\n"
+
+HANDSEED_PATTERN = re.compile(r"(  9\n\$HANDSEED\n  5\n)([0-9A-Fa-f]+)(\n)")
+
+class DXFWriterVerificationError(Exception):
+    """Raised in verify mode when fast writer output doesn't read back as the expected geometry."""
+
+def _vertex_text(points: Sequence[Sequence[float]]) -> str:
+    # Floats are written as their shortest round-trip repr, the same text ezdxf
+    # emits, so both writers agree byte for byte; one f-string per vertex keeps
+    # formatting in C
+    return "".join([f" 10\n{float(x)!r}\n 20\n{float(y)!r}\n" for x, y, *_ in points])
+
+class FastDXFWriter:
+    """
+    Writes closed-outline drawings as DXF text directly, without ezdxf
+    entities. The header, tables and objects come from the template's
+    pre-serialized prefix/suffix bytes; only the LWPOLYLINE tags are
+    formatted per request, so the output matches the template path exactly.
+
+    Only registered components (whose `draw` adds exactly the closed
+    polylines of `get_outlines()`) take this path; `render` returns None for
+    anything else so callers fall back to ezdxf.
+    """
+    def __init__(self, template: DXFTemplatePool, verify: bool = False):
+        self.template = template
+        self.verify = verify
+        self.first_handle = int(template.handle_seed, 16)
+        # Handles must stay below the template's frozen $HANDSEED
+        self.max_entities = template.handle_limit - self.first_handle
+        self.owner = template.modelspace_handle
+        self.encoding = template.encoding
+
+    def lwpolyline(self, points: Sequence[Sequence[float]], handle: int) -> str:
+        return LWPOLYLINE_HEAD.format(handle=handle, owner=self.owner, count=len(points)) + _vertex_text(points)
+
+    def iter_entities(self, outlines: Iterable[Sequence[Sequence[float]]], limit: Optional[int] = None) -> Iterator[str]:
+        """ENTITIES section text per outline, with consecutive handles from the template's seed."""
+        limit = self.max_entities if limit is None else limit
+        for offset, points in enumerate(outlines):
+            if offset >= limit:
+                raise ValueError(f"Fast writer supports at most {limit} entities per document")
+            yield self.lwpolyline(points, self.first_handle + offset)
+
+    def prefix_bytes(self, entity_count: int) -> bytes:
+        """
+        Template prefix for a document with `entity_count` entities. Past the
+        reserved handle range the header's $HANDSEED is raised to stay above
+        every handle written; nothing in the template uses handles that high.
+        """
+        if entity_count <= self.max_entities:
+            return self.template.prefix_bytes
+        seed = f"{self.first_handle + entity_count:X}"
+        prefix, replaced = HANDSEED_PATTERN.subn(lambda m: m.group(1) + seed + m.group(3), self.template.prefix, count=1)
+        if not replaced:
+            raise ValueError("Template header has no $HANDSEED")
+        return prefix.encode(self.encoding)
+
+    def iter_document(self, outlines: Iterable[Sequence[Sequence[float]]], chunk_entities: int = 1024,
+                      entity_count: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Streams one document holding every outline, e.g. the rows of a
+        ComponentBatch's (N, M, 2) vertex blocks, as encoded byte chunks.
+        Documents with more entities than the template reserves need their
+        `entity_count` up front, since the header is written first.
+        """
+        yield self.template.prefix_bytes if entity_count is None else self.prefix_bytes(entity_count)
+        pending: List[str] = []
+        for entity in self.iter_entities(outlines, limit=entity_count):
+            pending.append(entity)
+            if len(pending) >= chunk_entities:
+                yield "".join(pending).encode(self.encoding)
+                pending = []
+        if pending:
+            yield "".join(pending).encode(self.encoding)
+        yield self.template.suffix_bytes
+
+    def render_outlines(self, outlines: Iterable[Sequence[Sequence[float]]]) -> bytes:
+        if isinstance(outlines, np.ndarray):
+            outlines = outlines.tolist()
+        outlines = list(outlines)
+        content = b"".join(self.iter_document(outlines))
+        if self.verify:
+            self.check(content, outlines)
+        return content
+
+    def render(self, component: Any) -> Optional[bytes]:
+        """Encoded DXF for a registered component, or None if it needs the ezdxf writer."""
+        if spec_for(component) is None:
+            return None
+        return self.render_outlines(component.get_outlines())
+
+    def check(self, content: bytes, outlines: Sequence[Sequence[Sequence[float]]]) -> None:
+        """
+        Correctness check: reads the output back with ezdxf and compares every
+        polyline's vertices with the expected outlines.
+        """
+        try:
+            doc = ezdxf.read(io.StringIO(content.decode(self.encoding)))
+        except Exception as e:
+            raise DXFWriterVerificationError(f"Fast writer output is not readable DXF: {e}") from e
+        polylines = doc.modelspace().query("LWPOLYLINE")
+        if len(polylines) != len(outlines):
+            raise DXFWriterVerificationError(f"Expected {len(outlines)} polylines, read back {len(polylines)}")
+        for index, (polyline, expected) in enumerate(zip(polylines, outlines)):
+            actual = np.asarray(polyline.get_points(format="xy"), dtype=float)
+            expected = np.asarray([(p[0], p[1]) for p in expected], dtype=float)
+            if not polyline.closed or actual.shape != expected.shape or not np.array_equal(actual, expected):
+                raise DXFWriterVerificationError(f"Polyline {index} geometry differs after round trip")
@@ -0,0 +1,309 @@
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import ezdxf
+from ezdxf.lldxf.validator import is_binary_dxf_file
+from ..components.registry import get_spec, specs_for_vertex_count
+from .metrics import span
+from .spatial_index import GridIndex, polyline_bounds
+
+# DXF lines are at most 2049 characters; anything longer isn't plain ASCII DXF
+MAX_LINE_LENGTH = 4096
+BINARY_DXF_SIGNATURE = b"AutoCAD Binary DXF"
+# Polylines classified together in one vectorized pass by iter_profiles
+CLASSIFY_CHUNK_SIZE = 1024
+
+class DXFScanError(Exception):
+    """Raised when the fast tag scanner can't interpret the stream."""
+
+def iter_tags(stream: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yields `(group_code, value)` pairs from an ASCII DXF byte stream, one line
+    pair at a time, so memory stays bounded by the longest line.
+    """
+    readline = stream.readline
+    while True:
+        code_line = readline(MAX_LINE_LENGTH)
+        if not code_line:
+            return
+        value_line = readline(MAX_LINE_LENGTH)
+        if not value_line.endswith(b"\n") and len(value_line) >= MAX_LINE_LENGTH:
+            raise DXFScanError("Line too long for ASCII DXF")
+        try:
+            code = int(code_line)
+        except ValueError:
+            raise DXFScanError(f"Invalid group code {code_line[:20]!r}")
+        yield code, value_line.rstrip(b"\r\n")
+
+def scan_lwpolylines(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every modelspace LWPOLYLINE of the ENTITIES section as
+    `{"handle", "layer", "points"}`, in file order. Each polyline is yielded
+    as soon as its last tag has been read, so a consumer that stops early
+    never reads the rest of the file. Paperspace entities are skipped.
+
+    Raises DXFScanError if the stream isn't ASCII DXF or has no ENTITIES
+    section; the caller should then fall back to a full document load.
+    """
+    if stream.read(len(BINARY_DXF_SIGNATURE)) == BINARY_DXF_SIGNATURE:
+        raise DXFScanError("Binary DXF")
+    stream.seek(0)
+
+    tags = iter_tags(stream)
+    in_entities = False
+    expect_section_name = False
+    entity = None
+    for code, value in tags:
+        if code == 0:
+            if entity is not None and not entity.pop("paperspace"):
+                yield entity
+            entity = None
+            value = value.strip()
+            if in_entities:
+                if value == b"ENDSEC":
+                    return
+                if value == b"LWPOLYLINE":
+                    entity = {"handle": None, "layer": "0", "points": [], "paperspace": False}
+            else:
+                expect_section_name = value == b"SECTION"
+            continue
+
+        if expect_section_name:
+            expect_section_name = False
+            in_entities = code == 2 and value.strip() == b"ENTITIES"
+            continue
+
+        if entity is None:
+            continue
+        try:
+            if code == 10:
+                entity["points"].append([float(value), 0.0])
+            elif code == 20:
+                entity["points"][-1][1] = float(value)
+            elif code == 5:
+                entity["handle"] = value.strip().decode("ascii", errors="replace")
+            elif code == 8:
+                entity["layer"] = value.strip().decode("utf-8", errors="replace")
+            elif code == 67:
+                entity["paperspace"] = int(value) == 1
+        except (ValueError, IndexError):
+            raise DXFScanError("Malformed LWPOLYLINE")
+
+    raise DXFScanError("No ENTITIES section")
+
+def _read_document(stream: BinaryIO, suffix: str = ".dxf"):
+    """Full ezdxf load, used when the fast scanner can't decide."""
+    with span("parse_fallback"):
+        return _read_document_file(stream, suffix)
+
+def _read_document_file(stream: BinaryIO, suffix: str):
+    stream.seek(0)
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            shutil.copyfileobj(stream, tmp)
+            tmp_path = tmp.name
+        if not (ezdxf.is_dxf_file(tmp_path) or is_binary_dxf_file(tmp_path)):
+            raise ezdxf.DXFStructureError("File is not a DXF file")
+        return ezdxf.readfile(tmp_path)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_first_lwpolyline(stream: BinaryIO) -> Optional[List[Tuple[float, float]]]:
+    """
+    Returns the points of the first modelspace LWPOLYLINE, or None if the
+    drawing has none. The upload is scanned tag by tag and reading stops right
+    after that polyline; `ezdxf.readfile` is only used if the scan fails.
+    Raises ezdxf.DXFError for files neither path can read.
+    """
+    try:
+        entity = next(scan_lwpolylines(stream), None)
+        return None if entity is None else [tuple(p) for p in entity["points"]]
+    except DXFScanError:
+        entity = next(_document_lwpolylines(_read_document(stream)), None)
+        return None if entity is None else entity["points"]
+
+def _document_lwpolylines(doc) -> Iterator[Dict[str, Any]]:
+    for pline in doc.modelspace().query('LWPOLYLINE'):
+        yield {
+            "handle": pline.dxf.handle,
+            "layer": pline.dxf.layer,
+            "points": [(p[0], p[1]) for p in pline.get_points()],
+        }
+
+def iter_lwpolylines(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Yields all modelspace LWPOLYLINEs using the fast scanner. If the scan
+    fails part way, the rest comes from a full ezdxf load, skipping the
+    polylines that were already yielded.
+    """
+    emitted = 0
+    try:
+        for entity in scan_lwpolylines(stream):
+            emitted += 1
+            yield entity
+    except DXFScanError:
+        doc = _read_document(stream)
+        for index, entity in enumerate(_document_lwpolylines(doc)):
+            if index >= emitted:
+                yield entity
+
+def _round(values: np.ndarray) -> List[float]:
+    return [round(float(v), 2) for v in values]
+
+def _assign(results: List[Dict[str, Any]], rows: List[int], spec, columns: Dict[str, np.ndarray]) -> None:
+    values = zip(*[_round(columns[name]) for name in spec.param_names])
+    for i, row in zip(rows, values):
+        results[i]["type"] = spec.component_type
+        results[i]["params"] = dict(zip(spec.param_names, row))
+
+def classify_profiles(entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Classifies many polylines at once. Profiles with the same vertex count are
+    stacked into one (N, points, 2) array and handed to the matching registered
+    component's params_from_points, so the recovery math runs vectorized. Returns `{"type", "params", "handle", "layer"}` per
+    entity in input order; unrecognized shapes get type "unknown".
+
+    When several components share a vertex count, each row goes to the first
+    one (in registration order) that redraws it from the recovered params;
+    rows none of them redraws go to the first, as with a single candidate.
+    """
+    results: List[Dict[str, Any]] = []
+    groups: Dict[int, List[int]] = {}
+    for index, entity in enumerate(entities):
+        num_points = len(entity["points"])
+        results.append({
+            "type": "unknown",
+            "params": {"points": num_points},
+            "handle": entity.get("handle"),
+            "layer": entity.get("layer"),
+        })
+        groups.setdefault(num_points, []).append(index)
+
+    for num_points, indices in groups.items():
+        specs = specs_for_vertex_count(num_points)
+        if not specs:
+            continue
+        coords = np.array([entities[i]["points"] for i in indices], dtype=float)[:, :, :2]
+        remaining = np.arange(len(indices))
+        for spec in specs:
+            columns = spec.params_from_points(coords[remaining])
+            # A lone candidate takes every row; among several, a row must be redrawn exactly
+            matched = spec.reproduces(coords[remaining], columns) if len(specs) > 1 else np.ones(len(remaining), dtype=bool)
+            _assign(results, [indices[k] for k in remaining[matched]], spec, {k: v[matched] for k, v in columns.items()})
+            remaining = remaining[~matched]
+            if not len(remaining):
+                break
+        if len(remaining):
+            spec = specs[0]
+            _assign(results, [indices[k] for k in remaining], spec, spec.params_from_points(coords[remaining]))
+
+    return results
+
+def iter_profiles(entities: Iterable[Dict[str, Any]], chunk_size: int = CLASSIFY_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Classifies a stream of polylines chunk by chunk, yielding results as each chunk is done."""
+    chunk = []
+    for entity in entities:
+        chunk.append(entity)
+        if len(chunk) >= chunk_size:
+            yield from classify_profiles(chunk)
+            chunk = []
+    if chunk:
+        yield from classify_profiles(chunk)
+
+def _points_in_polygons(points: np.ndarray, polygons: np.ndarray) -> np.ndarray:
+    """Even-odd test of (M, 2) points against (M, K, 2) closed polygons, one point per polygon."""
+    x, y = points[:, 0:1], points[:, 1:2]
+    x0, y0 = polygons[..., 0], polygons[..., 1]
+    x1, y1 = np.roll(x0, -1, axis=1), np.roll(y0, -1, axis=1)
+    crosses = (y0 <= y) != (y1 <= y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        at_x = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return ((crosses & (x < at_x)).sum(axis=1) % 2) == 1
+
+def find_parents(entities: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Index of the innermost polyline enclosing each polyline, or -1.
+
+    Candidates come from a GridIndex over the bounding boxes, so a drawing
+    of n parts costs O(n log n) instead of n² pairwise checks. Each
+    candidate is then confirmed by testing the child's first vertex against
+    the parent polygon (grouped by vertex count, so the test is vectorized),
+    and the smallest confirmed enclosure wins.
+    """
+    bounds = polyline_bounds(entities)
+    children, parents = GridIndex(bounds).containing(bounds)
+    keep = np.zeros(len(children), dtype=bool)
+    sizes = np.fromiter((len(entity["points"]) for entity in entities), dtype=np.intp, count=len(entities))
+    for num_points in np.unique(sizes[parents]):
+        group = np.flatnonzero(sizes[parents] == num_points)
+        polygons = np.array([entities[i]["points"] for i in parents[group]], dtype=float)[:, :, :2]
+        first = np.array([entities[i]["points"][0][:2] for i in children[group]], dtype=float).reshape(-1, 2)
+        keep[group] = _points_in_polygons(first, polygons)
+    children, parents = children[keep], parents[keep]
+
+    area = np.prod(bounds[:, 2:] - bounds[:, :2], axis=1)
+    order = np.lexsort((area[parents], children))
+    children, parents = children[order], parents[order]
+    innermost = np.unique(children, return_index=True)[1]
+    result = np.full(len(entities), -1, dtype=np.intp)
+    result[children[innermost]] = parents[innermost]
+    return result
+
+def nest_profiles(entities: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Resolves containment between the classified polylines. A rectangle with
+    exactly one rectangular hole and uniform walls becomes a single "hollow"
+    result whose "holes" lists the inner handle; the inner polyline is not
+    reported separately. Every other enclosed profile gets the handle of its
+    innermost enclosing polyline as "parent".
+    """
+    parent = find_parents(entities)
+    enclosed = np.flatnonzero(parent >= 0)
+    hole_count = np.bincount(parent[enclosed], minlength=len(entities))
+    sizes = np.fromiter((len(entity["points"]) for entity in entities), dtype=np.intp, count=len(entities))
+    pairs = enclosed[(hole_count[parent[enclosed]] == 1) & (sizes[enclosed] == 4) & (sizes[parent[enclosed]] == 4)]
+
+    merged = set()
+    if len(pairs):
+        spec = get_spec("hollow")
+        outer = np.array([entities[i]["points"] for i in parent[pairs]], dtype=float)[:, :, :2]
+        inner = np.array([entities[i]["points"] for i in pairs], dtype=float)[:, :, :2]
+        columns = spec.cls.params_from_outlines(outer, inner)
+        hollow = ~np.isnan(columns["t"])
+        values = zip(*[_round(columns[name][hollow]) for name in spec.param_names])
+        for i, row in zip(pairs[hollow].tolist(), values):
+            outer_result = results[parent[i]]
+            outer_result["type"] = spec.component_type
+            outer_result["params"] = dict(zip(spec.param_names, row))
+            outer_result["holes"] = [results[i]["handle"]]
+            merged.add(i)
+
+    nested = []
+    for i, result in enumerate(results):
+        if i in merged:
+            continue
+        if parent[i] >= 0:
+            result["parent"] = results[parent[i]]["handle"]
+        nested.append(result)
+    return nested
+
+def parse_nested(entities: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Classifies all polylines and resolves nesting; needs the whole drawing before returning anything."""
+    entities = list(entities)
+    with span("parse_nesting"):
+        return nest_profiles(entities, classify_profiles(entities))
+
+def classify_points(points: List[Tuple[float, float]]) -> Dict[str, Any]:
+    """
+    Recognizes the profiles drawn by registered components (e.g. IBeam with 12
+    points, Column with 4) and recovers their parameters. Raises ValueError
+    for other shapes.
+    """
+    result = classify_profiles([{"points": points}])[0]
+    if result["type"] == "unknown":
+        raise ValueError(f"Unsupported polyline structure ({len(points)} points)")
+    return {"type": result["type"], "params": result["params"]}
@@ -1,37 +1,347 @@
 import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Any, Optional
+import functools
+import io
+import itertools
+import logging
+import math
+import os
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Callable
 import ezdxf
+from .dxf_template import DXFTemplatePool, get_template_pool
+from .dxf_fast_writer import FastDXFWriter
+from .dxf_encoding import OUTPUT_FORMATS, to_binary, trim_precision
+from .metrics import span
+from ..interfaces.dxf_generator_interface import DXFGeneratorInterface
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process", "inline")
+WRITER_MODES = ("ezdxf", "fast")
+# Chunk size for streamed input of unknown length, per executor mode
+STREAM_CHUNKSIZE = {"thread": 16, "process": 64, "inline": 64}
+
+def _to_spec(component: Any) -> Any:
+    """
+    Converts a known component into a plain `(component_type, params)` tuple so
+    it can be shipped to a worker process cheaply. Unknown components are
+    passed through unchanged and must be picklable themselves.
+    """
+    described = DXFGeneratorInterface.describe(component)
+    if described is None:
+        return component
+    component_type, params = described
+    return component_type, tuple(params.items())
+
+def _from_spec(item: Any) -> Any:
+    if isinstance(item, tuple):
+        component_type, params = item
+        return DXFGeneratorInterface(component_type, dict(params)).get_component()
+    return item
+
+# One inline service per output settings (writer, verify, output, precision) in each worker process
+_worker_services: Dict[Tuple, "DXFService"] = {}
+
+def _get_worker_service(**settings: Any) -> "DXFService":
+    key = tuple(sorted(settings.items()))
+    service = _worker_services.get(key)
+    if service is None:
+        service = _worker_services[key] = DXFService(executor="inline", **settings)
+    return service
+
+def _process_render_chunk(chunk: List[Any], **settings: Any) -> List[Tuple[Optional[bytes], Optional[str]]]:
+    return _get_worker_service(**settings)._render_chunk(chunk)
+
+def _process_save_chunk(chunk: List[Tuple[Any, str]], **settings: Any) -> List[Tuple[Optional[str], Optional[str]]]:
+    return _get_worker_service(**settings)._save_chunk(chunk)
+
+class _InlineExecutor(Executor):
+    """Runs submitted work immediately in the calling thread."""
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
 
 class DXFService:
-    def __init__(self, max_workers: int = 4):
+    """
+    Renders components to DXF.
+
+    Batch work runs on a pluggable executor: "thread" (default), "process"
+    for CPU-bound batches that should use every core, or "inline" to run in
+    the calling thread. Items are submitted in chunks of `batch_chunksize`
+    (sized automatically when None); process workers receive plain
+    `(component_type, params)` tuples and rebuild the components themselves.
+
+    `writer` selects how single drawings are serialized: "ezdxf" draws into
+    the template document, "fast" writes registered outlines as DXF text
+    directly (see FastDXFWriter). `verify` reads fast output back with ezdxf
+    and compares the geometry. Both default to the DXF_WRITER and
+    DXF_WRITER_VERIFY environment variables.
+
+    `output="binary"` re-encodes every drawing as binary DXF, and
+    `precision` rounds entity coordinates to that many decimal places; both
+    are applied after rendering, so every writer supports them.
+    """
+    def __init__(self, max_workers: int = 4, chunk_size: int = 64 * 1024, template: Optional[DXFTemplatePool] = None,
+                 executor: str = "thread", batch_chunksize: Optional[int] = None, writer: Optional[str] = None,
+                 verify: Optional[bool] = None, output: str = "ascii", precision: Optional[int] = None):
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unsupported executor '{executor}', expected one of {EXECUTOR_MODES}")
+        if writer is None:
+            writer = os.environ.get("DXF_WRITER", "ezdxf")
+        if writer not in WRITER_MODES:
+            raise ValueError(f"Unsupported writer '{writer}', expected one of {WRITER_MODES}")
+        if verify is None:
+            verify = os.environ.get("DXF_WRITER_VERIFY", "0") == "1"
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output '{output}', expected one of {OUTPUT_FORMATS}")
+        if precision is not None and not 0 <= precision <= 15:
+            raise ValueError("Precision must be between 0 and 15 decimal places")
         self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.batch_chunksize = batch_chunksize
+        self.writer = writer
+        self.verify = verify
+        self.output = output
+        self.precision = precision
+        self._template = template
+        self._fast_writer: Optional[FastDXFWriter] = None
+        self._executor: Optional[Executor] = None
+
+    @property
+    def template(self) -> DXFTemplatePool:
+        # Resolved lazily so process workers build their own pool
+        if self._template is None:
+            self._template = get_template_pool()
+        return self._template
+
+    @property
+    def fast_writer(self) -> FastDXFWriter:
+        if self._fast_writer is None:
+            self._fast_writer = FastDXFWriter(self.template, verify=self.verify)
+        return self._fast_writer
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            elif self.executor == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = _InlineExecutor()
+        return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "DXFService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def build_document(self, component: Any):
+        with span("ezdxf_new"):
+            doc = ezdxf.new()
+        msp = doc.modelspace()
+        with span("draw"):
+            component.draw(msp) # Assuming component has a draw method
+        return doc
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Constructor arguments that determine the output bytes."""
+        return {"writer": self.writer, "verify": self.verify, "output": self.output, "precision": self.precision}
+
+    def _render_ascii(self, component: Any) -> bytes:
+        if self.writer == "fast":
+            with span("fast_write"):
+                content = self.fast_writer.render(component)
+            if content is not None:
+                return content
+        content = self.template.render(component)
+        if content is not None:
+            return content
+        doc = self.build_document(component)
+        with span("serialize"):
+            buffer = io.StringIO()
+            doc.write(buffer)
+            return doc.encode(buffer.getvalue())
+
+    def to_bytes(self, component: Any) -> bytes:
+        """
+        Renders the component into an in-memory DXF document and returns the
+        encoded file content, without touching the filesystem.
+
+        With the fast writer, registered components are written directly as
+        DXF text. Other plain modelspace drawings are rendered against the
+        pre-serialized template; anything else falls back to a fresh ezdxf
+        document.
+        """
+        return self.encode(self._render_ascii(component))
+
+    def encode(self, content: bytes) -> bytes:
+        """Applies this service's precision and output format to rendered ASCII DXF."""
+        if self.precision is not None:
+            with span("trim_precision"):
+                content = trim_precision(content, self.precision, self.template.encoding)
+        if self.output == "binary":
+            with span("binary_encode"):
+                content = to_binary(content, self.template.dxfversion, self.template.encoding)
+        return content
+
+    def iter_chunks(self, data: bytes) -> Iterator[bytes]:
+        """
+        Yields already rendered DXF content in chunks of `chunk_size` bytes,
+        suitable for a streaming HTTP response.
+        """
+        view = memoryview(data)
+        for start in range(0, len(data), self.chunk_size):
+            yield bytes(view[start:start + self.chunk_size])
+
+    def stream(self, component: Any) -> Iterator[bytes]:
+        return self.iter_chunks(self.to_bytes(component))
 
     def save(self, component: Any, filename: Optional[str] = None) -> str:
         if filename is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{type(component).__name__}_{timestamp}.dxf"
 
-        doc = ezdxf.new()
-        msp = doc.modelspace()
-        component.draw(msp) # Assuming component has a draw method
-        doc.saveas(filename)
+        content = self.to_bytes(component)
+        with span("saveas"):
+            with open(filename, "wb") as f:
+                f.write(content)
         return filename
 
-    def save_batch(self, components: List[Any], filenames: Optional[List[str]] = None) -> List[str]:
+    def _render_chunk(self, chunk: List[Any]) -> List[Tuple[Optional[bytes], Optional[str]]]:
+        results = []
+        for item in chunk:
+            try:
+                results.append((self.to_bytes(_from_spec(item)), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
+
+    def _save_chunk(self, chunk: List[Tuple[Any, str]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        results = []
+        for item, filename in chunk:
+            try:
+                results.append((self.save(_from_spec(item), filename), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
+
+    def _for_workers(self, fn: Callable) -> Callable:
+        """Binds this service's writer settings to a process-pool entry point."""
+        return functools.partial(fn, **self.settings)
+
+    def _chunksize(self, count: int) -> int:
+        if self.batch_chunksize:
+            return self.batch_chunksize
+        if self.executor != "process":
+            return 1
+        # A few chunks per worker balances load without paying IPC per item
+        return max(1, min(256, math.ceil(count / (self.max_workers * 4))))
+
+    def _iter_chunks_completed(self, items: List[Any], thread_fn: Callable, process_fn: Callable,
+                               to_spec: Callable = _to_spec) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        Submits `items` in chunks and yields `(start_index, results)` as each
+        chunk completes. Items are converted with `to_spec` for process workers.
+        Inline chunks are rendered one at a time as the caller asks for them.
+        """
+        size = self._chunksize(len(items))
+        if self.executor == "inline":
+            for start in range(0, len(items), size):
+                yield start, thread_fn(items[start:start + size])
+            return
+        if self.executor == "process":
+            fn = process_fn
+            items = [to_spec(item) for item in items]
+        else:
+            fn = thread_fn
+        executor = self._get_executor()
+        future_to_start = {executor.submit(fn, items[start:start + size]): start for start in range(0, len(items), size)}
+        try:
+            for future in as_completed(future_to_start):
+                yield future_to_start[future], future.result()
+        finally:
+            for future in future_to_start:
+                future.cancel()
+
+    def iter_batch_bytes(self, components: List[Any]) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """
+        Renders the components on the configured executor and yields
+        `(index, content, error)` as each chunk finishes. Failures are reported
+        per item instead of aborting the remaining drawings.
+        """
+        for start, results in self._iter_chunks_completed(components, self._render_chunk, self._for_workers(_process_render_chunk)):
+            for offset, (content, error) in enumerate(results):
+                yield start + offset, content, error
+
+    def render_batch(self, components: List[Any]) -> List[Optional[bytes]]:
+        """Renders the components and returns their content in input order (None for failures)."""
+        contents: List[Optional[bytes]] = [None] * len(components)
+        for index, content, error in self.iter_batch_bytes(components):
+            if error is not None:
+                logger.warning("Error generating DXF #%d: %s", index, error)
+            contents[index] = content
+        return contents
+
+    def save_batch(self, components: List[Any], filenames: Optional[List[str]] = None) -> List[Optional[str]]:
         if filenames is None:
             # Fallback if filenames are not provided (should be provided by main.py now)
             base_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filenames = [f"{type(comp).__name__}_{base_timestamp}_{i+1}.dxf" for i, comp in enumerate(components)]
 
-        generated_files = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_component = {executor.submit(self.save, comp, fname): comp for comp, fname in zip(components, filenames)}
-            for future in as_completed(future_to_component):
-                try:
-                    filename = future.result()
-                    generated_files.append(filename)
-                except Exception as e:
-                    print(f"Error generating DXF: {e}")
-                    generated_files.append(None)
-        return generated_files
\ No newline at end of file
+        # Results are placed by input index, so generated_files[i] always belongs to components[i]
+        generated_files: List[Optional[str]] = [None] * len(components)
+        items = list(zip(components, filenames))
+        chunks = self._iter_chunks_completed(items, self._save_chunk, self._for_workers(_process_save_chunk),
+                                             to_spec=lambda pair: (_to_spec(pair[0]), pair[1]))
+        for start, results in chunks:
+            for offset, (filename, error) in enumerate(results):
+                if error is not None:
+                    logger.warning("Error generating DXF #%d: %s", start + offset, error)
+                generated_files[start + offset] = filename
+        return generated_files
+
+    def iter_save_stream(self, items: Iterable[Tuple[Any, str]], window: Optional[int] = None) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+        """
+        Saves a stream of `(component, filename)` pairs of any length, yielding
+        `(filename, error)` per item in input order. Input is pulled lazily and
+        at most `window` chunks (default: 2 per worker) are in flight, so memory
+        stays flat however long the stream is. Components may also be given as
+        `(component_type, params)` tuples, which are cheaper to ship to processes.
+        """
+        size = self.batch_chunksize or STREAM_CHUNKSIZE[self.executor]
+        window = window or self.max_workers * 2
+        if self.executor == "process":
+            fn = self._for_workers(_process_save_chunk)
+            to_spec = lambda pair: (_to_spec(pair[0]), pair[1])
+        else:
+            fn = self._save_chunk
+            to_spec = lambda pair: pair
+        executor = self._get_executor()
+        pending: "deque[Future]" = deque()
+        iterator = iter(items)
+        try:
+            while True:
+                chunk = [to_spec(pair) for pair in itertools.islice(iterator, size)]
+                if not chunk:
+                    break
+                pending.append(executor.submit(fn, chunk))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,102 @@
+import io
+import queue
+import threading
+from typing import Any, Optional
+import ezdxf
+from ezdxf.lldxf.tagwriter import TagWriter
+from .metrics import span
+
+ENTITIES_MARKER = "  0\nSECTION\n  2\nENTITIES\n"
+ENDSEC_MARKER = "  0\nENDSEC\n"
+
+class DXFTemplatePool:
+    """
+    Pool of prebuilt ezdxf documents used to render single-component drawings.
+
+    A default document is created and serialized once. Everything except the
+    ENTITIES section is kept as a pre-serialized prefix/suffix, so a request
+    only draws its component into a pooled document, exports the new modelspace
+    entities and removes them again. Entity handles are taken from a reserved
+    range below the frozen $HANDSEED, which keeps the output valid and the same
+    parameters always produce the same bytes.
+    """
+    HANDLE_RESERVE = 0x10000
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        doc = ezdxf.new()
+        self.dxfversion = doc.dxfversion
+        self.encoding = doc.output_encoding
+        self.handle_seed = str(doc.entitydb.handles)
+        # BLOCK_RECORD handle that owns modelspace entities (group code 330)
+        self.modelspace_handle = doc.modelspace().layout_key
+        self.handle_limit = int(self.handle_seed, 16) + self.HANDLE_RESERVE
+        doc.entitydb.handles.reset(f"{self.handle_limit:X}")
+
+        buffer = io.StringIO()
+        doc.write(buffer)
+        self.text = buffer.getvalue()
+        start = self.text.index(ENTITIES_MARKER) + len(ENTITIES_MARKER)
+        end = self.text.index(ENDSEC_MARKER, start)
+        if start != end:
+            raise RuntimeError("Template document must have an empty ENTITIES section")
+        self.prefix = self.text[:start]
+        self.suffix = self.text[end:]
+        self.prefix_bytes = self.prefix.encode(self.encoding)
+        self.suffix_bytes = self.suffix.encode(self.encoding)
+
+        self._documents: "queue.Queue" = queue.Queue()
+        self._documents.put((doc, len(doc.entitydb)))
+        for _ in range(size - 1):
+            self._documents.put(self._load())
+
+    def _load(self):
+        doc = ezdxf.read(io.StringIO(self.text))
+        return doc, len(doc.entitydb)
+
+    def render_entities(self, component: Any) -> Optional[str]:
+        """
+        Returns the ENTITIES section body for the component, or None if the
+        component needs more than a plain modelspace (new tables, blocks or
+        more handles than reserved) and has to be drawn into a full document.
+        """
+        doc, baseline = self._documents.get()
+        try:
+            entitydb = doc.entitydb
+            entitydb.handles.reset(self.handle_seed)
+            msp = doc.modelspace()
+            try:
+                with span("draw"):
+                    component.draw(msp)
+                with span("serialize"):
+                    buffer = io.StringIO()
+                    msp.entity_space.export_dxf(TagWriter(buffer, write_handles=True, dxfversion=self.dxfversion))
+                in_range = int(str(entitydb.handles), 16) <= self.handle_limit
+            finally:
+                msp.delete_all_entities()
+                entitydb.purge()
+            if len(entitydb) != baseline:
+                # The component touched document resources; replace the polluted copy
+                doc, baseline = self._load()
+                return None
+            return buffer.getvalue() if in_range else None
+        finally:
+            self._documents.put((doc, baseline))
+
+    def render(self, component: Any) -> Optional[bytes]:
+        entities = self.render_entities(component)
+        if entities is None:
+            return None
+        return (self.prefix + entities + self.suffix).encode(self.encoding, errors="dxfreplace")
+
+_default_pool: Optional[DXFTemplatePool] = None
+_default_pool_lock = threading.Lock()
+
+def get_template_pool() -> DXFTemplatePool:
+    """Returns the process-wide template pool, creating it on first use."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = DXFTemplatePool()
+    return _default_pool
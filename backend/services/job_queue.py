@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .worker_pool import PoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claim TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    heartbeat REAL,
+    finished REAL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, seq);
+CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires);
+"""
+
+# Columns reported by JobQueue.get
+PUBLIC_FIELDS = ("id", "kind", "priority", "status", "total", "done", "failed", "attempts", "error",
+                 "created", "started", "finished", "expires")
+
+class JobCancelled(Exception):
+    """Raised from JobContext.progress when the job was cancelled or taken over by another worker."""
+
+class JobContext:
+    """
+    What a handler sees of the job it runs: the stored payload, the path to
+    write its result to, and `progress` to report counts. `progress` also
+    refreshes the heartbeat and raises JobCancelled once the job is no longer
+    running here, so handlers stop at their next report. A job counts as
+    running here only while it carries this run's claim token: if it was
+    requeued and claimed again elsewhere, this run is cancelled. Handlers
+    must report more often than the queue's `stale_after`, or the job counts
+    as orphaned.
+    """
+    def __init__(self, queue: "JobQueue", job_id: str, claim: str, payload: Dict[str, Any], total: int, result_path: str):
+        self.queue = queue
+        self.id = job_id
+        self.claim = claim
+        self.payload = payload
+        self.total = total
+        self.result_path = result_path
+        self.done = 0
+        self.failed = 0
+        self._reported_at = 0.0
+
+    def progress(self, done: int, failed: int = 0, force: bool = False) -> None:
+        self.done = done
+        self.failed = failed
+        now = time.time()
+        # Writes are throttled; cancellation is noticed within one interval
+        if force or now - self._reported_at >= self.queue.progress_interval:
+            self._reported_at = now
+            if not self.queue._report(self.id, self.claim, done, failed, now):
+                raise JobCancelled(self.id)
+
+class JobQueue:
+    """
+    Persistent priority queue for long-running work such as large batches.
+
+    Jobs live in a SQLite database under `root` and results as files next to
+    it, so queued work survives a restart and every uvicorn worker sharing
+    `root` sees the same jobs. `workers` threads per process claim the
+    highest-priority queued job (ties in submission order) with one
+    transaction, so a job runs exactly once even across processes.
+
+    A running job whose heartbeat is older than `stale_after` seconds belongs
+    to a worker that died; the janitor puts it back in the queue, up to
+    `max_attempts` runs. Finished jobs and their results are deleted `ttl`
+    seconds after they finish. At most `max_queued` jobs may wait; `submit`
+    raises PoolSaturatedError beyond that.
+    """
+    def __init__(self, root: str, handlers: Dict[str, Callable[[JobContext], None]], workers: int = 2,
+                 max_queued: int = 1000, ttl: float = 3600.0, stale_after: float = 60.0, max_attempts: int = 3,
+                 progress_interval: float = 0.5, poll_interval: float = 1.0, janitor_interval: float = 30.0,
+                 retry_after: int = 5):
+        self.root = root
+        self.handlers = handlers
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.progress_interval = progress_interval
+        self.poll_interval = poll_interval
+        self.janitor_interval = janitor_interval
+        self.retry_after = retry_after
+        self.results_dir = os.path.join(root, "results")
+        os.makedirs(self.results_dir, exist_ok=True)
+        self.db_path = os.path.join(root, "jobs.sqlite3")
+        self._local = threading.local()
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            # Databases created before claim tokens existed
+            if "claim" not in {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}:
+                db.execute("ALTER TABLE jobs ADD COLUMN claim TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections can't be shared
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def result_file(self, job_id: str) -> str:
+        return os.path.join(self.results_dir, f"{job_id}.zip")
+
+    def submit(self, kind: str, payload: Dict[str, Any], total: int = 0, priority: int = 0) -> str:
+        """Queues a job for the `kind` handler and returns its id. Higher priorities run first."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unsupported job kind '{kind}'")
+        job_id = uuid.uuid4().hex
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                raise PoolSaturatedError(self.retry_after)
+            db.execute(
+                "INSERT INTO jobs (id, kind, priority, status, payload, total, created) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, priority, json.dumps(payload), total, time.time()),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        with self._wake:
+            self._wake.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(f"SELECT {', '.join(PUBLIC_FIELDS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def result_path(self, job_id: str) -> Optional[str]:
+        """Path of a finished job's result, or None if there is none (yet)."""
+        path = self.result_file(job_id)
+        return path if os.path.exists(path) else None
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancels a queued or running job, or deletes a finished one together
+        with its result. Returns the resulting state ("cancelled" or
+        "deleted"), or None for unknown jobs.
+        """
+        db = self._connect()
+        now = time.time()
+        cursor = db.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ?, expires = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (now, now + self.ttl, job_id),
+        )
+        if cursor.rowcount:
+            return "cancelled"
+        if not db.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount:
+            return None
+        self._remove(self.result_file(job_id))
+        return "deleted"
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def _claim(self) -> Optional[Tuple[sqlite3.Row, str]]:
+        """Marks the next queued job as running under a fresh claim token and returns `(row, token)`."""
+        db = self._connect()
+        claim = uuid.uuid4().hex
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, kind, payload, total FROM jobs WHERE status = 'queued' ORDER BY priority DESC, seq LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                db.execute(
+                    "UPDATE jobs SET status = 'running', claim = ?, started = ?, heartbeat = ?, attempts = attempts + 1, "
+                    "done = 0, failed = 0 WHERE id = ?",
+                    (claim, now, now, row["id"]),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return None if row is None else (row, claim)
+
+    def _report(self, job_id: str, claim: str, done: int, failed: int, now: float) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE jobs SET done = ?, failed = ?, heartbeat = ? WHERE id = ? AND claim = ? AND status = 'running'",
+            (done, failed, now, job_id, claim),
+        )
+        return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, claim: str, status: str, error: Optional[str] = None,
+                result: Optional[str] = None) -> bool:
+        """
+        Ends a run that still holds `claim`, moving `result` into place in the
+        same transaction, so a run that lost its claim can never overwrite
+        the result of the run that took over.
+        """
+        now = time.time()
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?, expires = ? WHERE id = ? AND claim = ? AND status = 'running'",
+                (status, error, now, now + self.ttl, job_id, claim),
+            )
+            owned = cursor.rowcount == 1
+            if owned and result is not None:
+                os.replace(result, self.result_file(job_id))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return owned
+
+    def run_next(self) -> bool:
+        """Claims and runs one queued job in the calling thread. Returns False if none was queued."""
+        claimed = self._claim()
+        if claimed is None:
+            return False
+        row, claim = claimed
+        job_id = row["id"]
+        context = JobContext(self, job_id, claim, json.loads(row["payload"]), row["total"],
+                             os.path.join(self.results_dir, f".tmp-{job_id}-{uuid.uuid4().hex[:8]}"))
+        try:
+            self.handlers[row["kind"]](context)
+            context.progress(context.done, context.failed, force=True)
+            # False if cancelled or taken over since the last report; the temp file is dropped below
+            self._finish(job_id, claim, "done", result=context.result_path)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            self._finish(job_id, claim, "failed", str(e))
+        finally:
+            self._remove(context.result_path)
+        return True
+
+    def expire(self) -> int:
+        """
+        One janitor pass: requeues jobs of dead workers and deletes finished
+        jobs past their TTL together with their results. Returns the number
+        of jobs deleted.
+        """
+        db = self._connect()
+        now = time.time()
+        db.execute(
+            "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', finished = ?, expires = ? "
+            "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+            (now, now + self.ttl, now - self.stale_after, self.max_attempts),
+        )
+        if db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running' AND heartbeat < ?",
+                      (now - self.stale_after,)).rowcount:
+            with self._wake:
+                self._wake.notify_all()
+        expired = [row[0] for row in db.execute("SELECT id FROM jobs WHERE expires < ?", (now,))]
+        for job_id in expired:
+            if db.execute("DELETE FROM jobs WHERE id = ? AND expires < ?", (job_id, now)).rowcount:
+                self._remove(self.result_file(job_id))
+        return len(expired)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _run_worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.run_next():
+                    continue
+            except sqlite3.Error:
+                logger.exception("Job queue error")
+            # Other processes' submissions are picked up on the next poll
+            with self._wake:
+                self._wake.wait(self.poll_interval)
+
+    def _run_janitor(self) -> None:
+        while not self._stop.wait(self.janitor_interval):
+            try:
+                self.expire()
+            except sqlite3.Error:
+                logger.exception("Job janitor error")
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self.expire()
+        for index in range(self.workers):
+            self._threads.append(threading.Thread(target=self._run_worker, name=f"dxf-job-{index}", daemon=True))
+        self._threads.append(threading.Thread(target=self._run_janitor, name="dxf-job-janitor", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stops the threads after their current job; unfinished jobs resume on the next start."""
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+def job_queue_from_env(handlers: Dict[str, Callable[[JobContext], None]]) -> Optional[JobQueue]:
+    """
+    Builds the job queue stored in DXF_JOBS_DIR (disabled when unset) with
+    DXF_JOB_WORKERS threads, DXF_JOB_MAX_QUEUED waiting jobs and results
+    kept for DXF_JOB_TTL seconds. The caller starts it.
+    """
+    root = os.environ.get("DXF_JOBS_DIR")
+    if not root:
+        return None
+    return JobQueue(
+        root,
+        handlers,
+        workers=int(os.environ.get("DXF_JOB_WORKERS", 2)),
+        max_queued=int(os.environ.get("DXF_JOB_MAX_QUEUED", 1000)),
+        ttl=float(os.environ.get("DXF_JOB_TTL", 3600)),
+    )
@@ -0,0 +1,129 @@
+import io
+import math
+from dataclasses import dataclass
+from typing import List, Any, Dict, Optional, Tuple
+import ezdxf
+from .dxf_cache import DXFCache
+from ..interfaces.dxf_generator_interface import DXFGeneratorInterface
+
+LAYOUT_MODES = ("shelf", "grid")
+
+@dataclass
+class Placement:
+    index: int
+    block_name: str
+    x: float
+    y: float
+    width: float
+    height: float
+
+class SheetLayout:
+    """
+    Places many components on one fabrication sheet.
+
+    Every distinct component is defined once as a BLOCK and referenced by
+    INSERT entities, so a schedule that repeats the same section many times
+    only stores its geometry once. Components are arranged by bounding box
+    either on shelves (rows filled left to right, tallest first) or on a
+    uniform grid, with `spacing` between neighbours.
+    """
+    def __init__(self, mode: str = "shelf", spacing: float = 50.0, sheet_width: Optional[float] = None):
+        if mode not in LAYOUT_MODES:
+            raise ValueError(f"Unsupported layout mode '{mode}', expected one of {LAYOUT_MODES}")
+        if spacing < 0:
+            raise ValueError("Spacing cannot be negative")
+        self.mode = mode
+        self.spacing = spacing
+        self.sheet_width = sheet_width
+
+    @staticmethod
+    def _block_key(component: Any) -> str:
+        described = DXFGeneratorInterface.describe(component)
+        if described is None:
+            # Unknown classes can't be compared by parameters; never share their blocks
+            return f"{type(component).__name__}_{id(component):x}"
+        component_type, params = described
+        return f"{component_type.upper()}_{DXFCache.make_key(component_type, params)[:16]}"
+
+    @staticmethod
+    def _bounds(component: Any) -> Tuple[float, float, float, float]:
+        points = component.get_points()
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _sheet_width(self, sizes: List[Tuple[float, float]]) -> float:
+        if self.sheet_width:
+            return self.sheet_width
+        # Aim for a roughly square sheet
+        area = sum((w + self.spacing) * (h + self.spacing) for w, h in sizes)
+        widest = max(w for w, _ in sizes)
+        return max(math.sqrt(area), widest)
+
+    def _place_shelves(self, sizes: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        width = self._sheet_width(sizes)
+        positions: List[Tuple[float, float]] = [(0.0, 0.0)] * len(sizes)
+        order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+        x = y = shelf_height = 0.0
+        for i in order:
+            w, h = sizes[i]
+            if x > 0 and x + w > width:
+                # Start a new shelf below the current one
+                y -= shelf_height + self.spacing
+                x = shelf_height = 0.0
+            positions[i] = (x, y - h)
+            x += w + self.spacing
+            shelf_height = max(shelf_height, h)
+        return positions
+
+    def _place_grid(self, sizes: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        cell_w = max(w for w, _ in sizes) + self.spacing
+        cell_h = max(h for _, h in sizes) + self.spacing
+        if self.sheet_width:
+            columns = max(1, int((self.sheet_width + self.spacing) // cell_w))
+        else:
+            columns = math.ceil(math.sqrt(len(sizes)))
+        return [((i % columns) * cell_w, -(i // columns) * cell_h - cell_h + self.spacing)
+                for i in range(len(sizes))]
+
+    def place(self, components: List[Any]) -> List[Placement]:
+        if not components:
+            return []
+        bounds: Dict[str, Tuple[float, float, float, float]] = {}
+        keys = []
+        for component in components:
+            key = self._block_key(component)
+            if key not in bounds:
+                bounds[key] = self._bounds(component)
+            keys.append(key)
+
+        sizes = [(bounds[k][2] - bounds[k][0], bounds[k][3] - bounds[k][1]) for k in keys]
+        if self.mode == "shelf":
+            positions = self._place_shelves(sizes)
+        else:
+            positions = self._place_grid(sizes)
+
+        placements = []
+        for index, (key, (x, y), (w, h)) in enumerate(zip(keys, positions, sizes)):
+            min_x, min_y, _, _ = bounds[key]
+            # INSERT base point: shift the block so its bounding box starts at (x, y)
+            placements.append(Placement(index, key, x - min_x, y - min_y, w, h))
+        return placements
+
+    def build_document(self, components: List[Any]):
+        doc = ezdxf.new()
+        msp = doc.modelspace()
+        defined = set()
+        for placement, component in zip(self.place(components), components):
+            if placement.block_name not in defined:
+                block = doc.blocks.new(name=placement.block_name)
+                component.draw(block)
+                defined.add(placement.block_name)
+            msp.add_blockref(placement.block_name, (placement.x, placement.y))
+        return doc
+
+    def to_bytes(self, components: List[Any]) -> bytes:
+        doc = self.build_document(components)
+        buffer = io.StringIO()
+        doc.write(buffer)
+        return doc.encode(buffer.getvalue())
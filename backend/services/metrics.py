@@ -0,0 +1,231 @@
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Seconds; covers sub-millisecond template renders up to multi-second uploads
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels.items())
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, rendered in Prometheus text format."""
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # One slot per bucket, then sum and count
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        with self._lock:
+            return {key: {"buckets": list(zip(self.buckets, series[:-2])), "sum": series[-2], "count": series[-1]}
+                    for key, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, data in sorted(self.snapshot().items()):
+            labels = dict(zip(self.label_names, key))
+            for bound, count in data["buckets"]:
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {int(count)}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {int(data['count'])}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {int(data['count'])}")
+        return lines
+
+class CallbackMetric:
+    """
+    Gauge or counter whose value is read from a callback at scrape time. The
+    callback returns a number or a list of `(labels, value)` pairs.
+    """
+    def __init__(self, name: str, help: str, callback: Callable[[], Any], metric_type: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metric_type}"]
+        try:
+            value = self.callback()
+        except Exception:
+            # A broken collector must not take down the whole scrape
+            return lines
+        samples = value if isinstance(value, list) else [({}, value)]
+        for labels, sample in samples:
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(sample)}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help, label_names, buckets)
+            return metric
+
+    def register_callback(self, name: str, help: str, callback: Callable[[], Any], metric_type: str = "gauge") -> None:
+        """Registers (or replaces) a callback-backed gauge or counter."""
+        with self._lock:
+            self._metrics[name] = CallbackMetric(name, help, callback, metric_type)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+stage_duration = registry.histogram(
+    "dxf_stage_duration_seconds",
+    "Time spent in each generation / parse stage.",
+    ("stage",),
+)
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Times the enclosed block into dxf_stage_duration_seconds{stage=...}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_duration.observe(time.perf_counter() - start, stage=stage)
+
+def timed_iter(stage: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Wraps a response body iterator and records how long sending it took."""
+    start = time.perf_counter()
+    try:
+        yield from chunks
+    finally:
+        stage_duration.observe(time.perf_counter() - start, stage=stage)
+
+class SamplingProfiler:
+    """
+    Low-overhead sampling profiler for the thread that enters it.
+
+    A daemon thread captures the profiled thread's stack every `interval`
+    seconds via sys._current_frames() and counts identical stacks, which is
+    enough to see where a slow request spends its time without the cost of a
+    deterministic profiler.
+    """
+    def __init__(self, interval: float = 0.001, max_depth: int = 48):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+        self._started = 0.0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            # Collapsed-stack format, outermost frame first
+            stack = ";".join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="dxf-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        stacks = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "samples": self.samples,
+            "interval_s": self.interval,
+            "elapsed_s": self.elapsed,
+            "stacks": [{"stack": stack, "count": count} for stack, count in stacks],
+        }
+
+class ProfileStore:
+    """Keeps the most recent request profiles so they can be fetched after the response."""
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, profile_id: str, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles[profile_id] = report
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def profiled(self, fn: Callable) -> Tuple[Callable, str]:
+        """
+        Wraps `fn` so it runs under a SamplingProfiler in whatever thread calls
+        it, storing the report under the returned profile id.
+        """
+        profile_id = uuid.uuid4().hex
+
+        def wrapper(*args, **kwargs):
+            profiler = SamplingProfiler()
+            try:
+                with profiler:
+                    return fn(*args, **kwargs)
+            finally:
+                self.put(profile_id, profiler.report())
+
+        return wrapper, profile_id
+
+profiles = ProfileStore()
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Optional
+from .artifact_store import ArtifactStore
+from .dxf_cache import DXFCache
+
+# Bump when parsing or classification changes, so persisted results from an
+# older version are never served
+PARSE_CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def upload_digest(stream: BinaryIO, mode: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    BLAKE2b of an upload, read chunk by chunk so memory stays flat for any
+    file size, and rewound afterwards so it can still be parsed. The parse
+    mode and cache version are part of the hash, so each (file, mode) pair
+    has its own key.
+    """
+    digest = hashlib.blake2b(digest_size=32, person=f"dxfparse{PARSE_CACHE_VERSION}".encode("ascii"))
+    digest.update(mode.encode("utf-8") + b"\0")
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+class ParseCache:
+    """
+    Parse results keyed by the content hash of the uploaded file.
+
+    Results are kept as JSON in a bounded in-memory LRU and, when a `store`
+    is given, also on disk so they survive restarts and are shared by every
+    worker process using the same directory. A memory miss that hits the
+    disk promotes the entry back into memory.
+    """
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 16 * 1024 * 1024, store: Optional[ArtifactStore] = None):
+        self.memory = DXFCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.store = store
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def key(self, stream: BinaryIO, mode: str) -> str:
+        return upload_digest(stream, mode)
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.memory.get(key)
+        from_disk = False
+        if data is None and self.store is not None:
+            data = self.store.get(key)
+            if data is not None:
+                from_disk = True
+                self.memory.put(key, data)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += from_disk
+        return json.loads(data)
+
+    def put(self, key: str, result: Any) -> None:
+        data = json.dumps(result, separators=(",", ":")).encode("utf-8")
+        self.memory.put(key, data)
+        if self.store is not None:
+            self.store.put(key, data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        memory = self.memory.stats()
+        stats.update({name: memory[name] for name in ("entries", "bytes", "evictions", "max_entries", "max_bytes")})
+        if self.store is not None:
+            stats["disk"] = self.store.stats()
+        return stats
+
+def parse_cache_from_env() -> ParseCache:
+    """
+    Builds the parse cache sized by DXF_PARSE_CACHE_ENTRIES /
+    DXF_PARSE_CACHE_BYTES, persisted under DXF_PARSE_CACHE_DIR when set
+    (with DXF_PARSE_CACHE_DISK_BYTES as the disk quota).
+    """
+    store = None
+    root = os.environ.get("DXF_PARSE_CACHE_DIR")
+    if root:
+        store = ArtifactStore(root, max_bytes=int(os.environ.get("DXF_PARSE_CACHE_DISK_BYTES", 256 * 1024 * 1024)), suffix=".json")
+        store.start_janitor()
+    return ParseCache(
+        max_entries=int(os.environ.get("DXF_PARSE_CACHE_ENTRIES", 4096)),
+        max_bytes=int(os.environ.get("DXF_PARSE_CACHE_BYTES", 16 * 1024 * 1024)),
+        store=store,
+    )
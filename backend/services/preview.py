@@ -0,0 +1,197 @@
+import math
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..components.registry import get_spec
+
+PREVIEW_FORMATS = ("svg", "png")
+MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+# Largest PNG sprite sheet, in pixels (64 MB as RGBA)
+MAX_SPRITE_PIXELS = 1 << 24
+# Output rows rasterized at a time, so supersampling buffers stay small at any size
+RASTER_BAND_ROWS = 32
+
+Outline = Sequence[Sequence[float]]
+
+def component_outlines(component_type: str, params: Dict[str, Any]) -> List[Outline]:
+    """The closed polylines `draw` would add, computed from the registry without building a component."""
+    spec = get_spec(component_type)
+    points = spec.points_array({name: [params[name]] for name in spec.param_names})[0]
+    return spec.outlines(points.tolist())
+
+def _bounds(outlines: List[Outline]) -> Tuple[float, float, float, float]:
+    points = np.concatenate([np.asarray(outline, dtype=float)[:, :2] for outline in outlines])
+    low = points.min(axis=0)
+    high = points.max(axis=0)
+    return float(low[0]), float(low[1]), float(high[0]), float(high[1])
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """
+    Minimal PNG encoder for an (H, W, 2) grey+alpha or (H, W, 4) RGBA uint8
+    array: one IDAT chunk, filter type 0 on every row.
+    """
+    height, width, channels = pixels.shape
+    color_type = {2: 4, 4: 6}[channels]
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, width * channels)], axis=1)
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+            + chunk(b"IEND", b""))
+
+def rasterize(outlines: List[Outline], width: int, height: int, samples: int = 4, band_rows: int = RASTER_BAND_ROWS) -> np.ndarray:
+    """
+    Even-odd scanline fill of polygons given in pixel coordinates (y down).
+    Every subsample row intersects all edges at once; sorted crossings pair
+    up into inside spans, which are accumulated with a difference array.
+    Returns an (height, width) coverage array in [0, 1], antialiased by
+    `samples` x `samples` supersampling. Rows are processed in bands of
+    `band_rows`, so memory doesn't grow with the square of the size.
+    """
+    edges = []
+    for outline in outlines:
+        points = np.asarray(outline, dtype=float)[:, :2]
+        edges.append(np.concatenate([points, np.roll(points, -1, axis=0)], axis=1))
+    edges = np.concatenate(edges)
+    edge_top = np.minimum(edges[:, 1], edges[:, 3])
+    edge_bottom = np.maximum(edges[:, 1], edges[:, 3])
+
+    cols = width * samples
+    coverage = np.zeros((height, width))
+    for top in range(0, height, band_rows):
+        bottom = min(top + band_rows, height)
+        band = (edge_bottom >= top) & (edge_top <= bottom)
+        if not band.any():
+            continue
+        x0, y0, x1, y1 = edges[band].T
+        rows = (bottom - top) * samples
+        ys = top + (np.arange(rows) + 0.5) / samples
+        # (rows, edges): half-open rule so shared vertices are counted once
+        crosses = (y0[None, :] <= ys[:, None]) != (y1[None, :] <= ys[:, None])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xs = x0 + (ys[:, None] - y0) * (x1 - x0) / (y1 - y0)
+        xs = np.sort(np.where(crosses, xs, np.inf), axis=1)
+        # Even-odd: crossings pair up left to right; unused slots are inf
+        # (every row has an even number of crossings, so an unpaired last slot is inf)
+        ends = xs[:, 1::2]
+        starts = xs[:, 0::2][:, :ends.shape[1]]
+        valid = np.isfinite(starts) & np.isfinite(ends)
+        row_index = np.broadcast_to(np.arange(rows)[:, None], starts.shape)[valid]
+        # Subsample columns whose centre lies in [start, end)
+        first = np.clip(np.ceil(starts[valid] * samples - 0.5), 0, cols).astype(np.intp)
+        last = np.clip(np.ceil(ends[valid] * samples - 0.5), 0, cols).astype(np.intp)
+        diff = np.zeros((rows, cols + 1), dtype=np.int32)
+        np.add.at(diff, (row_index, first), 1)
+        np.add.at(diff, (row_index, last), -1)
+        inside = np.cumsum(diff[:, :cols], axis=1) > 0
+        coverage[top:bottom] = inside.reshape(bottom - top, samples, width, samples).mean(axis=(1, 3))
+    return coverage
+
+def sprite_grid(count: int, columns: Optional[int] = None) -> Tuple[int, int]:
+    """
+    `(columns, rows)` of a sprite sheet with `count` tiles: nearly square by
+    default, and never wider than the number of tiles.
+    """
+    if columns is None:
+        columns = math.ceil(math.sqrt(count))
+    columns = max(1, min(columns, count))
+    return columns, max(1, math.ceil(count / columns))
+
+class PreviewRenderer:
+    """
+    Draws component outlines as small SVG or PNG images without going
+    through an ezdxf document. The section is scaled to fit a square of
+    `size` pixels with `padding` around it and filled with the even-odd
+    rule, so hollow sections show their opening.
+    """
+    def __init__(self, size: int = 256, padding: int = 8, fill: Tuple[int, int, int] = (0x9a, 0xa5, 0xb1),
+                 stroke: Tuple[int, int, int] = (0x1f, 0x29, 0x33)):
+        if not 16 <= size <= 2048:
+            raise ValueError("Preview size must be between 16 and 2048 pixels")
+        self.size = size
+        self.padding = min(padding, size // 4)
+        self.fill = fill
+        self.stroke = stroke
+
+    @staticmethod
+    def _hex(color: Tuple[int, int, int]) -> str:
+        return "#%02x%02x%02x" % color
+
+    def _fit(self, outlines: List[Outline]) -> Tuple[float, float, float]:
+        """Scale and pixel offsets that centre the outlines' bounding box in a tile."""
+        min_x, min_y, max_x, max_y = _bounds(outlines)
+        inner = self.size - 2 * self.padding
+        scale = inner / max(max_x - min_x, max_y - min_y, 1e-9)
+        offset_x = self.padding + (inner - (max_x - min_x) * scale) / 2 - min_x * scale
+        offset_y = self.padding + (inner - (max_y - min_y) * scale) / 2 + max_y * scale
+        return scale, offset_x, offset_y
+
+    def _path(self, outlines: List[Outline]) -> str:
+        scale, offset_x, offset_y = self._fit(outlines)
+        parts = []
+        for outline in outlines:
+            points = " L".join(f"{offset_x + x * scale:.2f},{offset_y - y * scale:.2f}" for x, y, *_ in outline)
+            parts.append(f"M{points}Z")
+        return "".join(parts)
+
+    def _svg_tile(self, outlines: Optional[List[Outline]]) -> str:
+        if not outlines:
+            return ""
+        return (f'<path d="{self._path(outlines)}" fill="{self._hex(self.fill)}" fill-rule="evenodd" '
+                f'stroke="{self._hex(self.stroke)}" stroke-width="1"/>')
+
+    def svg(self, outlines: List[Outline]) -> bytes:
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.size}" height="{self.size}" '
+                f'viewBox="0 0 {self.size} {self.size}">{self._svg_tile(outlines)}</svg>').encode("utf-8")
+
+    def _raster_tile(self, outlines: Optional[List[Outline]]) -> np.ndarray:
+        """(size, size, 4) RGBA tile: the fill colour with antialiased coverage as alpha."""
+        tile = np.zeros((self.size, self.size, 4), dtype=np.uint8)
+        if not outlines:
+            return tile
+        scale, offset_x, offset_y = self._fit(outlines)
+        pixel_outlines = [[(offset_x + x * scale, offset_y - y * scale) for x, y, *_ in outline] for outline in outlines]
+        coverage = rasterize(pixel_outlines, self.size, self.size)
+        tile[..., :3] = self.fill
+        tile[..., 3] = np.round(coverage * 255).astype(np.uint8)
+        return tile
+
+    def png(self, outlines: List[Outline]) -> bytes:
+        return encode_png(self._raster_tile(outlines))
+
+    def render(self, outlines: List[Outline], format: str) -> bytes:
+        if format not in PREVIEW_FORMATS:
+            raise ValueError(f"Unsupported preview format '{format}', expected one of {PREVIEW_FORMATS}")
+        return self.svg(outlines) if format == "svg" else self.png(outlines)
+
+    def sprite(self, tiles: List[Optional[List[Outline]]], format: str, columns: Optional[int] = None) -> Tuple[bytes, int]:
+        """
+        One image with a `size` x `size` tile per item, left to right and top
+        to bottom; None leaves its tile empty. Returns the image and the
+        number of columns, from which clients compute tile offsets. PNG
+        sheets above MAX_SPRITE_PIXELS raise ValueError.
+        """
+        if format not in PREVIEW_FORMATS:
+            raise ValueError(f"Unsupported preview format '{format}', expected one of {PREVIEW_FORMATS}")
+        columns, rows = sprite_grid(len(tiles), columns)
+        width, height = columns * self.size, rows * self.size
+        if format == "png" and width * height > MAX_SPRITE_PIXELS:
+            raise ValueError(f"Sprite would be {width}x{height} pixels, the limit is {MAX_SPRITE_PIXELS} pixels")
+        if format == "svg":
+            body = "".join(
+                f'<g transform="translate({(i % columns) * self.size},{(i // columns) * self.size})">{self._svg_tile(outlines)}</g>'
+                for i, outlines in enumerate(tiles) if outlines
+            )
+            content = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                       f'viewBox="0 0 {width} {height}">{body}</svg>').encode("utf-8")
+            return content, columns
+        sheet = np.zeros((height, width, 4), dtype=np.uint8)
+        for i, outlines in enumerate(tiles):
+            if outlines:
+                y, x = (i // columns) * self.size, (i % columns) * self.size
+                sheet[y:y + self.size, x:x + self.size] = self._raster_tile(outlines)
+        return encode_png(sheet), columns
@@ -0,0 +1,248 @@
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from ..components.batch import ComponentBatch
+from .dxf_cache import DXFCache
+
+# Nominal dimensions in mm (sharp corners; root and corner radii are not drawn)
+# IPE: designation size -> (h, b, tw, tf)
+IPE = {
+    80: (80, 46, 3.8, 5.2), 100: (100, 55, 4.1, 5.7), 120: (120, 64, 4.4, 6.3),
+    140: (140, 73, 4.7, 6.9), 160: (160, 82, 5.0, 7.4), 180: (180, 91, 5.3, 8.0),
+    200: (200, 100, 5.6, 8.5), 220: (220, 110, 5.9, 9.2), 240: (240, 120, 6.2, 9.8),
+    270: (270, 135, 6.6, 10.2), 300: (300, 150, 7.1, 10.7), 330: (330, 160, 7.5, 11.5),
+    360: (360, 170, 8.0, 12.7), 400: (400, 180, 8.6, 13.5), 450: (450, 190, 9.4, 14.6),
+    500: (500, 200, 10.2, 16.0), 550: (550, 210, 11.1, 17.2), 600: (600, 220, 12.0, 19.0),
+}
+
+HEA = {
+    100: (96, 100, 5.0, 8.0), 120: (114, 120, 5.0, 8.0), 140: (133, 140, 5.5, 8.5),
+    160: (152, 160, 6.0, 9.0), 180: (171, 180, 6.0, 9.5), 200: (190, 200, 6.5, 10.0),
+    220: (210, 220, 7.0, 11.0), 240: (230, 240, 7.5, 12.0), 260: (250, 260, 7.5, 12.5),
+    280: (270, 280, 8.0, 13.0), 300: (290, 300, 8.5, 14.0), 320: (310, 300, 9.0, 15.5),
+    340: (330, 300, 9.5, 16.5), 360: (350, 300, 10.0, 17.5), 400: (390, 300, 11.0, 19.0),
+    450: (440, 300, 11.5, 21.0), 500: (490, 300, 12.0, 23.0), 550: (540, 300, 12.5, 24.0),
+    600: (590, 300, 13.0, 25.0), 650: (640, 300, 13.5, 26.0), 700: (690, 300, 14.5, 27.0),
+    800: (790, 300, 15.0, 28.0), 900: (890, 300, 16.0, 30.0), 1000: (990, 300, 16.5, 31.0),
+}
+
+HEB = {
+    100: (100, 100, 6.0, 10.0), 120: (120, 120, 6.5, 11.0), 140: (140, 140, 7.0, 12.0),
+    160: (160, 160, 8.0, 13.0), 180: (180, 180, 8.5, 14.0), 200: (200, 200, 9.0, 15.0),
+    220: (220, 220, 9.5, 16.0), 240: (240, 240, 10.0, 17.0), 260: (260, 260, 10.0, 17.5),
+    280: (280, 280, 10.5, 18.0), 300: (300, 300, 11.0, 19.0), 320: (320, 300, 11.5, 20.5),
+    340: (340, 300, 12.0, 21.5), 360: (360, 300, 12.5, 22.5), 400: (400, 300, 13.5, 24.0),
+    450: (450, 300, 14.0, 26.0), 500: (500, 300, 14.5, 28.0), 550: (550, 300, 15.0, 29.0),
+    600: (600, 300, 15.5, 30.0), 650: (650, 300, 16.0, 31.0), 700: (700, 300, 17.0, 32.0),
+    800: (800, 300, 17.5, 33.0), 900: (900, 300, 18.5, 35.0), 1000: (1000, 300, 19.0, 36.0),
+}
+
+# Hot-finished hollow sections: (h, b) -> available wall thicknesses
+SHS = {
+    (40, 40): (2.5, 3.0, 3.2, 4.0, 5.0),
+    (50, 50): (2.5, 3.0, 3.2, 4.0, 5.0, 6.3),
+    (60, 60): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (70, 70): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (80, 80): (3.2, 4.0, 5.0, 6.3, 8.0),
+    (90, 90): (4.0, 5.0, 6.3, 8.0),
+    (100, 100): (4.0, 5.0, 6.3, 8.0, 10.0),
+    (120, 120): (5.0, 6.3, 8.0, 10.0, 12.5),
+    (140, 140): (5.0, 6.3, 8.0, 10.0, 12.5),
+    (150, 150): (5.0, 6.3, 8.0, 10.0, 12.5, 16.0),
+    (160, 160): (5.0, 6.3, 8.0, 10.0, 12.5, 16.0),
+    (180, 180): (6.3, 8.0, 10.0, 12.5, 16.0),
+    (200, 200): (6.3, 8.0, 10.0, 12.5, 16.0),
+    (250, 250): (6.3, 8.0, 10.0, 12.5, 16.0),
+    (300, 300): (8.0, 10.0, 12.5, 16.0),
+    (350, 350): (8.0, 10.0, 12.5, 16.0),
+    (400, 400): (10.0, 12.5, 16.0),
+}
+
+RHS = {
+    (50, 30): (2.5, 3.0, 3.2, 4.0, 5.0),
+    (60, 40): (2.5, 3.0, 3.2, 4.0, 5.0, 6.3),
+    (80, 40): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (90, 50): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (100, 50): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (100, 60): (3.0, 3.2, 4.0, 5.0, 6.3, 8.0),
+    (120, 60): (4.0, 5.0, 6.3, 8.0, 10.0),
+    (120, 80): (4.0, 5.0, 6.3, 8.0, 10.0),
+    (150, 100): (4.0, 5.0, 6.3, 8.0, 10.0, 12.5),
+    (160, 80): (4.0, 5.0, 6.3, 8.0, 10.0, 12.5),
+    (200, 100): (5.0, 6.3, 8.0, 10.0, 12.5, 16.0),
+    (200, 120): (6.3, 8.0, 10.0, 12.5),
+    (250, 150): (6.3, 8.0, 10.0, 12.5, 16.0),
+    (300, 200): (6.3, 8.0, 10.0, 12.5, 16.0),
+    (400, 200): (8.0, 10.0, 12.5, 16.0),
+    (450, 250): (8.0, 10.0, 12.5, 16.0),
+    (500, 300): (10.0, 12.5, 16.0),
+}
+
+FAMILIES = ("IPE", "HEA", "HEB", "SHS", "RHS")
+# Mass per metre from the area in mm^2, for steel at 7850 kg/m^3
+STEEL_KG_PER_M_PER_MM2 = 7850e-6
+
+def _format_dimension(value: float) -> str:
+    return f"{value:g}"
+
+def _catalog_rows() -> Iterable[Tuple[str, str, str, Dict[str, float]]]:
+    """Yields `(designation, family, component_type, params)` for every table entry."""
+    for family, table in (("IPE", IPE), ("HEA", HEA), ("HEB", HEB)):
+        for size, (h, b, tw, tf) in table.items():
+            yield f"{family}{size}", family, "beam", {"H": h, "B": b, "tw": tw, "tf": tf}
+    for family, table in (("SHS", SHS), ("RHS", RHS)):
+        for (h, b), thicknesses in table.items():
+            for t in thicknesses:
+                designation = f"{family}{h}X{b}X{_format_dimension(t)}"
+                yield designation, family, "hollow", {"H": h, "B": b, "t": t}
+
+_SEPARATORS = re.compile(r"[\s_-]+")
+_EUROPEAN_H = re.compile(r"^HE(\d+)([AB])$")
+_SQUARE_SHORT = re.compile(r"^SHS(\d+(?:\.\d+)?)X(\d+(?:\.\d+)?)$")
+
+def normalize_designation(designation: str) -> str:
+    """
+    Canonical catalog key: upper case without spaces, so "ipe 200", "IPE200"
+    and "HE 200 A" / "HEA 200" resolve to one entry. "SHS 100x5" is short for
+    "SHS100X100X5", and trailing ".0" on thicknesses is dropped.
+    """
+    key = _SEPARATORS.sub("", designation.strip().upper()).replace("×", "X").replace("*", "X")
+    match = _EUROPEAN_H.match(key)
+    if match:
+        key = f"HE{match.group(2)}{match.group(1)}"
+    match = _SQUARE_SHORT.match(key)
+    if match:
+        key = f"SHS{match.group(1)}X{match.group(1)}X{match.group(2)}"
+    return re.sub(r"(\d)\.0+(?=X|$)", r"\1", key)
+
+class CatalogEntry:
+    __slots__ = ("designation", "family", "component_type", "params", "properties", "key")
+
+    def __init__(self, designation: str, family: str, component_type: str, params: Dict[str, float]):
+        self.designation = designation
+        self.family = family
+        self.component_type = component_type
+        self.params = params
+        self.properties: Dict[str, float] = {}
+        # Same key as POST /generate, so ETags and caches agree across endpoints
+        self.key = DXFCache.make_key(component_type, params)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "designation": self.designation,
+            "family": self.family,
+            "component_type": self.component_type,
+            "params": self.params,
+            "properties": self.properties,
+        }
+
+class SectionCatalog:
+    """
+    Standard steel sections with precomputed section properties.
+
+    Lookup by designation is a dict read on the normalized name. Range
+    queries use one sorted copy of each numeric field: `np.searchsorted`
+    finds the matching slice per field and the slices are intersected with a
+    boolean mask, so a query costs O(fields * log N) plus the size of the
+    result. `warm` renders every entry once so serving a catalog DXF is a
+    memory read.
+    """
+    def __init__(self, rows: Optional[Iterable[Tuple[str, str, str, Dict[str, float]]]] = None):
+        self.entries: List[CatalogEntry] = [CatalogEntry(*row) for row in (rows if rows is not None else _catalog_rows())]
+        self._by_designation = {entry.designation: entry for entry in self.entries}
+        self._dxf: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+        count = len(self.entries)
+        fields: Dict[str, np.ndarray] = {}
+        for component_type in {entry.component_type for entry in self.entries}:
+            rows_of_type = np.array([i for i, entry in enumerate(self.entries) if entry.component_type == component_type])
+            batch = ComponentBatch.from_records(component_type, (self.entries[i].params for i in rows_of_type))
+            values = dict(batch.columns)
+            values.update(batch.section_properties())
+            values["mass"] = values["area"] * STEEL_KG_PER_M_PER_MM2
+            for name, column in values.items():
+                # Fields a family doesn't have (e.g. tw for SHS) stay NaN
+                fields.setdefault(name, np.full(count, np.nan))[rows_of_type] = column
+        for i, entry in enumerate(self.entries):
+            entry.properties = {name: float(fields[name][i]) for name in fields
+                                if name not in entry.params and not np.isnan(fields[name][i])}
+
+        self.fields = fields
+        # Per field: row order and values sorted ascending, NaN last
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray, int]] = {}
+        for name, column in fields.items():
+            order = np.argsort(column, kind="stable")
+            self._sorted[name] = (order, column[order], int(np.count_nonzero(~np.isnan(column))))
+        self._family_codes = np.array([FAMILIES.index(entry.family) for entry in self.entries])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, designation: str) -> Optional[CatalogEntry]:
+        return self._by_designation.get(normalize_designation(designation))
+
+    def query(self, ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              family: Optional[str] = None, sort: Optional[str] = None, limit: Optional[int] = None) -> List[CatalogEntry]:
+        """
+        Entries whose fields fall in every inclusive `(low, high)` range (None
+        leaves a side open), optionally limited to one family and ordered by a
+        field. Entries lacking a queried field never match.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must be zero or more, got {limit}")
+        mask = np.ones(len(self.entries), dtype=bool)
+        if family is not None:
+            family = family.upper()
+            if family not in FAMILIES:
+                raise ValueError(f"Unknown family '{family}', expected one of {FAMILIES}")
+            mask &= self._family_codes == FAMILIES.index(family)
+        for name, (low, high) in (ranges or {}).items():
+            if name not in self._sorted:
+                raise ValueError(f"Unknown field '{name}', expected one of {sorted(self._sorted)}")
+            order, values, finite = self._sorted[name]
+            start = 0 if low is None else int(np.searchsorted(values[:finite], low, side="left"))
+            stop = finite if high is None else int(np.searchsorted(values[:finite], high, side="right"))
+            selected = np.zeros(len(self.entries), dtype=bool)
+            selected[order[start:stop]] = True
+            mask &= selected
+        indices = np.flatnonzero(mask)
+        if sort is not None:
+            if sort not in self.fields:
+                raise ValueError(f"Unknown sort field '{sort}'")
+            indices = indices[np.argsort(self.fields[sort][indices], kind="stable")]
+        if limit is not None:
+            indices = indices[:limit]
+        return [self.entries[i] for i in indices]
+
+    def warm(self, render: Callable[[Any], bytes]) -> None:
+        """Renders every entry with `render(component)` and keeps the bytes in memory."""
+        for component_type in {entry.component_type for entry in self.entries}:
+            entries = [entry for entry in self.entries if entry.component_type == component_type]
+            batch = ComponentBatch.from_records(component_type, (entry.params for entry in entries))
+            for entry, view in zip(entries, batch):
+                content = render(view)
+                with self._lock:
+                    self._dxf[entry.designation] = content
+
+    def dxf(self, entry: CatalogEntry) -> Optional[bytes]:
+        """Prerendered DXF bytes for an entry, or None before `warm`."""
+        return self._dxf.get(entry.designation)
+
+    @property
+    def warmed_bytes(self) -> int:
+        with self._lock:
+            return sum(len(content) for content in self._dxf.values())
+
+_default_catalog: Optional[SectionCatalog] = None
+_default_catalog_lock = threading.Lock()
+
+def get_section_catalog() -> SectionCatalog:
+    """Returns the process-wide catalog, building it on first use."""
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            if _default_catalog is None:
+                _default_catalog = SectionCatalog()
+    return _default_catalog
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+from ..components.registry import get_spec
+
+PROPERTY_NAMES = ("area", "cx", "cy", "Ix", "Iy", "Sx", "Sy", "rx", "ry")
+
+def batch_polygon_properties(vertices: np.ndarray, allow_degenerate: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Geometric properties of N closed polygons given as an (N, M, 2) array,
+    using the shoelace / Green's theorem formulas. Either winding order is
+    accepted. Polygons with zero area raise ValueError, or with
+    `allow_degenerate` get NaN for every property so the rest can still be
+    reported.
+
+    Returns arrays of length N:
+        area   - cross-sectional area
+        cx, cy - centroid
+        Ix, Iy - second moments of area about the centroidal x / y axes
+        Sx, Sy - elastic section moduli (I divided by the extreme fibre distance)
+        rx, ry - radii of gyration
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if vertices.ndim != 3 or vertices.shape[2] != 2 or vertices.shape[1] < 3:
+        raise ValueError("Vertices must have shape (N, M, 2) with M >= 3")
+
+    x = vertices[:, :, 0]
+    y = vertices[:, :, 1]
+    x_next = np.roll(x, -1, axis=1)
+    y_next = np.roll(y, -1, axis=1)
+    cross = x * y_next - x_next * y
+
+    signed_area = cross.sum(axis=1) / 2
+    if np.any(signed_area == 0):
+        if not allow_degenerate:
+            raise ValueError("Degenerate polygon with zero area")
+        signed_area = np.where(signed_area == 0, np.nan, signed_area)
+    cx = ((x + x_next) * cross).sum(axis=1) / (6 * signed_area)
+    cy = ((y + y_next) * cross).sum(axis=1) / (6 * signed_area)
+    # Second moments about the origin; dividing by the signed area's sign
+    # makes clockwise and counter-clockwise outlines agree
+    sign = np.sign(signed_area)
+    ixx_origin = sign * ((y * y + y * y_next + y_next * y_next) * cross).sum(axis=1) / 12
+    iyy_origin = sign * ((x * x + x * x_next + x_next * x_next) * cross).sum(axis=1) / 12
+
+    area = np.abs(signed_area)
+    Ix = ixx_origin - area * cy * cy
+    Iy = iyy_origin - area * cx * cx
+    c_y = np.abs(y - cy[:, None]).max(axis=1)
+    c_x = np.abs(x - cx[:, None]).max(axis=1)
+
+    return {
+        "area": area,
+        "cx": cx,
+        "cy": cy,
+        "Ix": Ix,
+        "Iy": Iy,
+        "Sx": Ix / c_y,
+        "Sy": Iy / c_x,
+        "rx": np.sqrt(Ix / area),
+        "ry": np.sqrt(Iy / area),
+    }
+
+def polygon_properties(points: Sequence[Tuple[float, float]]) -> Dict[str, float]:
+    """Properties of a single closed polygon, e.g. the output of `get_points()`."""
+    vertices = np.asarray([[(p[0], p[1]) for p in points]], dtype=float)
+    return {name: float(values[0]) for name, values in batch_polygon_properties(vertices).items()}
+
+def component_properties(component: Any) -> Dict[str, float]:
+    return polygon_properties(component.get_points())
+
+def component_vertices(component_type: str, params: Dict[str, Any]) -> np.ndarray:
+    """Builds the (N, M, 2) vertex array for columnar parameters of one component type."""
+    return get_spec(component_type).points_array(params)
+
+def batch_section_properties(component_type: str, params: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Evaluates thousands of parameter sets in one call. `params` maps each
+    parameter name to an array (or list) of values, one entry per section.
+    """
+    vertices = component_vertices(component_type, params)
+    if vertices.ndim == 2:
+        vertices = vertices[None]
+    return batch_polygon_properties(vertices)
+
+def to_lists(properties: Dict[str, np.ndarray]) -> Dict[str, List[float]]:
+    return {name: values.tolist() for name, values in properties.items()}
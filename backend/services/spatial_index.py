@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# Upper bound on cells per row at the finest level, so cell ids fit in int64
+MAX_GRID_COLUMNS = 1 << 20
+
+def polyline_bounds(entities: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    (N, 4) array of `[min_x, min_y, max_x, max_y]` per polyline, computed
+    over all vertices at once. Polylines without points get NaN bounds, which
+    never contain or fall inside anything.
+    """
+    counts = np.fromiter((len(entity["points"]) for entity in entities), dtype=np.intp, count=len(entities))
+    bounds = np.full((len(entities), 4), np.nan)
+    present = counts > 0
+    if not present.any():
+        return bounds
+    coords = np.array([point[:2] for entity in entities for point in entity["points"]], dtype=float)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+    bounds[present, :2] = np.minimum.reduceat(coords, starts, axis=0)
+    bounds[present, 2:] = np.maximum.reduceat(coords, starts, axis=0)
+    return bounds
+
+def _expand_ranges(lows: np.ndarray, highs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For ranges `[low, high)` returns `(range_index, position)` for every position in every range."""
+    lengths = highs - lows
+    owners = np.repeat(np.arange(len(lows)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owners, lows[owners] + offsets
+
+class GridIndex:
+    """
+    Hierarchical uniform grid over axis-aligned bounding boxes.
+
+    Level k has square cells of `cell_size * 2**k`, and every box is
+    registered at the finest level whose cells are at least as large as the
+    box, so it overlaps at most 2 x 2 cells there. Each level is one array of
+    `(cell, box)` pairs sorted by cell: building the index is a sort per
+    level and a query is a `searchsorted` per level. Tiny markers and sheet
+    borders in the same drawing therefore stay cheap; no box is compared
+    against every query. The finest cell size defaults to the median box size.
+    """
+    def __init__(self, bounds: np.ndarray, cell_size: Optional[float] = None):
+        self.bounds = np.asarray(bounds, dtype=float).reshape(-1, 4)
+        ids = np.flatnonzero(np.isfinite(self.bounds).all(axis=1))
+        sizes = (self.bounds[ids, 2:] - self.bounds[ids, :2]).max(axis=1)
+        if cell_size is None:
+            positive = sizes[sizes > 0]
+            cell_size = float(np.median(positive)) if len(positive) else 1.0
+        if len(ids):
+            self.origin = self.bounds[ids, :2].min(axis=0)
+            self.extent = self.bounds[ids, 2:].max(axis=0) - self.origin
+        else:
+            self.origin = self.extent = np.zeros(2)
+        self.cell_size = max(cell_size, float(self.extent.max()) / MAX_GRID_COLUMNS)
+
+        levels = np.ceil(np.log2(np.maximum(sizes / self.cell_size, 1.0))).astype(np.intp)
+        # (cell size, columns, sorted cell ids, box ids) per level, finest first
+        self.levels: List[Tuple[float, int, np.ndarray, np.ndarray]] = []
+        for level in np.unique(levels):
+            level_ids = ids[levels == level]
+            cell = self.cell_size * 2.0 ** level
+            low = self._cells(self.bounds[level_ids, :2], cell)
+            span = self._cells(self.bounds[level_ids, 2:], cell) - low + 1
+            columns = int(self.extent[0] // cell) + 1
+            owners, offsets = _expand_ranges(np.zeros(len(level_ids), dtype=np.int64), span.prod(axis=1))
+            cell_x = low[owners, 0] + offsets % span[owners, 0]
+            cell_y = low[owners, 1] + offsets // span[owners, 0]
+            cell_ids = cell_y * columns + cell_x
+            order = np.argsort(cell_ids, kind="stable")
+            self.levels.append((cell, columns, cell_ids[order], level_ids[owners[order]]))
+
+    def _cells(self, points: np.ndarray, cell: float) -> np.ndarray:
+        return np.floor((points - self.origin) / cell).astype(np.int64)
+
+    def containing(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All `(query, box)` index pairs where the box strictly contains the
+        query box. Queries are looked up by the cell of their lower-left
+        corner on each level, since any box containing them must overlap that
+        cell; levels whose boxes are too small to contain a query are
+        skipped. A box is never reported as containing itself.
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 4)
+        finite = np.flatnonzero(np.isfinite(queries).all(axis=1))
+        sizes = (queries[finite, 2:] - queries[finite, :2]).max(axis=1)
+        query_ids, box_ids = [], []
+        for cell, columns, level_cells, level_boxes in self.levels:
+            # Boxes on this level are at most `cell` wide, so larger queries can't fit inside
+            candidates = finite[sizes < cell]
+            position = self._cells(queries[candidates, :2], cell)
+            inside = (position >= 0).all(axis=1) & (position[:, 0] < columns)
+            candidates, position = candidates[inside], position[inside]
+            cell_ids = position[:, 1] * columns + position[:, 0]
+            lows = np.searchsorted(level_cells, cell_ids, side="left")
+            highs = np.searchsorted(level_cells, cell_ids, side="right")
+            owners, positions = _expand_ranges(lows, highs)
+            query_ids.append(candidates[owners])
+            box_ids.append(level_boxes[positions])
+        if not query_ids:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        query_ids, box_ids = np.concatenate(query_ids), np.concatenate(box_ids)
+
+        query, box = queries[query_ids], self.bounds[box_ids]
+        contains = ((box[:, 0] < query[:, 0]) & (box[:, 1] < query[:, 1])
+                    & (box[:, 2] > query[:, 2]) & (box[:, 3] > query[:, 3]))
+        return query_ids[contains], box_ids[contains]
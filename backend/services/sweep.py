@@ -0,0 +1,191 @@
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from ..components.registry import ComponentSpec, get_spec
+from ..interfaces.validator import Validator
+from .archive import ZipStreamWriter
+from .dxf_fast_writer import FastDXFWriter
+
+SWEEP_FORMATS = ("layout", "zip")
+SWEEP_BLOCK_SIZE = 65536
+# Items converted to Python lists at a time when writing; bounds per-block overhead
+WRITE_SLICE = 1024
+# Average archive bookkeeping per ZIP entry (local header, descriptor, central directory)
+ZIP_ENTRY_OVERHEAD = 140
+ESTIMATE_SAMPLE = 32
+
+Axis = Union[float, List[float], Dict[str, float]]
+
+def _range(name: str, axis: Dict[str, float]) -> Tuple[float, float, int]:
+    """`(start, step, count)` of an inclusive `{"start", "stop", "step"}` range."""
+    try:
+        start, stop, step = float(axis["start"]), float(axis["stop"]), float(axis["step"])
+    except KeyError as e:
+        raise ValueError(f"Range for '{name}' needs start, stop and step (missing {e})")
+    if step <= 0 or stop < start:
+        raise ValueError(f"Range for '{name}' needs step > 0 and stop >= start")
+    # Inclusive stop, tolerant of float steps such as 0.1
+    steps = (stop - start) / step + 1e-9
+    if not math.isfinite(steps):
+        raise ValueError(f"Range for '{name}' has too many values")
+    return start, step, int(math.floor(steps)) + 1
+
+def axis_length(name: str, axis: Axis) -> int:
+    """Number of values of one sweep axis, without building ranges."""
+    if isinstance(axis, dict):
+        return _range(name, axis)[2]
+    return len(axis_values(name, axis))
+
+def axis_values(name: str, axis: Axis) -> np.ndarray:
+    """
+    Values of one sweep axis: a fixed number, an explicit list, or an
+    inclusive `{"start", "stop", "step"}` range. Repeated values would give
+    duplicate combinations and are rejected.
+    """
+    if isinstance(axis, dict):
+        start, step, count = _range(name, axis)
+        values = start + step * np.arange(count, dtype=float)
+    else:
+        values = np.atleast_1d(np.asarray(axis, dtype=float))
+        if values.ndim != 1 or values.size == 0:
+            raise ValueError(f"'{name}' needs a number, a non-empty list or a range")
+    # A range whose step is below the float resolution of its values repeats them too
+    if len(np.unique(values)) != len(values):
+        raise ValueError(f"'{name}' has repeated values")
+    return values
+
+class ParameterSweep:
+    """
+    The cartesian product of per-parameter value axes for one component type.
+
+    Combinations are never materialized: a block of flat indices is decoded
+    into per-axis positions with `np.unravel_index`, validated as columns by
+    `Validator.check_batch` and pruned before anything is drawn, so memory
+    depends on the block size only, however many combinations there are.
+
+    Sweeps with more than `max_combinations` combinations raise ValueError
+    before any axis is built.
+    """
+    def __init__(self, component_type: str, axes: Dict[str, Axis], block_size: int = SWEEP_BLOCK_SIZE,
+                 max_combinations: Optional[int] = None):
+        self.spec: ComponentSpec = get_spec(component_type)
+        missing = [name for name in self.spec.param_names if name not in axes]
+        unknown = [name for name in axes if name not in self.spec.param_names]
+        if missing or unknown:
+            raise ValueError(f"Sweep for '{component_type}' needs exactly the parameters {list(self.spec.param_names)}")
+        self.shape = tuple(axis_length(name, axes[name]) for name in self.spec.param_names)
+        self.total = math.prod(self.shape)
+        if max_combinations is not None and self.total > max_combinations:
+            raise ValueError(f"Sweep has {self.total} combinations, the limit is {max_combinations}")
+        self.axes = {name: axis_values(name, axes[name]) for name in self.spec.param_names}
+        self.block_size = block_size
+        self._valid_count: Optional[int] = None
+
+    @property
+    def component_type(self) -> str:
+        return self.spec.component_type
+
+    def iter_blocks(self) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Yields `(flat_indices, columns)` for every combination, block by block."""
+        for start in range(0, self.total, self.block_size):
+            indices = np.arange(start, min(start + self.block_size, self.total))
+            positions = np.unravel_index(indices, self.shape)
+            yield indices, {name: values[pos] for (name, values), pos in zip(self.axes.items(), positions)}
+
+    def iter_valid(self) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Like `iter_blocks`, with combinations failing validation removed (empty blocks skipped)."""
+        for indices, columns in self.iter_blocks():
+            keep = ~Validator.check_batch(self.component_type, columns).invalid
+            if keep.all():
+                yield indices, columns
+            elif keep.any():
+                yield indices[keep], {name: column[keep] for name, column in columns.items()}
+
+    def count_valid(self) -> int:
+        """Number of valid combinations (one vectorized validation pass, cached)."""
+        if self._valid_count is None:
+            self._valid_count = sum(len(indices) for indices, _ in self.iter_valid())
+        return self._valid_count
+
+    def extents(self) -> Tuple[float, float]:
+        """Largest bounding-box width and height over all valid combinations."""
+        width = height = 0.0
+        for _, columns in self.iter_valid():
+            points = self.spec.points_array(columns)
+            size = points.max(axis=1) - points.min(axis=1)
+            width = max(width, float(size[:, 0].max()))
+            height = max(height, float(size[:, 1].max()))
+        return width, height
+
+    def name(self, columns: Dict[str, np.ndarray], row: int) -> str:
+        """
+        Archive entry name for one combination, e.g. `beam_H200_B100_tw10_tf15.dxf`.
+        Values are written in full (shortest round-trip form), so distinct
+        combinations never share a name.
+        """
+        parts = [f"{name}{np.format_float_positional(columns[name][row], trim='-')}" for name in self.spec.param_names]
+        return f"{self.component_type}_{'_'.join(parts)}.dxf"
+
+    def estimate(self, writer: FastDXFWriter) -> Dict[str, Any]:
+        """
+        Up-front size of both output formats, extrapolated from a small
+        sample of rendered entities. ZIP sizes are before compression.
+        """
+        valid = self.count_valid()
+        sample = []
+        for _, columns in self.iter_valid():
+            for item_points in self.spec.points_array({k: v[:ESTIMATE_SAMPLE] for k, v in columns.items()}).tolist():
+                sample.append(sum(len(writer.lwpolyline(outline, writer.first_handle).encode(writer.encoding))
+                                  for outline in self.spec.outlines(item_points)))
+            break
+        per_item = float(np.mean(sample)) if sample else 0.0
+        # Grid offsets make layout coordinates a few digits longer than the originals
+        vertex_fields = self.spec.vertex_count or 10
+        document = len(writer.template.prefix_bytes) + len(writer.template.suffix_bytes)
+        entry_name = len(self.component_type) + 8 * len(self.shape) + 4
+        return {
+            "component_type": self.component_type,
+            "combinations": self.total,
+            "valid": valid,
+            "invalid": self.total - valid,
+            "layout_bytes": int(document + valid * (per_item + vertex_fields * 4)),
+            "zip_bytes": int(valid * (document + per_item + ZIP_ENTRY_OVERHEAD + 2 * entry_name)),
+        }
+
+    def iter_layout(self, writer: FastDXFWriter, spacing: float = 50.0, columns: Optional[int] = None,
+                    chunk_entities: int = 1024) -> Iterator[bytes]:
+        """
+        Streams one DXF with every valid combination on a uniform grid (the
+        "grid" mode of SheetLayout), in sweep order, without blocks.
+        """
+        valid = self.count_valid()
+        width, height = self.extents()
+        cell = np.array([width + spacing, height + spacing])
+        if columns is None:
+            columns = max(1, math.ceil(math.sqrt(valid)))
+        per_item = len(self.spec.outlines(self.spec.points_array({k: v[:1] for k, v in self.axes.items()})[0].tolist()))
+
+        def outlines() -> Iterator[List[Any]]:
+            ordinal = 0
+            for _, block in self.iter_valid():
+                points = self.spec.points_array(block)
+                slots = ordinal + np.arange(len(points))
+                ordinal += len(points)
+                # Bounding box bottom-left at the cell's origin, rows going down
+                origin = np.stack([(slots % columns) * cell[0], -(slots // columns) * cell[1] - cell[1] + spacing], axis=-1)
+                placed = points - points.min(axis=1, keepdims=True) + origin[:, None, :]
+                for start in range(0, len(placed), WRITE_SLICE):
+                    for item_points in placed[start:start + WRITE_SLICE].tolist():
+                        yield from self.spec.outlines(item_points)
+
+        yield from writer.iter_document(outlines(), chunk_entities=chunk_entities, entity_count=valid * per_item)
+
+    def iter_zip(self, writer: FastDXFWriter) -> Iterator[bytes]:
+        """Streams a ZIP with one DXF per valid combination, in sweep order."""
+        archive = ZipStreamWriter()
+        for _, block in self.iter_valid():
+            points = self.spec.points_array(block)
+            for start in range(0, len(points), WRITE_SLICE):
+                for row, item_points in enumerate(points[start:start + WRITE_SLICE].tolist(), start):
+                    yield archive.add(self.name(block, row), writer.render_outlines(self.spec.outlines(item_points)))
+        yield archive.close()
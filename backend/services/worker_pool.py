@@ -0,0 +1,134 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+from .metrics import stage_duration
+
+# Marks the end of a stream body stepped on the pool
+_END = object()
+
+class PoolSaturatedError(Exception):
+    """Raised when the worker pool's queue is full; callers should retry later."""
+    def __init__(self, retry_after: int):
+        super().__init__("Worker pool is saturated")
+        self.retry_after = retry_after
+
+class WorkerPool:
+    """
+    Dedicated executor for CPU-bound ezdxf work triggered by HTTP requests.
+
+    Up to `max_workers` jobs run at once and up to `max_queue` more may wait.
+    Admission is a non-blocking semaphore: when it is exhausted `run` raises
+    PoolSaturatedError immediately instead of queueing without bound, so the
+    API can answer 503 with Retry-After and latency stays predictable.
+
+    Sizes default to the DXF_WORKERS / DXF_MAX_QUEUE / DXF_RETRY_AFTER
+    environment variables.
+    """
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None, retry_after: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.environ.get("DXF_WORKERS", os.cpu_count() or 4))
+        if max_queue is None:
+            max_queue = int(os.environ.get("DXF_MAX_QUEUE", max_workers * 8))
+        if retry_after is None:
+            retry_after = int(os.environ.get("DXF_RETRY_AFTER", 1))
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dxf-worker")
+        self._admission = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._running = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._submitted
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs admitted but not yet picked up by a worker."""
+        return self._submitted - self._running
+
+    def _track(self, submitted_at: float, fn: Callable, *args, **kwargs) -> Any:
+        stage_duration.observe(time.perf_counter() - submitted_at, stage="queue_wait")
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._submitted -= 1
+        self._admission.release()
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """Submits `fn` and returns a concurrent future, or raises PoolSaturatedError."""
+        if not self._admission.acquire(blocking=False):
+            raise PoolSaturatedError(self.retry_after)
+        with self._lock:
+            self._submitted += 1
+        future = self._executor.submit(self._track, time.perf_counter(), fn, *args, **kwargs)
+        # Fires on completion and on cancellation, so permits are never leaked
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Runs `fn` on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def admit_stream(self, chunks: Iterable) -> AsyncIterator:
+        """
+        Wraps a response body so it holds an admission slot until it is
+        exhausted or closed, and produces every chunk on the pool's workers.
+        The body's CPU work is thereby bounded by `max_workers` like `run`;
+        between chunks it counts as queued. Admission happens here, before
+        the response starts, so a saturated pool still answers 503.
+        """
+        if not self._admission.acquire(blocking=False):
+            raise PoolSaturatedError(self.retry_after)
+        with self._lock:
+            self._submitted += 1
+        iterator = iter(chunks)
+        released = threading.Event()
+
+        def release(_future=None) -> None:
+            with self._lock:
+                if released.is_set():
+                    return
+                released.set()
+                self._submitted -= 1
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            self._admission.release()
+
+        async def stream() -> AsyncIterator:
+            step = None
+            try:
+                while True:
+                    step = self._executor.submit(self._track, time.perf_counter(), next, iterator, _END)
+                    chunk = await asyncio.wrap_future(step)
+                    if chunk is _END:
+                        return
+                    yield chunk
+            finally:
+                if step is not None and not step.done():
+                    # Cancelled while a worker is producing a chunk; the body can only be closed after it
+                    step.add_done_callback(release)
+                else:
+                    release()
+
+        body = stream()
+        # A body that is dropped without ever being iterated never runs `finally`
+        weakref.finalize(body, release)
+        return body
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
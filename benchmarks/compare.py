@@ -0,0 +1,52 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Exits with status 1 if any benchmark's median latency got slower by more
+than `--threshold` percent.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+def _load(path: str) -> Dict[Tuple[str, str], Dict[str, float]]:
+    with open(path) as f:
+        report = json.load(f)
+    return {(r["group"], r["name"]): r["stats"] for r in report["results"]}
+
+def compare(baseline: str, candidate: str, threshold: float) -> List[Dict[str, object]]:
+    old = _load(baseline)
+    new = _load(candidate)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        before = old[key]["median_ms"]
+        after = new[key]["median_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append({
+            "group": key[0],
+            "name": key[1],
+            "before_ms": before,
+            "after_ms": after,
+            "change_pct": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    args = parser.parse_args(argv)
+
+    rows = compare(args.baseline, args.candidate, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['group']:>10} {row['name']:<40} {row['before_ms']:9.3f} -> {row['after_ms']:9.3f} ms "
+              f"({row['change_pct']:+6.1f}%) {flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Synthetic DXF fixtures for the parse benchmarks.
+
+Files are generated locally on first use and cached in `benchmarks/fixtures/`
+(ignored by git). Each file holds as many I-beam/column LWPOLYLINEs as fit the
+target size; targets below the size of a full ezdxf document are written as
+minimal ENTITIES-only files.
+"""
+import io
+import os
+import sys
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ezdxf
+from backend.components.beam import IBeam
+from backend.components.column import Column
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+KB = 1024
+MB = 1024 * KB
+FIXTURE_SIZES = {
+    "1kb": 1 * KB,
+    "64kb": 64 * KB,
+    "1mb": 1 * MB,
+    "10mb": 10 * MB,
+    "50mb": 50 * MB,
+}
+
+def _profiles(index: int):
+    if index % 2:
+        return Column(width=100 + index % 300, height=200 + index % 500)
+    return IBeam(H=200 + index % 400, B=100 + index % 200, tw=5 + index % 7, tf=8 + index % 9)
+
+def _minimal_dxf(target_size: int) -> bytes:
+    lines: List[str] = ["  0", "SECTION", "  2", "ENTITIES"]
+    index = 0
+    size = 0
+    while True:
+        entity = ["  0", "LWPOLYLINE", "  8", "0", " 90", ""]
+        points = _profiles(index).get_points()
+        entity[5] = str(len(points))
+        entity += [" 70", "1"]
+        for x, y in points:
+            entity += [" 10", repr(float(x)), " 20", repr(float(y))]
+        chunk = "\n".join(entity) + "\n"
+        if index and size + len(chunk) > target_size - 32:
+            break
+        lines.append(chunk.rstrip("\n"))
+        size += len(chunk)
+        index += 1
+    lines += ["  0", "ENDSEC", "  0", "EOF"]
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+def _ezdxf_dxf(target_size: int) -> bytes:
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    base = len(_write(doc))
+    sample = 16
+    for index in range(sample):
+        _profiles(index).draw(msp)
+    per_entity = max(1, (len(_write(doc)) - base) // sample)
+    count = max(sample, (target_size - base) // per_entity)
+    for index in range(sample, count):
+        _profiles(index).draw(msp)
+    return _write(doc)
+
+def _write(doc) -> bytes:
+    stream = io.StringIO()
+    doc.write(stream)
+    return doc.encode(stream.getvalue())
+
+def build_fixture(name: str, target_size: int) -> str:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = os.path.join(FIXTURE_DIR, f"synthetic_{name}.dxf")
+    if not os.path.exists(path):
+        if target_size < 64 * KB:
+            data = _minimal_dxf(target_size)
+        else:
+            data = _ezdxf_dxf(target_size)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+def build_fixtures(max_size: int = 10 * MB) -> Dict[str, str]:
+    """Returns `{name: path}` for every fixture up to `max_size` bytes."""
+    return {name: build_fixture(name, size) for name, size in FIXTURE_SIZES.items() if size <= max_size}
+
+if __name__ == "__main__":
+    for name, path in build_fixtures(max_size=max(FIXTURE_SIZES.values())).items():
+        print(f"{name}: {path} ({os.path.getsize(path)} bytes)")
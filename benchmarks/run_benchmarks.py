@@ -0,0 +1,262 @@
+"""
+Benchmark suite for the generation, serialization and parsing hot paths.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run_benchmarks                 # default run
+    python -m benchmarks.run_benchmarks --quick         # smoke run
+    python -m benchmarks.run_benchmarks --full          # include the 50 MB fixture
+    python -m benchmarks.compare old.json new.json      # diff two runs
+
+Results are written as JSON (default: benchmarks/results/<commit>.json) so
+runs from different commits can be compared.
+"""
+import argparse
+import asyncio
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ezdxf
+import httpx
+import numpy as np
+
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.services.dxf_service import DXFService
+from benchmarks.fixtures import build_fixtures, MB, FIXTURE_SIZES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+BEAM_PARAMS = {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}
+COLUMN_PARAMS = {"width": 100, "height": 200}
+
+def _summary(samples: List[float], ops_per_sample: int = 1) -> Dict[str, float]:
+    """Latency statistics in milliseconds per operation."""
+    per_op = sorted(s / ops_per_sample * 1000 for s in samples)
+    p95_index = min(len(per_op) - 1, int(round(0.95 * (len(per_op) - 1))))
+    return {
+        "samples": len(per_op),
+        "min_ms": per_op[0],
+        "median_ms": statistics.median(per_op),
+        "mean_ms": statistics.fmean(per_op),
+        "p95_ms": per_op[p95_index],
+        "max_ms": per_op[-1],
+        "ops_per_sec": 1000 / statistics.median(per_op) if per_op[0] > 0 else float("inf"),
+    }
+
+def measure(fn: Callable[[], Any], repeat: int, number: int = 1, warmup: int = 1) -> Dict[str, float]:
+    """Runs `fn` `number` times per sample, `repeat` samples, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples, number)
+
+class BenchmarkRun:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, group: str, name: str, stats: Dict[str, Any], **params) -> None:
+        self.results.append({"group": group, "name": name, "params": params, "stats": stats})
+        print(f"{group:>10} {name:<40} median {stats['median_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms", flush=True)
+
+def bench_components(run: BenchmarkRun) -> None:
+    run.record("component", "IBeam()", measure(lambda: IBeam(**BEAM_PARAMS), run.repeat, number=1000))
+    run.record("component", "Column()", measure(lambda: Column(**COLUMN_PARAMS), run.repeat, number=1000))
+
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    beam = IBeam(**BEAM_PARAMS)
+    column = Column(**COLUMN_PARAMS)
+
+    def draw_beam():
+        beam.draw(msp)
+        msp.delete_all_entities()
+
+    def draw_column():
+        column.draw(msp)
+        msp.delete_all_entities()
+
+    run.record("component", "IBeam.draw", measure(draw_beam, run.repeat, number=200))
+    run.record("component", "Column.draw", measure(draw_column, run.repeat, number=200))
+
+def bench_serialization(run: BenchmarkRun) -> None:
+    run.record("ezdxf", "ezdxf.new()", measure(ezdxf.new, run.repeat, number=5))
+
+    beam = IBeam(**BEAM_PARAMS)
+    service = DXFService()
+    doc = service.build_document(beam)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.dxf")
+        run.record("ezdxf", "doc.saveas", measure(lambda: doc.saveas(path), run.repeat, number=5))
+        run.record("service", "DXFService.save", measure(lambda: service.save(beam, path), run.repeat, number=20))
+    run.record("service", "DXFService.build_document+write", measure(
+        lambda: service.build_document(beam).write(io.StringIO()), run.repeat, number=5))
+    run.record("service", "DXFService.to_bytes", measure(lambda: service.to_bytes(beam), run.repeat, number=50))
+    fast_service = DXFService(writer="fast")
+    run.record("service", "DXFService.to_bytes[fast]", measure(lambda: fast_service.to_bytes(beam), run.repeat, number=500))
+
+def bench_save_batch(run: BenchmarkRun, batch_size: int, worker_counts: List[int]) -> None:
+    components = [IBeam(H=200 + i % 400, B=100 + i % 200, tw=5 + i % 7, tf=8 + i % 9) for i in range(batch_size)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filenames = [os.path.join(tmp_dir, f"{i}.dxf") for i in range(batch_size)]
+        for mode in ("inline", "thread", "process"):
+            for workers in ([1] if mode == "inline" else worker_counts):
+                with DXFService(max_workers=workers, executor=mode) as service:
+                    stats = measure(lambda: service.save_batch(components, filenames), max(1, run.repeat // 5))
+                stats["items_per_sec"] = batch_size * 1000 / stats["median_ms"]
+                run.record("batch", f"save_batch[{mode},workers={workers}]", stats,
+                           executor=mode, workers=workers, items=batch_size)
+
+async def _concurrent_requests(client: httpx.AsyncClient, concurrency: int, total: int,
+                               make_request: Callable[[httpx.AsyncClient, int], Any]) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker():
+        for index in counter:
+            start = time.perf_counter()
+            response = await make_request(client, index)
+            latencies.append(time.perf_counter() - start)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = _summary(latencies)
+    stats["requests_per_sec"] = total / elapsed
+    stats["status_codes"] = statuses
+    return stats
+
+async def _bench_http(run: BenchmarkRun, concurrency_levels: List[int], requests_per_level: int,
+                      fixtures: Dict[str, str]) -> None:
+    from backend import main
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        def generate_cold(client, index):
+            # Distinct parameters per request bypass the DXF cache
+            params = {"H": 100 + index % 5000 / 10, "B": 100, "tw": 5.6, "tf": 8.5}
+            return client.post("/generate", json={"component_type": "beam", "params": params})
+
+        def generate_warm(client, index):
+            return client.post("/generate", json={"component_type": "beam", "params": BEAM_PARAMS})
+
+        for concurrency in concurrency_levels:
+            main.dxf_cache.clear()
+            stats = await _concurrent_requests(client, concurrency, requests_per_level, generate_cold)
+            run.record("http", f"POST /generate cold c={concurrency}", stats, concurrency=concurrency)
+            stats = await _concurrent_requests(client, concurrency, requests_per_level, generate_warm)
+            run.record("http", f"POST /generate cached c={concurrency}", stats, concurrency=concurrency)
+
+        for name, path in fixtures.items():
+            with open(path, "rb") as f:
+                data = f.read()
+
+            def upload(data=data, serial=itertools.count(), cold=True):
+                # A leading DXF comment numbered across all levels makes every cold upload distinct,
+                # so the parse cache misses
+                body = b"999\nbench %d\n" % next(serial) + data if cold else data
+                return {"file": ("fixture.dxf", body, "application/dxf")}
+
+            def parse(client, index):
+                return client.post("/parse-dxf", files=upload())
+
+            def parse_cached(client, index):
+                return client.post("/parse-dxf", files=upload(cold=False))
+
+            def parse_bulk(client, index):
+                return client.post("/parse-dxf/bulk", files=upload())
+
+            size = len(data)
+            levels = concurrency_levels if size <= MB else concurrency_levels[:1]
+            total = requests_per_level if size <= MB else 3
+            for concurrency in levels:
+                stats = await _concurrent_requests(client, concurrency, total, parse)
+                run.record("http", f"POST /parse-dxf {name} c={concurrency}", stats,
+                           concurrency=concurrency, fixture=name, bytes=size)
+            await parse_cached(client, 0)
+            stats = await _concurrent_requests(client, levels[-1], total, parse_cached)
+            run.record("http", f"POST /parse-dxf {name} cached c={levels[-1]}", stats,
+                       concurrency=levels[-1], fixture=name, bytes=size)
+            stats = await _concurrent_requests(client, 1, min(total, 3), parse_bulk)
+            run.record("http", f"POST /parse-dxf/bulk {name}", stats, concurrency=1, fixture=name, bytes=size)
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ezdxf": ezdxf.__version__,
+        "numpy": np.__version__,
+    }
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Run the DXF generator benchmark suite.")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per micro-benchmark")
+    parser.add_argument("--quick", action="store_true", help="few samples, small batches, fixtures up to 64 KB")
+    parser.add_argument("--full", action="store_true", help="include the 50 MB parse fixture")
+    parser.add_argument("--only", nargs="+", choices=["components", "serialization", "batch", "http"],
+                        help="run only these groups")
+    args = parser.parse_args(argv)
+
+    repeat = 3 if args.quick else args.repeat
+    batch_size = 50 if args.quick else 500
+    worker_counts = [1, 2] if args.quick else sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    concurrency_levels = [1, 4] if args.quick else [1, 4, 16, 64]
+    requests_per_level = 16 if args.quick else 200
+    if args.quick:
+        max_fixture = 64 * 1024
+    elif args.full:
+        max_fixture = max(FIXTURE_SIZES.values())
+    else:
+        max_fixture = 10 * MB
+    groups = set(args.only or ["components", "serialization", "batch", "http"])
+
+    run = BenchmarkRun(repeat)
+    if "components" in groups:
+        bench_components(run)
+    if "serialization" in groups:
+        bench_serialization(run)
+    if "batch" in groups:
+        bench_save_batch(run, batch_size, worker_counts)
+    if "http" in groups:
+        asyncio.run(_bench_http(run, concurrency_levels, requests_per_level, build_fixtures(max_fixture)))
+
+    report = {"meta": _metadata(), "results": run.results}
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{report['meta']['commit'] or 'local'}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    return report
+
+if __name__ == "__main__":
+    main()
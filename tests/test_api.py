@@ -2,11 +2,23 @@ import unittest
 from fastapi.testclient import TestClient
 import sys
 import os
+import io
+import json
+import zipfile
+import ezdxf
+import threading
+import tempfile
+from unittest.mock import patch
 
 # Add the project root to the sys.path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.main import app
+from backend import main
+from backend.services.worker_pool import WorkerPool
+from backend.services.artifact_store import ArtifactStore
+from backend.services.job_queue import JobQueue
+from backend.services.parse_cache import ParseCache
 
 class TestAPI(unittest.TestCase):
     def setUp(self):
@@ -17,9 +29,13 @@ class TestAPI(unittest.TestCase):
             "component_type": "beam",
             "params": {"H": 200, "B": 100, "tw": 10, "tf": 15}
         }
-        response = self.client.post("/generate", json=payload)
+        response = self.client.post("/generate", json=payload, headers={"Accept-Encoding": "identity"})
         self.assertEqual(response.status_code, 200)
         self.assertIn("application/dxf", response.headers["content-type"])
+        self.assertIn('filename="beam.dxf"', response.headers["content-disposition"])
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(int(response.headers["content-length"]), len(response.content))
+        self.assertIn(b"LWPOLYLINE", response.content)
 
     def test_generate_column_success(self):
         payload = {
@@ -30,6 +46,49 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("application/dxf", response.headers["content-type"])
 
+    def test_generate_repeat_request_is_cached(self):
+        payload = {
+            "component_type": "beam",
+            "params": {"H": 321, "B": 123, "tw": 7, "tf": 11}
+        }
+        first = self.client.post("/generate", json=payload)
+        second = self.client.post("/generate", json=payload)
+        self.assertEqual(first.headers["x-cache"], "MISS")
+        self.assertEqual(second.headers["x-cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+
+        not_modified = self.client.post("/generate", json=payload, headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+        stats = self.client.get("/cache/stats").json()["dxf"]
+        self.assertGreaterEqual(stats["hits"], 1)
+
+    def test_generate_served_from_disk_store(self):
+        payload = {"component_type": "column", "params": {"width": 77, "height": 333}}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ArtifactStore(tmp_dir)
+            with patch.object(main, "dxf_store", store):
+                first = self.client.post("/generate", json=payload)
+                self.assertEqual(first.headers["X-Cache"], "MISS")
+                main.dxf_cache.clear()
+                second = self.client.post("/generate", json=payload)
+                self.assertEqual(second.status_code, 200)
+                self.assertEqual(second.headers["X-Cache"], "DISK")
+                self.assertEqual(second.content, first.content)
+                self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+                self.assertIn("column.dxf", second.headers["content-disposition"])
+                # Uncompressed responses are sent straight from the stored file
+                main.dxf_cache.clear()
+                plain = self.client.post("/generate", json=payload, headers={"Accept-Encoding": "identity"})
+                self.assertEqual(plain.headers["X-Cache"], "DISK")
+                self.assertNotIn("content-encoding", plain.headers)
+                self.assertEqual(plain.content, first.content)
+                # Served files belong to the store and stay on disk
+                self.assertEqual(store.stats()["entries"], 1)
+                self.assertEqual(self.client.get("/cache/stats").json()["disk"]["hits"], 2)
+
     def test_generate_invalid_type(self):
         payload = {
             "component_type": "invalid_type",
@@ -49,5 +108,402 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn("must be between 1", response.json()["detail"])
 
+    def test_generate_reports_all_violations_and_warnings(self):
+        payload = {"component_type": "beam", "params": {"H": 0, "B": 0, "tw": 10, "tf": 15}}
+        detail = self.client.post("/generate", json=payload).json()["detail"]
+        self.assertIn("Total depth (H)", detail)
+        self.assertIn("Flange width (B)", detail)
+
+        payload = {"component_type": "beam", "params": {"H": 1500, "B": 100, "tw": 10, "tf": 15}}
+        response = self.client.post("/generate", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("H/B ratio exceeds 10", response.headers["X-Validation-Warnings"])
+
+    def test_generate_batch_zip(self):
+        payload = {"items": [
+            {"component_type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}},
+            {"component_type": "column", "params": {"width": 0, "height": 200}},
+            {"component_type": "column", "params": {"width": 100, "height": 200}},
+        ]}
+        response = self.client.post("/generate/batch", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("application/zip", response.headers["content-type"])
+
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        self.assertIsNone(archive.testzip())
+        manifest = json.loads(archive.read("manifest.json"))
+        self.assertEqual([entry["status"] for entry in manifest], ["ok", "invalid", "ok"])
+        self.assertIn("must be between 1", manifest[1]["error"])
+        self.assertEqual(sorted(archive.namelist()), ["0001_beam.dxf", "0003_column.dxf", "manifest.json"])
+        self.assertIn(b"LWPOLYLINE", archive.read("0001_beam.dxf"))
+        # The streamed body gave its worker pool slot back
+        self.assertEqual(main.worker_pool.in_flight, 0)
+
+    def test_generate_layout(self):
+        beam = {"component_type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}}
+        payload = {"items": [beam, beam, {"component_type": "column", "params": {"width": 100, "height": 200}}], "mode": "grid"}
+        response = self.client.post("/generate/layout", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.count(b"\nINSERT\n"), 3)
+
+        payload["items"][2]["params"]["width"] = 0
+        response = self.client.post("/generate/layout", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"][0]["index"], 2)
+
+    def test_parse_generated_beam(self):
+        payload = {"component_type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}}
+        content = self.client.post("/generate", json=payload).content
+        response = self.client.post("/parse-dxf", files={"file": ("beam.dxf", content, "application/dxf")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"type": "beam", "params": payload["params"]})
+
+    def test_parse_rejects_bad_uploads(self):
+        response = self.client.post("/parse-dxf", files={"file": ("beam.txt", b"data", "text/plain")})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post("/parse-dxf", files={"file": ("empty.dxf", b"", "application/dxf")})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("File is empty", response.json()["detail"])
+        response = self.client.post("/parse-dxf", files={"file": ("bad.dxf", b"garbage\n", "application/dxf")})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid DXF file", response.json()["detail"])
+
+    def test_parse_bulk_ndjson(self):
+        doc = ezdxf.new()
+        msp = doc.modelspace()
+        msp.add_lwpolyline([(0, 0), (100, 0), (100, 200), (0, 200)], close=True)
+        msp.add_lwpolyline([(0, 0), (10, 0), (10, 10)], dxfattribs={"layer": "MISC"})
+        stream = io.StringIO()
+        doc.write(stream)
+        content = stream.getvalue().encode("utf-8")
+
+        response = self.client.post("/parse-dxf/bulk", files={"file": ("sheet.dxf", content, "application/dxf")})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("application/x-ndjson", response.headers["content-type"])
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["column", "unknown"])
+        self.assertEqual(lines[0]["params"], {"width": 100, "height": 200})
+        self.assertEqual(lines[1]["layer"], "MISC")
+
+        response = self.client.post("/parse-dxf/bulk?format=json", files={"file": ("sheet.dxf", content, "application/dxf")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), lines)
+
+    def test_parse_bulk_nested(self):
+        doc = ezdxf.new()
+        msp = doc.modelspace()
+        for outline in [[(-50, -100), (50, -100), (50, 100), (-50, 100)], [(-42, -92), (42, -92), (42, 92), (-42, 92)]]:
+            msp.add_lwpolyline(outline, close=True)
+        stream = io.StringIO()
+        doc.write(stream)
+        upload = {"file": ("rhs.dxf", stream.getvalue().encode("utf-8"), "application/dxf")}
+
+        flat = self.client.post("/parse-dxf/bulk?format=json", files=upload).json()
+        self.assertEqual([p["type"] for p in flat], ["column", "column"])
+        response = self.client.post("/parse-dxf/bulk?nested=true", files=upload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("application/x-ndjson", response.headers["content-type"])
+        nested = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(nested), 1)
+        self.assertEqual(nested[0]["type"], "hollow")
+        self.assertEqual(nested[0]["params"], {"H": 200, "B": 100, "t": 8})
+        self.assertEqual(self.client.post("/parse-dxf/bulk?nested=true&format=json", files=upload).json(), nested)
+
+    def test_parse_repeat_upload_hits_cache(self):
+        payload = {"component_type": "column", "params": {"width": 120, "height": 80}}
+        content = self.client.post("/generate", json=payload).content
+        upload = {"file": ("column.dxf", content, "application/dxf")}
+        with patch.object(main, "parse_cache", ParseCache()):
+            first = self.client.post("/parse-dxf", files=upload)
+            second = self.client.post("/parse-dxf", files=upload)
+            self.assertEqual(first.headers["X-Cache"], "MISS")
+            self.assertEqual(second.headers["X-Cache"], "HIT")
+            self.assertEqual(first.json(), second.json())
+
+            # Bulk results are cached separately, and ndjson fills the cache as it streams
+            streamed = self.client.post("/parse-dxf/bulk", files=upload)
+            self.assertEqual(streamed.headers["X-Cache"], "MISS")
+            as_json = self.client.post("/parse-dxf/bulk?format=json", files=upload)
+            self.assertEqual(as_json.headers["X-Cache"], "HIT")
+            self.assertEqual(as_json.json(), [json.loads(line) for line in streamed.text.splitlines()])
+
+            stats = self.client.get("/cache/stats").json()["parse"]
+            self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+            self.assertIn("dxf_parse_cache_hit_ratio 0.5", self.client.get("/metrics").text)
+
+    def test_section_properties(self):
+        payload = {"component_type": "column", "params": {"width": 100, "height": 200}}
+        response = self.client.post("/section-properties", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.json()["properties"]["area"], 20000)
+
+        payload = {"component_type": "column", "params": {"width": [100, 50], "height": [200, 50]}}
+        response = self.client.post("/section-properties/batch", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["properties"]["area"], [20000, 2500])
+
+        payload["params"]["width"][1] = 0
+        response = self.client.post("/section-properties/batch", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Item 1", response.json()["detail"])
+
+        payload = {"component_type": "beam", "params": {"H": [200, 1500], "B": [100, 100], "tw": [10, 10], "tf": [15, 15]}}
+        body = self.client.post("/section-properties/batch", json=payload).json()
+        self.assertEqual(body["warning_count"], 1)
+        self.assertEqual(body["warnings"][0]["index"], 1)
+
+    def test_section_properties_self_intersecting(self):
+        # Plates thicker than the section make the outline cross itself
+        for params in ({"H": 200, "B": 100, "tw": 150, "tf": 10}, {"H": 200, "B": 100, "tw": 10, "tf": 120}):
+            payload = {"component_type": "beam", "params": params}
+            self.assertEqual(self.client.post("/section-properties", json=payload).status_code, 400)
+            self.assertEqual(self.client.post("/generate", json=payload).status_code, 400)
+
+        payload = {"component_type": "beam", "params": {"H": [200, 200], "B": [100, 100], "tw": [10, 150], "tf": [15, 10]}}
+        response = self.client.post("/section-properties/batch", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"],
+                         "1 invalid item(s). Item 1: Error: Web thickness (tw) must be less than the flange width (B).")
+
+    def test_busy_server_returns_503(self):
+        busy_pool = WorkerPool(max_workers=1, max_queue=0, retry_after=3)
+        gate = threading.Event()
+        busy_pool.submit(gate.wait)
+        try:
+            with patch.object(main, "worker_pool", busy_pool):
+                payload = {"component_type": "beam", "params": {"H": 211, "B": 101, "tw": 9, "tf": 12}}
+                response = self.client.post("/generate", json=payload)
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response.headers["retry-after"], "3")
+                # Streamed and vectorized endpoints are admitted through the same pool
+                batch = {"items": [payload]}
+                self.assertEqual(self.client.post("/generate/batch", json=batch).status_code, 503)
+                sweep = {"component_type": "column", "params": {"width": [10, 20], "height": 10}}
+                self.assertEqual(self.client.post("/generate/sweep", json=sweep).status_code, 503)
+                properties = {"component_type": "column", "params": {"width": [10], "height": [10]}}
+                self.assertEqual(self.client.post("/section-properties/batch", json=properties).status_code, 503)
+        finally:
+            gate.set()
+            busy_pool.shutdown()
+
+    def test_metrics_endpoint(self):
+        payload = {"component_type": "column", "params": {"width": 123, "height": 456}}
+        self.client.post("/generate", json=payload)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('dxf_stage_duration_seconds_bucket{stage="draw",le="+Inf"}', response.text)
+        self.assertIn('dxf_stage_duration_seconds_count{stage="validate"}', response.text)
+        self.assertIn('dxf_request_duration_seconds_count{method="POST",route="/generate",status="200"}', response.text)
+        self.assertIn("dxf_worker_queue_depth", response.text)
+        self.assertIn('dxf_temp_dir_bytes{kind="free"}', response.text)
+
+    def test_profile_header(self):
+        payload = {"component_type": "column", "params": {"width": 124, "height": 457}}
+        response = self.client.post("/generate", json=payload, headers={"X-DXF-Profile": "1"})
+        self.assertNotIn("x-dxf-profile-id", response.headers)
+
+        payload["params"]["width"] = 125
+        with patch.object(main, "PROFILING_ENABLED", True):
+            response = self.client.post("/generate", json=payload, headers={"X-DXF-Profile": "1"})
+        profile = self.client.get(f"/metrics/profiles/{response.headers['x-dxf-profile-id']}")
+        self.assertEqual(profile.status_code, 200)
+        self.assertIn("samples", profile.json())
+        self.assertEqual(self.client.get("/metrics/profiles/unknown").status_code, 404)
+
+    def test_generate_batch_empty(self):
+        response = self.client.post("/generate/batch", json={"items": []})
+        self.assertEqual(response.status_code, 400)
+
+    def test_generate_by_designation(self):
+        response = self.client.get("/generate", params={"designation": "ipe 200"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["x-cache"], "CATALOG")
+        self.assertIn('filename="IPE200.dxf"', response.headers["content-disposition"])
+        # Same drawing and ETag as generating the nominal dimensions directly
+        direct = self.client.post("/generate", json={"component_type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}})
+        self.assertEqual(response.headers["etag"], direct.headers["etag"])
+        self.assertEqual(response.content, direct.content)
+        cached = self.client.get("/generate", params={"designation": "IPE200"}, headers={"If-None-Match": response.headers["etag"]})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(self.client.get("/generate", params={"designation": "IPE201"}).status_code, 404)
+
+    def test_catalog_query(self):
+        response = self.client.get("/catalog", params={"family": "heb", "H_min": 200, "H_max": 300, "sort": "mass"})
+        self.assertEqual(response.status_code, 200)
+        designations = [s["designation"] for s in response.json()["sections"]]
+        self.assertEqual(designations, ["HEB200", "HEB220", "HEB240", "HEB260", "HEB280", "HEB300"])
+        self.assertEqual(self.client.get("/catalog", params={"H_min": "deep"}).status_code, 400)
+        self.assertEqual(self.client.get("/catalog", params={"family": "UPN"}).status_code, 400)
+        self.assertEqual(self.client.get("/catalog", params={"limit": -3}).status_code, 400)
+
+    def test_catalog_entry(self):
+        entry = self.client.get("/catalog/SHS100x5").json()
+        self.assertEqual(entry["designation"], "SHS100X100X5")
+        self.assertEqual(entry["params"], {"H": 100, "B": 100, "t": 5.0})
+        self.assertAlmostEqual(entry["properties"]["area"], 1900.0)
+        self.assertEqual(self.client.get("/catalog/XYZ1").status_code, 404)
+
+    def test_job_lifecycle(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            queue = JobQueue(tmp_dir, {"batch": main._run_batch_job}, progress_interval=0, poll_interval=0.01)
+            queue.start()
+            try:
+                with patch.object(main, "job_queue", queue):
+                    items = [{"component_type": "column", "params": {"width": 10 + i, "height": 100}} for i in range(3)]
+                    items.append({"component_type": "column", "params": {"width": -1, "height": 100}})
+                    response = self.client.post("/jobs", json={"items": items, "priority": 1})
+                    self.assertEqual(response.status_code, 202)
+                    job_id = response.json()["id"]
+                    for _ in range(500):
+                        job = self.client.get(f"/jobs/{job_id}").json()
+                        if job["status"] == "done":
+                            break
+                        threading.Event().wait(0.01)
+                    self.assertEqual((job["status"], job["done"], job["failed"], job["progress"]), ("done", 3, 1, 1.0))
+                    result = self.client.get(job["result_url"])
+                    self.assertEqual(result.status_code, 200)
+                    with zipfile.ZipFile(io.BytesIO(result.content)) as archive:
+                        manifest = json.loads(archive.read("manifest.json"))
+                        self.assertEqual([e["status"] for e in manifest], ["ok", "ok", "ok", "invalid"])
+                    self.assertEqual(self.client.delete(f"/jobs/{job_id}").json()["status"], "deleted")
+                    self.assertEqual(self.client.get(f"/jobs/{job_id}").status_code, 404)
+                    self.assertEqual(self.client.get(f"/jobs/{job_id}/result").status_code, 404)
+            finally:
+                queue.stop()
+
+    def test_job_result_not_ready(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Not started, so the job stays queued
+            queue = JobQueue(tmp_dir, {"batch": main._run_batch_job})
+            with patch.object(main, "job_queue", queue):
+                job_id = self.client.post("/jobs", json={"items": [{"component_type": "column", "params": {"width": 1, "height": 1}}]}).json()["id"]
+                self.assertEqual(self.client.get(f"/jobs/{job_id}/result").status_code, 409)
+                self.assertEqual(self.client.delete(f"/jobs/{job_id}").json()["status"], "cancelled")
+                self.assertEqual(self.client.get(f"/jobs/{job_id}").json()["status"], "cancelled")
+                self.assertEqual(self.client.post("/jobs", json={"items": []}).status_code, 400)
+
+    def test_jobs_disabled_without_jobs_dir(self):
+        with patch.object(main, "job_queue", None):
+            response = self.client.post("/jobs", json={"items": [{"component_type": "column", "params": {"width": 1, "height": 1}}]})
+            self.assertEqual(response.status_code, 503)
+            self.assertIn("DXF_JOBS_DIR", response.json()["detail"])
+            self.assertEqual(self.client.get("/jobs/abc").status_code, 503)
+            self.assertNotIn("jobs", self.client.get("/cache/stats").json())
+
+    def test_job_workers_start_with_the_app(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            queue = JobQueue(tmp_dir, {"batch": main._run_batch_job})
+            with patch.object(main, "job_queue", queue):
+                self.assertEqual(queue._threads, [])
+                with TestClient(app):
+                    self.assertTrue(queue._threads)
+                self.assertEqual(queue._threads, [])
+
+    def test_sweep_layout(self):
+        payload = {"component_type": "beam", "format": "layout",
+                   "params": {"H": {"start": 100, "stop": 600, "step": 20}, "B": {"start": 50, "stop": 300, "step": 10}, "tw": 10, "tf": 15}}
+        estimate = self.client.post("/generate/sweep/estimate", json=payload).json()
+        self.assertEqual((estimate["combinations"], estimate["valid"]), (676, 676))
+        response = self.client.post("/generate/sweep", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["x-sweep-valid"], "676")
+        doc = ezdxf.read(io.StringIO(response.content.decode("utf-8")))
+        self.assertEqual(len(doc.modelspace()), 676)
+
+    def test_sweep_zip_skips_invalid(self):
+        payload = {"component_type": "column", "format": "zip", "params": {"width": [-5, 10, 20], "height": 100}}
+        response = self.client.post("/generate/sweep", json=payload)
+        self.assertEqual(response.headers["x-sweep-invalid"], "1")
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            self.assertEqual(archive.namelist(), ["column_width10_height100.dxf", "column_width20_height100.dxf"])
+
+    def test_sweep_errors(self):
+        base = {"component_type": "column", "params": {"width": [-5], "height": 100}}
+        self.assertEqual(self.client.post("/generate/sweep", json=base).status_code, 400)
+        self.assertEqual(self.client.post("/generate/sweep", json={**base, "format": "pdf"}).status_code, 400)
+        grid = {"component_type": "column", "params": {"width": [10, 20], "height": 100}}
+        for columns in (0, -2):
+            response = self.client.post("/generate/sweep", json={**grid, "columns": columns})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("Columns", response.json()["detail"])
+        repeated = {"component_type": "beam", "format": "zip", "params": {"H": [200, 200], "B": 100, "tw": 10, "tf": 10}}
+        response = self.client.post("/generate/sweep", json=repeated)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("repeated", response.json()["detail"])
+        huge = {"component_type": "column", "params": {"width": {"start": 1, "stop": 100000, "step": 0.001}, "height": 100}}
+        self.assertEqual(self.client.post("/generate/sweep/estimate", json=huge).status_code, 400)
+        huge["params"]["width"] = {"start": 1, "stop": 1e12, "step": 1e-3}
+        self.assertEqual(self.client.post("/generate/sweep", json=huge).status_code, 400)
+
+    def test_preview_svg_cached(self):
+        payload = {"component_type": "beam", "params": {"H": 210, "B": 100, "tw": 10, "tf": 15}}
+        first = self.client.post("/preview", json=payload)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["content-type"], "image/svg+xml")
+        self.assertTrue(first.content.startswith(b"<svg"))
+        second = self.client.get("/preview/beam", params={"H": 210, "B": 100, "tw": 10, "tf": 15})
+        self.assertEqual(second.headers["x-cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        not_modified = self.client.post("/preview", json=payload, headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_preview_png_and_errors(self):
+        response = self.client.get("/preview/hollow", params={"H": 100, "B": 50, "t": 5, "format": "png", "size": 64})
+        self.assertEqual(response.headers["content-type"], "image/png")
+        self.assertTrue(response.content.startswith(b"\x89PNG"))
+        self.assertEqual(self.client.get("/preview/hollow", params={"H": 100, "B": 50, "t": 30}).status_code, 400)
+        self.assertEqual(self.client.get("/preview/beam", params={"H": "tall"}).status_code, 400)
+        self.assertEqual(self.client.get("/preview/column", params={"width": 1, "height": 1, "format": "gif"}).status_code, 400)
+
+    def test_preview_sprite(self):
+        payload = {"items": [{"component_type": "column", "params": {"width": 10, "height": 20}},
+                             {"component_type": "column", "params": {"width": -1, "height": 20}}],
+                   "designations": ["IPE200", "HEB300"], "size": 32}
+        response = self.client.post("/preview/sprite", json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.headers["x-sprite-columns"], response.headers["x-sprite-invalid"]), ("2", "1"))
+        self.assertEqual(self.client.post("/preview/sprite", json=payload).headers["x-cache"], "HIT")
+        self.assertEqual(self.client.post("/preview/sprite", json={"designations": ["IPE999"]}).status_code, 404)
+        self.assertEqual(self.client.post("/preview/sprite", json={}).status_code, 400)
+        response = self.client.post("/preview/sprite", json={**payload, "columns": 10 ** 7})
+        self.assertEqual(response.headers["x-sprite-columns"], "4")
+        response = self.client.post("/preview/sprite", json={"designations": ["IPE200"] * 8, "size": 2048})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pixels", response.json()["detail"])
+
+    def test_generate_gzip_encoding(self):
+        payload = {"component_type": "column", "params": {"width": 123, "height": 456}}
+        plain = self.client.post("/generate", json=payload, headers={"Accept-Encoding": "identity"})
+        response = self.client.post("/generate", json=payload, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        # httpx decodes transparently; the headers describe the wire size
+        self.assertEqual(response.content, plain.content)
+        self.assertEqual(int(response.headers["x-uncompressed-length"]), len(plain.content))
+        saved = int(response.headers["x-bytes-saved"])
+        self.assertEqual(int(response.headers["content-length"]), len(plain.content) - saved)
+        self.assertGreater(saved, 0)
+
+    def test_generate_binary_and_precision(self):
+        payload = {"component_type": "column", "params": {"width": 100 / 3, "height": 50}}
+        binary = self.client.post("/generate", json={**payload, "output": "binary"})
+        self.assertTrue(binary.content.startswith(b"AutoCAD Binary DXF"))
+        trimmed = self.client.post("/generate", json={**payload, "precision": 1})
+        self.assertIn(b"\n33.3\n", trimmed.content)
+        default = self.client.post("/generate", json=payload)
+        # Each variant has its own cache entry and ETag
+        self.assertEqual(len({binary.headers["etag"], trimmed.headers["etag"], default.headers["etag"]}), 3)
+        self.assertEqual(self.client.post("/generate", json={**payload, "output": "dwg"}).status_code, 400)
+
+    def test_batch_archive_per_entry_compression(self):
+        payload = {"output": "binary", "items": [{"component_type": "column", "params": {"width": 10, "height": 20}}]}
+        response = self.client.post("/generate/batch", json=payload)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            manifest = json.loads(archive.read("manifest.json"))
+            self.assertIn(manifest[0]["compression"], ("deflate", "store"))
+            self.assertEqual(manifest[0]["size"], len(archive.read(manifest[0]["filename"])))
+            self.assertLessEqual(manifest[0]["compressed_size"], manifest[0]["size"])
+            self.assertTrue(archive.read(manifest[0]["filename"]).startswith(b"AutoCAD Binary DXF"))
+
 if __name__ == '__main__':
     unittest.main()
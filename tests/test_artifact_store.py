@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.artifact_store import ArtifactStore, TEMP_PREFIX
+
+class TestArtifactStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _age(self, store, key, seconds):
+        path = store.path(key)
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    def test_put_and_get(self):
+        store = ArtifactStore(self.tmp.name)
+        self.assertIsNone(store.get_path("ab" * 32))
+        path = store.put("ab" * 32, b"DXF")
+        self.assertTrue(path.endswith(".dxf"))
+        found, stat = store.get_path("ab" * 32)
+        self.assertEqual(found, path)
+        self.assertEqual(stat.st_size, 3)
+        self.assertEqual(store.get("ab" * 32), b"DXF")
+        self.assertEqual(store.stats()["entries"], 1)
+        self.assertEqual((store.hits, store.misses), (2, 1))
+
+    def test_concurrent_writers_leave_no_partial_files(self):
+        store = ArtifactStore(self.tmp.name)
+        data = b"x" * 100000
+        threads = [threading.Thread(target=store.put, args=("cd" * 32, data)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(store.get("cd" * 32), data)
+        shard = os.path.dirname(store.path("cd" * 32))
+        self.assertEqual([name for name in os.listdir(shard) if name.startswith(TEMP_PREFIX)], [])
+
+    def test_sweep_evicts_least_recently_used(self):
+        store = ArtifactStore(self.tmp.name, max_bytes=250, min_age=0)
+        keys = [f"{i:02d}" * 32 for i in range(4)]
+        for age, key in zip((400, 300, 200, 100), keys):
+            store.put(key, b"y" * 100)
+            self._age(store, key, age)
+        # Reading the oldest entry makes it the most recently used
+        store.get_path(keys[0])
+        self.assertEqual(store.sweep(), 2)
+        self.assertIsNotNone(store.get_path(keys[0]))
+        self.assertIsNone(store.get_path(keys[1]))
+        self.assertIsNone(store.get_path(keys[2]))
+        self.assertLessEqual(store.stats()["bytes"], 250)
+
+    def test_sweep_spares_recently_used_and_removes_stale_temp_files(self):
+        store = ArtifactStore(self.tmp.name, max_bytes=10, min_age=60)
+        store.put("ef" * 32, b"z" * 100)
+        stale = os.path.join(os.path.dirname(store.path("ef" * 32)), TEMP_PREFIX + "crashed")
+        with open(stale, "wb") as f:
+            f.write(b"partial")
+        os.utime(stale, (time.time() - 7200, time.time() - 7200))
+        self.assertEqual(store.sweep(), 0)
+        self.assertIsNotNone(store.get_path("ef" * 32))
+        self.assertFalse(os.path.exists(stale))
+
+    def test_janitor_runs_when_over_quota(self):
+        store = ArtifactStore(self.tmp.name, max_bytes=150, janitor_interval=60, min_age=0)
+        store.put("01" * 32, b"a" * 100)
+        self._age(store, "01" * 32, 100)
+        store.start_janitor()
+        try:
+            store.put("02" * 32, b"b" * 100)
+            deadline = time.time() + 5
+            while store.evictions == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            store.stop_janitor()
+        self.assertEqual(store.evictions, 1)
+        self.assertIsNone(store.get_path("01" * 32))
+
+if __name__ == '__main__':
+    unittest.main()
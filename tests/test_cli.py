@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from unittest.mock import patch
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ezdxf
+from backend import cli
+
+CSV_SCHEDULE = """component_type,name,H,B,tw,tf,width,height
+beam,B-1,200,100,5.6,8.5,,
+column,,,,,,100,300
+beam,,0,100,5,8,,
+column,,,,,,abc,300
+"""
+
+NDJSON_SCHEDULE = """{"component_type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}}
+{"component_type": "column", "width": 100, "height": 300, "name": "C 1"}
+
+not json
+{"component_type": "channel", "params": {}}
+"""
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def _run(self, argv, stdin=None):
+        out, err = io.StringIO(), io.StringIO()
+        with patch('sys.stdout', new=out), patch('sys.stderr', new=err):
+            if stdin is not None:
+                with patch('sys.stdin', new=io.StringIO(stdin)):
+                    code = cli.main(argv)
+            else:
+                code = cli.main(argv)
+        return code, out.getvalue(), err.getvalue()
+
+    def test_csv_schedule(self):
+        path = self._write("schedule.csv", CSV_SCHEDULE)
+        out_dir = os.path.join(self.tmp.name, "out")
+        code, out, err = self._run([path, "-o", out_dir, "--executor", "thread", "--workers", "2", "--json"])
+        self.assertEqual(code, 1)
+        stats = json.loads(out)
+        self.assertEqual((stats["read"], stats["written"], stats["invalid"], stats["failed"]), (4, 2, 2, 0))
+        self.assertEqual(sorted(os.listdir(out_dir)), ["000002_column.dxf", "B-1.dxf"])
+        self.assertIn("line 4: Error: Total depth (H)", err)
+        self.assertIn("line 5: Error: width must be a number.", err)
+        doc = ezdxf.readfile(os.path.join(out_dir, "B-1.dxf"))
+        self.assertEqual(len(doc.modelspace().query("LWPOLYLINE")[0]), 12)
+
+    def test_ndjson_from_stdin(self):
+        out_dir = os.path.join(self.tmp.name, "out")
+        code, out, err = self._run(["-", "-o", out_dir, "--executor", "inline", "--json"], stdin=NDJSON_SCHEDULE)
+        stats = json.loads(out)
+        self.assertEqual((stats["read"], stats["written"], stats["invalid"]), (4, 2, 2))
+        self.assertEqual(sorted(os.listdir(out_dir)), ["000001_beam.dxf", "C_1.dxf"])
+        self.assertIn("line 4: Invalid JSON", err)
+        self.assertIn("line 5: Invalid component type", err)
+
+    def test_dry_run_writes_nothing(self):
+        path = self._write("schedule.ndjson", NDJSON_SCHEDULE.splitlines()[0] + "\n")
+        code, out, err = self._run([path, "--dry-run"])
+        self.assertEqual(code, 0)
+        self.assertIn("1 read, 0 written, 0 invalid", out)
+        self.assertEqual(os.listdir(self.tmp.name), ["schedule.ndjson"])
+
+    def test_colliding_names_get_a_suffix(self):
+        schedule = "component_type,name,width,height\n" + "".join(
+            f"column,{name},100,{100 + i}\n" for i, name in enumerate(["a/b", "a_b", "A_B", "a_b"]))
+        path = self._write("schedule.csv", schedule)
+        out_dir = os.path.join(self.tmp.name, "out")
+        code, out, err = self._run([path, "-o", out_dir, "--executor", "inline", "--json"])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)["written"], 4)
+        self.assertEqual(sorted(os.listdir(out_dir)), ["A_B_3.dxf", "a_b.dxf", "a_b_2.dxf", "a_b_4.dxf"])
+        self.assertIn("line 3: a_b.dxf is already used, writing a_b_2.dxf", err)
+        self.assertIn("line 4: A_B.dxf is already used, writing A_B_3.dxf", err)
+
+    def test_records_are_read_lazily(self):
+        def lines():
+            yield "component_type,width,height\n"
+            yield "column,100,200\n"
+            raise AssertionError("read past the first row")
+
+        records = cli.iter_csv_records(lines())
+        first = next(records)
+        self.assertEqual((first.component_type, first.params), ("column", {"width": 100.0, "height": 200.0}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import pickle
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.batch import ComponentBatch, ComponentView
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.interfaces.dxf_generator_interface import DXFGeneratorInterface
+from backend.services.dxf_service import DXFService
+from backend.services.section_properties import component_properties
+
+class TestComponentBatch(unittest.TestCase):
+    def setUp(self):
+        self.beams = [IBeam(200 + i, 100, 5.6, 8.5) for i in range(5)]
+        self.batch = ComponentBatch.from_components(self.beams)
+
+    def test_columns_are_contiguous_arrays(self):
+        self.assertEqual(len(self.batch), 5)
+        self.assertEqual(self.batch.component_type, "beam")
+        for column in self.batch.columns.values():
+            self.assertEqual(column.dtype, np.float64)
+            self.assertTrue(column.flags['C_CONTIGUOUS'])
+        self.assertEqual(self.batch.nbytes, 5 * 4 * 8)
+
+    def test_views_behave_like_components(self):
+        view = self.batch[-1]
+        self.assertIsInstance(view, ComponentView)
+        self.assertFalse(hasattr(view, '__dict__'))
+        self.assertEqual(view.H, 204)
+        self.assertEqual(view.get_points(), self.beams[-1].get_points())
+        self.assertEqual(DXFGeneratorInterface.describe(view), DXFGeneratorInterface.describe(self.beams[-1]))
+        with self.assertRaises(IndexError):
+            self.batch[5]
+        with self.assertRaises(AttributeError):
+            view.width
+
+    def test_slices_share_memory(self):
+        sub = self.batch[1:3]
+        self.assertEqual(len(sub), 2)
+        self.assertTrue(np.shares_memory(sub.columns['H'], self.batch.columns['H']))
+        self.assertEqual(self.batch[np.array([True, False, True, False, False])].columns['H'].tolist(), [200, 202])
+
+    def test_vertices_match_get_points(self):
+        vertices = self.batch.vertices()
+        self.assertEqual(vertices.shape, (5, 12, 2))
+        np.testing.assert_allclose(vertices[2], np.array(self.beams[2].get_points()))
+        blocks = list(self.batch.iter_vertices(chunk_size=2))
+        self.assertEqual([len(block) for block in blocks], [2, 2, 1])
+
+    def test_section_properties_and_validation(self):
+        properties = self.batch.section_properties(chunk_size=2)
+        expected = component_properties(self.beams[3])
+        for name, value in expected.items():
+            self.assertAlmostEqual(float(properties[name][3]), value)
+
+        batch = ComponentBatch("column", {"width": [100, 0, 50], "height": [200, 200, 0]})
+        validation = batch.validate()
+        self.assertEqual(validation.invalid.tolist(), [False, True, True])
+
+    def test_feeds_dxf_service(self):
+        service = DXFService(executor="inline")
+        contents = service.render_batch(self.batch)
+        self.assertEqual(contents[1], service.to_bytes(self.beams[1]))
+        with DXFService(max_workers=2, executor="process") as pool:
+            self.assertEqual(pool.render_batch(self.batch), contents)
+
+    def test_pickles_by_component_type(self):
+        view = pickle.loads(pickle.dumps(self.batch[2]))
+        self.assertEqual(view.params(), {'H': 202.0, 'B': 100.0, 'tw': 5.6, 'tf': 8.5})
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            ComponentBatch("column", {"width": [1, 2], "height": [1]})
+        with self.assertRaises(ValueError):
+            ComponentBatch("column", {"width": [1]})
+        with self.assertRaises(ValueError):
+            ComponentBatch.from_components([Column(1, 2), IBeam(200, 100, 5, 8)])
+
+if __name__ == '__main__':
+    unittest.main()
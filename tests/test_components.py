@@ -4,12 +4,15 @@ import sys
 import os
 from unittest.mock import patch
 import io
+import numpy as np
 
 # Add the project root to the sys.path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.components.beam import IBeam
 from backend.components.column import Column
+from backend.components.hollow import HollowSection
+from backend.interfaces.validator import Validator
 
 class TestComponents(unittest.TestCase):
     def setUp(self):
@@ -44,5 +47,35 @@ class TestComponents(unittest.TestCase):
         # Check number of points (Rectangle should have 4 points)
         self.assertEqual(len(entities[0]), 4)
 
+    def test_hollow_draw(self):
+        HollowSection(H=100, B=50, t=5).draw(self.msp)
+        entities = list(self.msp)
+        self.assertEqual([e.dxftype() for e in entities], ['LWPOLYLINE', 'LWPOLYLINE'])
+        self.assertTrue(all(e.closed for e in entities))
+        self.assertEqual(entities[0].get_points(format="xy")[2], (25, 50))
+        self.assertEqual(entities[1].get_points(format="xy")[2], (20, 45))
+
+    def test_hollow_wall_constraint(self):
+        ok, message = Validator.validate("hollow", {"H": 100, "B": 50, "t": 25})
+        self.assertFalse(ok)
+        self.assertIn("Wall thickness", message)
+        self.assertTrue(Validator.validate("hollow", {"H": 100, "B": 50, "t": 24.9})[0])
+
+    def test_beam_plate_constraints(self):
+        ok, message = Validator.validate("beam", {"H": 200, "B": 100, "tw": 150, "tf": 10})
+        self.assertFalse(ok)
+        self.assertIn("Web thickness (tw)", message)
+        ok, message = Validator.validate("beam", {"H": 200, "B": 100, "tw": 10, "tf": 120})
+        self.assertFalse(ok)
+        self.assertIn("Flange thickness (tf)", message)
+        self.assertTrue(Validator.validate("beam", {"H": 200, "B": 100, "tw": 99, "tf": 99})[0])
+
+    def test_hollow_params_from_outlines(self):
+        outer, inner = np.array(HollowSection.split_outlines(HollowSection.points_array(100, 50, 5)[0]))
+        params = HollowSection.params_from_outlines(np.stack([outer, outer]), np.stack([inner, inner + [3, 0]]))
+        self.assertEqual((params["H"][0], params["B"][0], params["t"][0]), (100, 50, 5))
+        # An off-centre hole has unequal walls
+        self.assertTrue(np.isnan(params["t"][1]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.dxf_cache import DXFCache
+
+class TestDXFCache(unittest.TestCase):
+
+    def test_key_is_canonical(self):
+        key_a = DXFCache.make_key("beam", {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5})
+        key_b = DXFCache.make_key("beam", {"tf": 8.5, "tw": 5.6, "B": 100.0, "H": 200.0})
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, DXFCache.make_key("column", {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}))
+
+    def test_hit_and_miss_counters(self):
+        cache = DXFCache()
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", b"data")
+        self.assertEqual(cache.get("a"), b"data")
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bytes"], 4)
+
+    def test_lru_eviction_by_count(self):
+        cache = DXFCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_eviction_by_size(self):
+        cache = DXFCache(max_bytes=10)
+        cache.put("a", b"x" * 6)
+        cache.put("b", b"y" * 6)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["bytes"], 6)
+        cache.put("huge", b"z" * 11)
+        self.assertIsNone(cache.get("huge"))
+
+    def test_etag_matching(self):
+        key = "abc"
+        self.assertTrue(DXFCache.etag_matches(DXFCache.etag(key), key))
+        self.assertTrue(DXFCache.etag_matches('"other", "abc"', key))
+        self.assertTrue(DXFCache.etag_matches("*", key))
+        self.assertFalse(DXFCache.etag_matches('"other"', key))
+        self.assertFalse(DXFCache.etag_matches(None, key))
+
+if __name__ == '__main__':
+    unittest.main()
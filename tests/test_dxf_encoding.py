@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import io
+import gzip
+import tempfile
+import zipfile
+import ezdxf
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.dxf_encoding import (compress, negotiate_encoding, savings_headers, to_binary,
+                                            trim_precision, worth_deflating, CONTENT_ENCODINGS)
+from backend.services.archive import ZipStreamWriter
+from backend.services.dxf_service import DXFService
+from backend.components.column import Column
+from backend.components.beam import IBeam
+
+def read_binary(content):
+    with tempfile.NamedTemporaryFile(suffix=".dxf", delete=False) as f:
+        f.write(content)
+    try:
+        return ezdxf.readfile(f.name)
+    finally:
+        os.remove(f.name)
+
+class TestDXFEncoding(unittest.TestCase):
+    def setUp(self):
+        self.service = DXFService(executor="inline")
+
+    def test_negotiate_encoding(self):
+        self.assertIsNone(negotiate_encoding(None))
+        self.assertIsNone(negotiate_encoding("identity"))
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0"))
+        self.assertEqual(negotiate_encoding("*"), CONTENT_ENCODINGS[0])
+        self.assertEqual(negotiate_encoding("deflate, gzip;q=0.5"), "gzip")
+
+    def test_gzip_is_deterministic(self):
+        data = self.service.to_bytes(Column(100, 200))
+        encoded = compress(data, "gzip")
+        self.assertEqual(encoded, compress(data, "gzip"))
+        self.assertEqual(gzip.decompress(encoded), data)
+        self.assertLess(len(encoded), len(data) / 3)
+        with self.assertRaises(ValueError):
+            compress(data, "zstd")
+
+    def test_trim_precision(self):
+        content = DXFService(executor="inline", precision=2).to_bytes(Column(100 / 3, 200 / 3))
+        points = ezdxf.read(io.StringIO(content.decode("utf-8"))).modelspace()[0].get_points(format="xy")
+        self.assertEqual(points[2], (33.33, 66.67))
+        self.assertIn(b"\n66.67\n", content)
+        self.assertNotIn(b"66.666", content)
+        # Same drawing otherwise: only coordinate digits differ
+        self.assertEqual(trim_precision(content, 2), content)
+
+    def test_binary_output(self):
+        ascii_content = self.service.to_bytes(IBeam(200, 100, 10, 15))
+        binary = DXFService(executor="inline", output="binary").to_bytes(IBeam(200, 100, 10, 15))
+        self.assertTrue(binary.startswith(b"AutoCAD Binary DXF\r\n\x1a\x00"))
+        self.assertLess(len(binary), len(ascii_content))
+        doc = read_binary(binary)
+        self.assertEqual(doc.modelspace()[0].get_points(format="xy"), IBeam(200, 100, 10, 15).get_points())
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            DXFService(output="dwg")
+        with self.assertRaises(ValueError):
+            DXFService(precision=-1)
+
+    def test_adaptive_zip_entries(self):
+        text = self.service.to_bytes(Column(100, 200))
+        noise = os.urandom(4096)
+        self.assertTrue(worth_deflating(text))
+        self.assertFalse(worth_deflating(noise))
+        writer = ZipStreamWriter(adaptive=True)
+        data = writer.add("text.dxf", text)
+        self.assertEqual(writer.last_entry.compress_type, zipfile.ZIP_DEFLATED)
+        data += writer.add("noise.bin", noise)
+        self.assertEqual(writer.last_entry.compress_type, zipfile.ZIP_STORED)
+        data += writer.close()
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.read("noise.bin"), noise)
+
+    def test_savings_headers(self):
+        self.assertEqual(savings_headers(1000, 250),
+                         {"X-Uncompressed-Length": "1000", "X-Bytes-Saved": "750", "X-Compression-Ratio": "0.250"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import io
+from unittest.mock import patch
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ezdxf
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.components.batch import ComponentBatch
+from backend.services.dxf_service import DXFService
+from backend.services.dxf_template import get_template_pool
+from backend.services.dxf_fast_writer import FastDXFWriter, DXFWriterVerificationError
+
+class LayeredColumn(Column):
+    def draw(self, msp):
+        msp.doc.layers.add("COLUMNS")
+        msp.add_lwpolyline(self.get_points(), close=True, dxfattribs={"layer": "COLUMNS"})
+
+class TestFastDXFWriter(unittest.TestCase):
+    def setUp(self):
+        self.template = get_template_pool()
+        self.writer = FastDXFWriter(self.template, verify=True)
+
+    def test_matches_ezdxf_writer_byte_for_byte(self):
+        ezdxf_service = DXFService(template=self.template, writer="ezdxf")
+        fast_service = DXFService(template=self.template, writer="fast", verify=True)
+        for component in (IBeam(200, 100, 5.6, 8.5), Column(100, 200), IBeam(0.1 + 0.2, 1e-7, 3, 1),
+                          ComponentBatch("column", {"width": [12.5], "height": [7]})[0]):
+            with self.subTest(component=component):
+                self.assertEqual(fast_service.to_bytes(component), ezdxf_service.to_bytes(component))
+
+    def test_unregistered_components_fall_back(self):
+        self.assertIsNone(self.writer.render(LayeredColumn(100, 200)))
+        content = DXFService(template=self.template, writer="fast").to_bytes(LayeredColumn(100, 200))
+        doc = ezdxf.read(io.StringIO(content.decode("utf-8")))
+        self.assertIn("COLUMNS", doc.layers)
+
+    def test_many_outlines_in_one_document(self):
+        batch = ComponentBatch("beam", {"H": [200, 300, 400], "B": [100] * 3, "tw": [5] * 3, "tf": [8] * 3})
+        content = self.writer.render_outlines(batch.vertices())
+        doc = ezdxf.read(io.StringIO(content.decode("utf-8")))
+        polylines = doc.modelspace().query("LWPOLYLINE")
+        self.assertEqual(len(polylines), 3)
+        self.assertEqual(len({p.dxf.handle for p in polylines}), 3)
+        self.assertEqual(doc.audit().has_errors, False)
+
+    def test_entity_limit(self):
+        with self.assertRaises(ValueError):
+            list(self.writer.iter_entities([[(0, 0), (1, 0), (1, 1)]] * (self.writer.max_entities + 1)))
+
+    def test_verify_detects_mismatch(self):
+        with patch("backend.services.dxf_fast_writer._vertex_text", return_value=" 10\n0.0\n 20\n0.0\n" * 4):
+            with self.assertRaises(DXFWriterVerificationError):
+                self.writer.render(Column(100, 200))
+
+    def test_writer_selected_by_environment(self):
+        with patch.dict(os.environ, {"DXF_WRITER": "fast"}):
+            self.assertEqual(DXFService().writer, "fast")
+        with self.assertRaises(ValueError):
+            DXFService(writer="dwg")
+
+if __name__ == '__main__':
+    unittest.main()
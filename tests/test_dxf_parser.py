@@ -0,0 +1,129 @@
+import unittest
+import ezdxf
+import io
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.components.hollow import HollowSection
+from backend.services.dxf_parser import (scan_lwpolylines, read_first_lwpolyline, classify_points, classify_profiles,
+                                         iter_lwpolylines, iter_profiles, find_parents, parse_nested,
+                                         DXFScanError)
+
+def _dxf_bytes(doc, fmt="asc"):
+    if fmt == "bin":
+        stream = io.BytesIO()
+        doc.write(stream, fmt="bin")
+        return stream.getvalue()
+    stream = io.StringIO()
+    doc.write(stream)
+    return doc.encode(stream.getvalue())
+
+class TestDXFParser(unittest.TestCase):
+    def setUp(self):
+        self.doc = ezdxf.new()
+        self.msp = self.doc.modelspace()
+
+    def test_scan_matches_ezdxf(self):
+        IBeam(H=200, B=100, tw=10, tf=15).draw(self.msp)
+        self.msp.add_line((0, 0), (1, 1))
+        self.msp.add_lwpolyline([(0, 0), (50, 0), (50, 80), (0, 80)], close=True, dxfattribs={"layer": "COLUMNS"})
+        entities = list(scan_lwpolylines(io.BytesIO(_dxf_bytes(self.doc))))
+        expected = self.msp.query('LWPOLYLINE')
+        self.assertEqual(len(entities), 2)
+        for entity, pline in zip(entities, expected):
+            self.assertEqual(entity["handle"], pline.dxf.handle)
+            self.assertEqual(entity["layer"], pline.dxf.layer)
+            self.assertEqual([tuple(p) for p in entity["points"]], [(p[0], p[1]) for p in pline.get_points()])
+
+    def test_scan_stops_after_first_polyline(self):
+        Column(width=100, height=200).draw(self.msp)
+        for i in range(200):
+            self.msp.add_circle((i, i), 5)
+        data = _dxf_bytes(self.doc)
+        stream = io.BytesIO(data)
+        points = read_first_lwpolyline(stream)
+        self.assertEqual(points, [(0, 0), (100, 0), (100, 200), (0, 200)])
+        self.assertLess(stream.tell(), len(data) // 2)
+
+    def test_paperspace_polylines_are_skipped(self):
+        self.doc.layout().add_lwpolyline([(0, 0), (1, 0), (1, 1)], close=True)
+        Column(width=100, height=200).draw(self.msp)
+        entities = list(scan_lwpolylines(io.BytesIO(_dxf_bytes(self.doc))))
+        self.assertEqual(len(entities), 1)
+        self.assertEqual(len(entities[0]["points"]), 4)
+
+    def test_no_polyline(self):
+        self.msp.add_line((0, 0), (1, 1))
+        self.assertIsNone(read_first_lwpolyline(io.BytesIO(_dxf_bytes(self.doc))))
+
+    def test_binary_dxf_falls_back_to_ezdxf(self):
+        IBeam(H=200, B=100, tw=10, tf=15).draw(self.msp)
+        data = _dxf_bytes(self.doc, fmt="bin")
+        with self.assertRaises(DXFScanError):
+            list(scan_lwpolylines(io.BytesIO(data)))
+        self.assertEqual(len(read_first_lwpolyline(io.BytesIO(data))), 12)
+
+    def test_garbage_raises_dxf_error(self):
+        with self.assertRaises(ezdxf.DXFError):
+            read_first_lwpolyline(io.BytesIO(b"not a dxf file\n"))
+
+    def test_classify_points(self):
+        beam = classify_points(IBeam(H=200, B=100, tw=5.6, tf=8.5).get_points())
+        self.assertEqual(beam, {"type": "beam", "params": {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}})
+        column = classify_points(Column(width=100, height=200).get_points())
+        self.assertEqual(column, {"type": "column", "params": {"width": 100, "height": 200}})
+        with self.assertRaises(ValueError):
+            classify_points([(0, 0), (1, 0), (1, 1)])
+
+    def test_classify_profiles_bulk(self):
+        IBeam(H=200, B=100, tw=5.6, tf=8.5).draw(self.msp)
+        self.msp.add_lwpolyline([(0, 0), (1, 0), (1, 1)], dxfattribs={"layer": "MISC"})
+        Column(width=100, height=200).draw(self.msp)
+        IBeam(H=400, B=180, tw=8.6, tf=13.5).draw(self.msp)
+        profiles = list(iter_profiles(iter_lwpolylines(io.BytesIO(_dxf_bytes(self.doc))), chunk_size=2))
+        self.assertEqual([p["type"] for p in profiles], ["beam", "unknown", "column", "beam"])
+        self.assertEqual(profiles[3]["params"], {"H": 400, "B": 180, "tw": 8.6, "tf": 13.5})
+        self.assertEqual(profiles[1]["layer"], "MISC")
+        self.assertEqual(profiles[1]["params"], {"points": 3})
+        handles = [e.dxf.handle for e in self.msp.query('LWPOLYLINE')]
+        self.assertEqual([p["handle"] for p in profiles], handles)
+
+    def test_bulk_binary_fallback(self):
+        Column(width=100, height=200).draw(self.msp)
+        Column(width=50, height=60).draw(self.msp)
+        profiles = classify_profiles(list(iter_lwpolylines(io.BytesIO(_dxf_bytes(self.doc, fmt="bin")))))
+        self.assertEqual([p["params"] for p in profiles], [{"width": 100, "height": 200}, {"width": 50, "height": 60}])
+
+    def test_nested_hollow_sections(self):
+        HollowSection(H=200, B=100, t=8).draw(self.msp)
+        # Off-centre hole: a plate with a cut-out, not a hollow section
+        self.msp.add_lwpolyline([(300, 0), (400, 0), (400, 100), (300, 100)], close=True)
+        self.msp.add_lwpolyline([(310, 10), (330, 10), (330, 30), (310, 30)], close=True)
+        # Beam drawn inside a sheet border
+        self.msp.add_lwpolyline([(-500, -500), (1000, -500), (1000, 500), (-500, 500)], close=True, dxfattribs={"layer": "BORDER"})
+        IBeam(H=200, B=100, tw=10, tf=15).draw(self.msp)
+        handles = [e.dxf.handle for e in self.msp.query('LWPOLYLINE')]
+
+        profiles = parse_nested(iter_lwpolylines(io.BytesIO(_dxf_bytes(self.doc))))
+        self.assertEqual([p["type"] for p in profiles], ["hollow", "column", "column", "column", "beam"])
+        self.assertEqual(profiles[0]["params"], {"H": 200, "B": 100, "t": 8})
+        self.assertEqual(profiles[0]["holes"], [handles[1]])
+        self.assertEqual(profiles[2]["parent"], handles[2])
+        self.assertEqual(profiles[4]["parent"], handles[4])
+        # The hollow section's outer outline lies within the border too
+        self.assertEqual(profiles[0]["parent"], handles[4])
+        self.assertNotIn("parent", profiles[3])
+
+    def test_parents_need_real_containment(self):
+        # The triangle's bounding box encloses the square, the triangle doesn't
+        entities = [{"points": [(0, 0), (100, 0), (0, 100)]}, {"points": [(70, 70), (80, 70), (80, 80), (70, 80)]},
+                    {"points": [(10, 10), (20, 10), (20, 20), (10, 20)]}]
+        self.assertEqual(find_parents(entities).tolist(), [-1, -1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import ezdxf
+import io
+import sys
+import os
+import tempfile
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.services.dxf_service import DXFService
+from backend.services.dxf_template import DXFTemplatePool
+
+class LayeredColumn(Column):
+    def draw(self, msp):
+        msp.doc.layers.add("PROFILE")
+        msp.add_lwpolyline([(0, 0), (self.width, 0), (self.width, self.height)], dxfattribs={"layer": "PROFILE"})
+
+class TestDXFService(unittest.TestCase):
+    def setUp(self):
+        self.service = DXFService()
+
+    def test_to_bytes_is_readable_dxf(self):
+        content = self.service.to_bytes(IBeam(H=200, B=100, tw=10, tf=15))
+        doc = ezdxf.read(io.StringIO(content.decode('utf-8')))
+        polylines = doc.modelspace().query('LWPOLYLINE')
+        self.assertEqual(len(polylines), 1)
+        self.assertEqual(len(polylines[0]), 12)
+
+    def test_stream_chunks_reassemble(self):
+        service = DXFService(chunk_size=1024)
+        chunks = list(service.stream(Column(width=100, height=200)))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        content = b"".join(chunks)
+        self.assertTrue(content.rstrip().endswith(b"EOF"))
+
+    def test_template_render_is_deterministic(self):
+        beam = IBeam(H=200, B=100, tw=10, tf=15)
+        self.assertEqual(self.service.to_bytes(beam), self.service.to_bytes(beam))
+
+    def test_template_matches_full_document(self):
+        beam = IBeam(H=200, B=100, tw=10, tf=15)
+        doc = ezdxf.read(io.StringIO(self.service.to_bytes(beam).decode('utf-8')))
+        self.assertFalse(doc.audit().has_errors)
+        reference = self.service.build_document(beam).modelspace().query('LWPOLYLINE')[0]
+        rendered = doc.modelspace().query('LWPOLYLINE')[0]
+        self.assertEqual(list(rendered.get_points()), list(reference.get_points()))
+        self.assertTrue(rendered.closed)
+
+    def test_template_falls_back_for_document_resources(self):
+        pool = DXFTemplatePool(size=1)
+        self.assertIsNone(pool.render(LayeredColumn(width=100, height=200)))
+        # The pool recovers and keeps rendering plain components
+        self.assertIsNotNone(pool.render(Column(width=100, height=200)))
+
+        service = DXFService(template=pool)
+        doc = ezdxf.read(io.StringIO(service.to_bytes(LayeredColumn(width=100, height=200)).decode('utf-8')))
+        self.assertIn("PROFILE", doc.layers)
+
+    def test_batch_results_keep_input_order(self):
+        components = [
+            IBeam(H=200, B=100, tw=10, tf=15),
+            Column(width="bad", height=200),
+            Column(width=100, height=200),
+            IBeam(H=300, B=150, tw=7, tf=10),
+        ]
+        for mode in ("inline", "thread", "process"):
+            with self.subTest(executor=mode):
+                with DXFService(max_workers=2, executor=mode, batch_chunksize=2) as service:
+                    with self.assertLogs('backend.services.dxf_service', level='WARNING') as logs:
+                        contents = service.render_batch(components)
+                self.assertIn("Error generating DXF #1", logs.output[0])
+                self.assertIsNone(contents[1])
+                for index in (0, 2, 3):
+                    self.assertIsNotNone(contents[index])
+                    self.assertEqual(contents[index], self.service.to_bytes(components[index]))
+
+    def test_save_batch_keeps_input_order(self):
+        components = [Column(width=100, height=200), Column(width="bad", height=200), IBeam(H=200, B=100, tw=10, tf=15)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filenames = [os.path.join(tmp_dir, f"{i}.dxf") for i in range(len(components))]
+            with DXFService(max_workers=2, executor="process") as service:
+                with self.assertLogs('backend.services.dxf_service', level='WARNING'):
+                    saved = service.save_batch(components, filenames)
+            self.assertEqual(saved, [filenames[0], None, filenames[2]])
+
+    def test_save_stream_is_lazy_and_ordered(self):
+        consumed = []
+
+        def items(tmp_dir):
+            for i in range(20):
+                consumed.append(i)
+                yield ("column", (("width", 100 + i), ("height", 200))), os.path.join(tmp_dir, f"{i}.dxf")
+
+        for mode in ("thread", "process"):
+            with self.subTest(executor=mode):
+                consumed.clear()
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    with DXFService(max_workers=2, executor=mode, batch_chunksize=2) as service:
+                        stream = service.iter_save_stream(items(tmp_dir), window=2)
+                        filename, error = next(stream)
+                        # Only the in-flight window has been pulled from the input
+                        self.assertLessEqual(len(consumed), 4)
+                        results = [(filename, error)] + list(stream)
+                    self.assertEqual([r[0] for r in results], [os.path.join(tmp_dir, f"{i}.dxf") for i in range(20)])
+                    self.assertTrue(all(error is None for _, error in results))
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            DXFService(executor="fibers")
+
+    def test_save_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "column.dxf")
+            saved = self.service.save(Column(width=100, height=200), filename=path)
+            self.assertEqual(saved, path)
+            doc = ezdxf.readfile(path)
+            self.assertEqual(len(doc.modelspace().query('LWPOLYLINE')), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.job_queue import JobQueue
+from backend.services.worker_pool import PoolSaturatedError
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.ran = []
+        self.queue = self.make_queue()
+
+    def make_queue(self, **kwargs):
+        return JobQueue(self.tmp_dir.name, {"echo": self.echo}, progress_interval=0, **kwargs)
+
+    def echo(self, job):
+        self.ran.append(job.payload["name"])
+        for done in range(1, job.total + 1):
+            job.progress(done)
+        with open(job.result_path, "w") as f:
+            f.write(job.payload["name"])
+
+    def test_runs_by_priority_then_submission_order(self):
+        for name, priority in (("low", 0), ("high", 5), ("low2", 0), ("urgent", 9)):
+            self.queue.submit("echo", {"name": name}, priority=priority)
+        while self.queue.run_next():
+            pass
+        self.assertEqual(self.ran, ["urgent", "high", "low", "low2"])
+
+    def test_result_and_progress(self):
+        job_id = self.queue.submit("echo", {"name": "a"}, total=3)
+        self.assertEqual(self.queue.get(job_id)["status"], "queued")
+        self.assertIsNone(self.queue.result_path(job_id))
+        self.queue.run_next()
+        job = self.queue.get(job_id)
+        self.assertEqual((job["status"], job["done"], job["attempts"]), ("done", 3, 1))
+        with open(self.queue.result_path(job_id)) as f:
+            self.assertEqual(f.read(), "a")
+        self.assertEqual(os.listdir(self.queue.results_dir), [f"{job_id}.zip"])
+
+    def test_cancel_running_job_stops_at_next_progress(self):
+        def cancel_midway(job):
+            job.progress(1)
+            self.queue.cancel(job.id)
+            job.progress(2)
+            self.fail("progress should raise after cancellation")
+        self.queue.handlers["slow"] = cancel_midway
+        job_id = self.queue.submit("slow", {}, total=5)
+        self.queue.run_next()
+        job = self.queue.get(job_id)
+        self.assertEqual((job["status"], job["done"]), ("cancelled", 1))
+        self.assertEqual(os.listdir(self.queue.results_dir), [])
+
+    def test_cancel_queued_and_delete_finished(self):
+        queued = self.queue.submit("echo", {"name": "q"})
+        self.assertEqual(self.queue.cancel(queued), "cancelled")
+        self.assertFalse(self.queue.run_next())
+        finished = self.queue.submit("echo", {"name": "f"})
+        self.queue.run_next()
+        self.assertEqual(self.queue.cancel(finished), "deleted")
+        self.assertIsNone(self.queue.get(finished))
+        self.assertIsNone(self.queue.result_path(finished))
+        self.assertIsNone(self.queue.cancel("missing"))
+
+    def test_failed_handler(self):
+        def broken(job):
+            raise RuntimeError("boom")
+        self.queue.handlers["broken"] = broken
+        job_id = self.queue.submit("broken", {})
+        self.queue.run_next()
+        job = self.queue.get(job_id)
+        self.assertEqual((job["status"], job["error"]), ("failed", "boom"))
+
+    def test_queued_jobs_survive_restart(self):
+        job_id = self.queue.submit("echo", {"name": "persisted"})
+        restarted = self.make_queue()
+        self.assertTrue(restarted.run_next())
+        self.assertEqual(restarted.get(job_id)["status"], "done")
+
+    def test_stale_running_job_is_requeued(self):
+        queue = self.make_queue(stale_after=0, max_attempts=2)
+        job_id = queue.submit("echo", {"name": "orphan"})
+        queue._claim()  # a worker claims it and dies
+        time.sleep(0.01)
+        queue.expire()
+        self.assertEqual(queue.get(job_id)["status"], "queued")
+        queue._claim()
+        time.sleep(0.01)
+        queue.expire()
+        job = queue.get(job_id)
+        self.assertEqual((job["status"], job["attempts"]), ("failed", 2))
+
+    def test_requeued_job_is_taken_from_a_slow_worker(self):
+        takeover = []
+
+        def slow(job):
+            job.progress(1)
+            # Janitor decides this worker is dead; another worker claims the job
+            self.queue._connect().execute("UPDATE jobs SET heartbeat = 0 WHERE id = ?", (job.id,))
+            self.queue.expire()
+            takeover.append(self.queue._claim())
+            with open(job.result_path, "w") as f:
+                f.write("stale")
+            job.progress(2)
+            self.fail("progress should raise once another worker holds the claim")
+        self.queue.handlers["slow"] = slow
+        job_id = self.queue.submit("slow", {}, total=2)
+        self.queue.run_next()
+
+        row, claim = takeover[0]
+        job = self.queue.get(job_id)
+        self.assertEqual((row["id"], job["status"], job["attempts"]), (job_id, "running", 2))
+        self.assertEqual(os.listdir(self.queue.results_dir), [])
+        # The new run finishes; a leftover finish from the old claim would not
+        result = os.path.join(self.queue.results_dir, "new")
+        with open(result, "w") as f:
+            f.write("fresh")
+        self.assertFalse(self.queue._finish(job_id, "old-claim", "done"))
+        self.assertTrue(self.queue._finish(job_id, claim, "done", result=result))
+        with open(self.queue.result_path(job_id)) as f:
+            self.assertEqual(f.read(), "fresh")
+
+    def test_finished_jobs_expire(self):
+        queue = self.make_queue(ttl=0)
+        job_id = queue.submit("echo", {"name": "old"})
+        queue.run_next()
+        time.sleep(0.01)
+        self.assertEqual(queue.expire(), 1)
+        self.assertIsNone(queue.get(job_id))
+        self.assertEqual(os.listdir(queue.results_dir), [])
+
+    def test_bounded_queue(self):
+        queue = self.make_queue(max_queued=1)
+        queue.submit("echo", {"name": "one"})
+        with self.assertRaises(PoolSaturatedError):
+            queue.submit("echo", {"name": "two"})
+        with self.assertRaises(ValueError):
+            queue.submit("unknown", {})
+
+    def test_worker_threads(self):
+        self.queue.start()
+        self.addCleanup(self.queue.stop)
+        job_id = self.queue.submit("echo", {"name": "threaded"}, total=2)
+        deadline = time.time() + 5
+        while self.queue.get(job_id)["status"] != "done" and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.queue.get(job_id)["status"], "done")
+
+if __name__ == '__main__':
+    unittest.main()
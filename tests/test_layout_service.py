@@ -0,0 +1,65 @@
+import unittest
+import ezdxf
+import io
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.services.layout_service import SheetLayout
+
+def _overlaps(a, b):
+    return a.x_min < b.x_max and b.x_min < a.x_max and a.y_min < b.y_max and b.y_min < a.y_max
+
+class _Box:
+    def __init__(self, placement, component):
+        points = component.get_points()
+        self.x_min = placement.x + min(p[0] for p in points)
+        self.y_min = placement.y + min(p[1] for p in points)
+        self.x_max = self.x_min + placement.width
+        self.y_max = self.y_min + placement.height
+
+class TestSheetLayout(unittest.TestCase):
+    def setUp(self):
+        self.components = [
+            IBeam(H=200, B=100, tw=5.6, tf=8.5),
+            Column(width=100, height=200),
+            IBeam(H=200, B=100, tw=5.6, tf=8.5),
+            IBeam(H=400, B=180, tw=8.6, tf=13.5),
+            Column(width=200, height=400),
+            Column(width=100, height=200),
+        ]
+
+    def _assert_no_overlap(self, layout):
+        placements = layout.place(self.components)
+        boxes = [_Box(p, c) for p, c in zip(placements, self.components)]
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                self.assertFalse(_overlaps(a, b))
+
+    def test_shelf_layout_has_no_overlaps(self):
+        self._assert_no_overlap(SheetLayout(mode="shelf", spacing=10))
+        self._assert_no_overlap(SheetLayout(mode="shelf", spacing=0, sheet_width=300))
+
+    def test_grid_layout_has_no_overlaps(self):
+        self._assert_no_overlap(SheetLayout(mode="grid", spacing=10))
+        self._assert_no_overlap(SheetLayout(mode="grid", spacing=10, sheet_width=500))
+
+    def test_repeated_components_share_blocks(self):
+        doc = ezdxf.read(io.StringIO(SheetLayout().to_bytes(self.components).decode('utf-8')))
+        inserts = doc.modelspace().query('INSERT')
+        self.assertEqual(len(inserts), len(self.components))
+        block_names = {insert.dxf.name for insert in inserts}
+        self.assertEqual(len(block_names), 4)
+        for name in block_names:
+            self.assertEqual(len(doc.blocks.get(name).query('LWPOLYLINE')), 1)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            SheetLayout(mode="spiral")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import time
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.metrics import Histogram, MetricsRegistry, SamplingProfiler, ProfileStore
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_render(self):
+        histogram = Histogram("test_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="draw")
+        histogram.observe(0.5, stage="draw")
+        histogram.observe(5, stage="draw")
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{stage="draw",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{stage="draw",le="1.0"} 2', lines)
+        self.assertIn('test_seconds_bucket{stage="draw",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{stage="draw"} 3', lines)
+        self.assertIn('test_seconds_sum{stage="draw"} 5.55', lines)
+
+    def test_callback_metrics(self):
+        registry = MetricsRegistry()
+        registry.register_callback("queue_depth", "Depth.", lambda: 3)
+        registry.register_callback("disk_bytes", "Disk.", lambda: [({"kind": "used"}, 10)])
+        registry.register_callback("broken", "Broken.", lambda: 1 / 0)
+        text = registry.render()
+        self.assertIn("queue_depth 3.0", text)
+        self.assertIn('disk_bytes{kind="used"} 10.0', text)
+        self.assertIn("# TYPE broken gauge", text)
+
+    def test_sampling_profiler_sees_hot_function(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            _busy_loop(0.05)
+        report = profiler.report()
+        self.assertGreater(report["samples"], 0)
+        self.assertTrue(any("_busy_loop" in entry["stack"] for entry in report["stacks"]))
+
+    def test_profile_store(self):
+        store = ProfileStore(max_entries=1)
+        wrapped, profile_id = store.profiled(_busy_loop)
+        wrapped(0.01)
+        self.assertIsNotNone(store.get(profile_id))
+        other, other_id = store.profiled(_busy_loop)
+        other(0.01)
+        self.assertIsNone(store.get(profile_id))
+        self.assertIsNotNone(store.get(other_id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.artifact_store import ArtifactStore
+from backend.services.parse_cache import ParseCache, upload_digest
+
+class TestParseCache(unittest.TestCase):
+
+    def test_digest_depends_on_content_and_mode(self):
+        stream = io.BytesIO(b"0\nSECTION\n" * 1000)
+        digest = upload_digest(stream, "first", chunk_size=7)
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(digest, upload_digest(stream, "first"))
+        self.assertNotEqual(digest, upload_digest(stream, "bulk"))
+        self.assertNotEqual(digest, upload_digest(io.BytesIO(b"0\nSECTION\n"), "first"))
+
+    def test_hits_and_misses(self):
+        cache = ParseCache()
+        key = cache.key(io.BytesIO(b"content"), "first")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"type": "column", "params": {"width": 100, "height": 200}})
+        self.assertEqual(cache.get(key)["params"]["width"], 100)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_bounded_by_entries(self):
+        cache = ParseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, [key])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), ["c"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_entries_survive_restart(self):
+        with tempfile.TemporaryDirectory() as root:
+            ParseCache(store=ArtifactStore(root, max_bytes=1024 * 1024, suffix=".json")).put("k", [{"type": "unknown"}])
+            cache = ParseCache(store=ArtifactStore(root, max_bytes=1024 * 1024, suffix=".json"))
+            self.assertEqual(cache.get("k"), [{"type": "unknown"}])
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            # Promoted to memory, so the next lookup doesn't touch the disk
+            self.assertEqual(cache.get("k"), [{"type": "unknown"}])
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertIn("disk", cache.stats())
+
+if __name__ == '__main__':
+    unittest.main()
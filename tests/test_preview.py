@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import struct
+import zlib
+import xml.etree.ElementTree as ET
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.preview import PreviewRenderer, component_outlines, encode_png, rasterize, sprite_grid
+from backend.components.beam import IBeam
+
+def decode_png(data):
+    """Reads back the encoder's output: (width, height, color type, rows)."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position, chunks = 8, {}
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        assert struct.unpack(">I", data[position + 8 + length:position + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = body
+        position += 12 + length
+    width, height, _, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    channels = {4: 2, 6: 4}[color_type]
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, 1 + width * channels)
+    return width, height, color_type, raw[:, 1:].reshape(height, width, channels)
+
+class TestPreview(unittest.TestCase):
+    def test_outlines_match_draw(self):
+        beam = IBeam(H=200, B=100, tw=10, tf=15)
+        outlines = component_outlines("beam", {"H": 200, "B": 100, "tw": 10, "tf": 15})
+        self.assertEqual(outlines, [[list(p) for p in beam.get_points()]])
+        self.assertEqual(len(component_outlines("hollow", {"H": 100, "B": 50, "t": 5})), 2)
+
+    def test_rasterize_even_odd(self):
+        square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+        hole = [(2, 2), (2, 8), (8, 8), (8, 2)]
+        coverage = rasterize([square, hole], 12, 12)
+        self.assertAlmostEqual(coverage.sum(), 100 - 36)
+        self.assertEqual(coverage[5, 5], 0)
+        self.assertEqual(coverage[1, 1], 1)
+        # Half-pixel edges are antialiased
+        self.assertAlmostEqual(rasterize([[(0, 0), (2.5, 0), (2.5, 1), (0, 1)]], 3, 1)[0, 2], 0.5)
+
+    def test_rasterize_bands_match_single_pass(self):
+        beam = [(x * 0.3 + 4, y * 0.3 + 40) for x, y in IBeam(H=200, B=100, tw=10, tf=15).get_points()]
+        square = [(50, 5), (95, 5), (95, 95), (50, 95)]
+        np.testing.assert_array_equal(rasterize([beam, square], 100, 100, band_rows=7),
+                                      rasterize([beam, square], 100, 100, band_rows=100))
+
+    def test_png_round_trip(self):
+        pixels = np.random.default_rng(0).integers(0, 256, (5, 7, 4), dtype=np.uint8)
+        width, height, color_type, decoded = decode_png(encode_png(pixels))
+        self.assertEqual((width, height, color_type), (7, 5, 6))
+        np.testing.assert_array_equal(decoded, pixels)
+
+    def test_png_thumbnail(self):
+        renderer = PreviewRenderer(size=64)
+        _, _, _, pixels = decode_png(renderer.png(component_outlines("column", {"width": 100, "height": 200})))
+        alpha = pixels[..., 3]
+        # Centred 2:1 rectangle inside the padding
+        self.assertEqual(alpha[32, 32], 255)
+        self.assertEqual(alpha[32, 2], 0)
+        self.assertEqual(alpha[2, 32], 0)
+
+    def test_svg(self):
+        svg = PreviewRenderer(size=100, padding=10).svg(component_outlines("column", {"width": 50, "height": 100}))
+        root = ET.fromstring(svg)
+        self.assertEqual(root.get("viewBox"), "0 0 100 100")
+        path = root.find("{http://www.w3.org/2000/svg}path")
+        self.assertEqual(path.get("d"), "M30.00,90.00 L70.00,90.00 L70.00,10.00 L30.00,10.00Z")
+        self.assertEqual(path.get("fill-rule"), "evenodd")
+
+    def test_sprite(self):
+        renderer = PreviewRenderer(size=32)
+        tiles = [component_outlines("column", {"width": 10, "height": 10}), None, component_outlines("column", {"width": 10, "height": 20})]
+        content, columns = renderer.sprite(tiles, "png")
+        width, height, _, pixels = decode_png(content)
+        self.assertEqual((columns, width, height), (2, 64, 64))
+        self.assertGreater(pixels[:32, :32, 3].sum(), 0)
+        self.assertEqual(pixels[:32, 32:, 3].sum(), 0)
+        self.assertGreater(pixels[32:, :32, 3].sum(), 0)
+        svg, _ = renderer.sprite(tiles, "svg", columns=3)
+        self.assertEqual(len(ET.fromstring(svg).findall("{http://www.w3.org/2000/svg}g")), 2)
+        with self.assertRaises(ValueError):
+            renderer.sprite(tiles, "gif")
+        # Columns never exceed the tile count
+        self.assertEqual(sprite_grid(3, 10 ** 7), (3, 1))
+        self.assertEqual(sprite_grid(5), (3, 2))
+        with self.assertRaises(ValueError):
+            PreviewRenderer(size=2048).sprite([None] * 5, "png")
+        with self.assertRaises(ValueError):
+            PreviewRenderer(size=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.base_component import BaseComponent
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.components.registry import (register_component, unregister_component, get_spec, spec_for, component_types,
+                                         specs_for_vertex_count)
+from backend.interfaces.dxf_generator_interface import DXFGeneratorInterface
+from backend.interfaces.validator import Validator
+from backend.services.dxf_parser import classify_points
+from backend.services.section_properties import batch_section_properties
+
+class Triangle(BaseComponent):
+    component_type = "triangle"
+    parameters = (
+        ("base", 1, 1000, "Base"),
+        ("height", 1, 1000, "Height"),
+    )
+    vertex_count = 3
+
+    def __init__(self, base, height):
+        self.base = base
+        self.height = height
+
+    def get_points(self):
+        return [(0, 0), (self.base, 0), (0, self.height)]
+
+    @staticmethod
+    def points_array(base, height):
+        base = np.asarray(base, dtype=float)
+        height = np.asarray(height, dtype=float)
+        zeros = np.zeros_like(base + height)
+        xs = np.stack([zeros, base + zeros, zeros], axis=-1)
+        ys = np.stack([zeros, zeros, height + zeros], axis=-1)
+        return np.stack([xs, ys], axis=-1)
+
+    @staticmethod
+    def params_from_points(coords):
+        extent = coords.max(axis=1) - coords.min(axis=1)
+        return {'base': extent[:, 0], 'height': extent[:, 1]}
+
+    def draw(self, msp):
+        msp.add_lwpolyline(self.get_points(), close=True)
+
+class Diamond(BaseComponent):
+    """Four vertices, like Column, so both are candidates for a 4-point polyline."""
+    component_type = "diamond"
+    parameters = (
+        ("width", 1, 1000, "Width"),
+        ("height", 1, 1000, "Height"),
+    )
+    vertex_count = 4
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def get_points(self):
+        return [tuple(p) for p in self.points_array(self.width, self.height)[0].tolist()]
+
+    @staticmethod
+    def points_array(width, height):
+        half_w = np.atleast_1d(np.asarray(width, dtype=float)) / 2
+        half_h = np.atleast_1d(np.asarray(height, dtype=float)) / 2
+        zeros = np.zeros_like(half_w + half_h)
+        xs = np.stack([zeros, half_w + zeros, zeros, -half_w + zeros], axis=-1)
+        ys = np.stack([-half_h + zeros, zeros, half_h + zeros, zeros], axis=-1)
+        return np.stack([xs, ys], axis=-1)
+
+    @staticmethod
+    def params_from_points(coords):
+        extent = coords.max(axis=1) - coords.min(axis=1)
+        return {'width': extent[:, 0], 'height': extent[:, 1]}
+
+    def draw(self, msp):
+        msp.add_lwpolyline(self.get_points(), close=True)
+
+class TestRegistry(unittest.TestCase):
+    def test_builtin_components_registered(self):
+        self.assertEqual(component_types()[:2], ["beam", "column"])
+        self.assertIs(get_spec("beam").cls, IBeam)
+        self.assertEqual(get_spec("column").param_names, ("width", "height"))
+        self.assertIs(spec_for(Column(10, 20)).cls, Column)
+        self.assertEqual(Validator.validation_rules['beam']['tw']['description'], "Web thickness (tw)")
+
+    def test_unknown_type(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported component type"):
+            get_spec("channel")
+        self.assertEqual(Validator.validate("channel", {}), (False, "Invalid component type"))
+        self.assertNotIn("channel", Validator.validation_rules)
+
+    def test_duplicate_registration_rejected(self):
+        with self.assertRaises(ValueError):
+            register_component(IBeam)
+
+    def test_new_component_flows_through_every_path(self):
+        register_component(Triangle)
+        self.addCleanup(unregister_component, "triangle")
+
+        component = DXFGeneratorInterface("triangle", {"base": 30, "height": 40}).get_component()
+        self.assertIsInstance(component, Triangle)
+        self.assertEqual(DXFGeneratorInterface.describe(component), ("triangle", {"base": 30, "height": 40}))
+
+        self.assertEqual(Validator.validate("triangle", {"base": 30, "height": 40}), (True, ""))
+        is_valid, error_msg = Validator.validate("triangle", {"base": 3000, "height": 40})
+        self.assertFalse(is_valid)
+        self.assertIn("Base must be between", error_msg)
+
+        self.assertEqual(classify_points(component.get_points()),
+                         {"type": "triangle", "params": {"base": 30.0, "height": 40.0}})
+        area = batch_section_properties("triangle", {"base": [30], "height": [40]})["area"]
+        self.assertAlmostEqual(float(area[0]), 600.0)
+
+    def test_components_may_share_a_vertex_count(self):
+        register_component(Diamond)
+        self.addCleanup(unregister_component, "diamond")
+        self.assertEqual([spec.component_type for spec in specs_for_vertex_count(4)], ["column", "diamond"])
+
+        rectangle = [(x + 500, y - 20) for x, y in Column(30, 40).get_points()]
+        self.assertEqual(classify_points(rectangle), {"type": "column", "params": {"width": 30.0, "height": 40.0}})
+        self.assertEqual(classify_points(Diamond(30, 40).get_points()), {"type": "diamond", "params": {"width": 30.0, "height": 40.0}})
+        # Shapes neither redraws exactly fall back to the first registered candidate
+        self.assertEqual(classify_points([(0, 0), (10, 0), (12, 5), (0, 5)])["type"], "column")
+
+if __name__ == '__main__':
+    unittest.main()
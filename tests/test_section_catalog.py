@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.section_catalog import SectionCatalog, normalize_designation, get_section_catalog
+from backend.services.dxf_service import DXFService
+from backend.services.dxf_template import get_template_pool
+
+class TestSectionCatalog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.catalog = get_section_catalog()
+
+    def test_normalize_designation(self):
+        self.assertEqual(normalize_designation(" ipe 200 "), "IPE200")
+        self.assertEqual(normalize_designation("HE 200 A"), "HEA200")
+        self.assertEqual(normalize_designation("shs 100x5"), "SHS100X100X5")
+        self.assertEqual(normalize_designation("RHS 200×100×6.3"), "RHS200X100X6.3")
+        self.assertEqual(normalize_designation("SHS100X100X5.0"), "SHS100X100X5")
+
+    def test_lookup(self):
+        entry = self.catalog.get("IPE200")
+        self.assertEqual(entry.component_type, "beam")
+        self.assertEqual(entry.params, {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5})
+        # Sharp-corner area: 2 flanges + web
+        self.assertAlmostEqual(entry.properties["area"], 2 * 100 * 8.5 + (200 - 17) * 5.6)
+        self.assertAlmostEqual(entry.properties["mass"], entry.properties["area"] * 7.85e-3)
+        self.assertIsNone(self.catalog.get("IPE201"))
+        self.assertEqual(self.catalog.get("SHS100X100X10").component_type, "hollow")
+
+    def test_query_matches_linear_scan(self):
+        ranges = {"Ix": (1e7, 1e8), "mass": (None, 60)}
+        found = {e.designation for e in self.catalog.query(ranges)}
+        expected = {
+            e.designation for e in self.catalog.entries
+            if 1e7 <= e.properties["Ix"] <= 1e8 and e.properties["mass"] <= 60
+        }
+        self.assertTrue(found)
+        self.assertEqual(found, expected)
+
+    def test_query_missing_field_never_matches(self):
+        # Hollow sections have no web thickness
+        families = {e.family for e in self.catalog.query({"tw": (0, None)})}
+        self.assertEqual(families, {"IPE", "HEA", "HEB"})
+
+    def test_query_family_sort_and_limit(self):
+        lightest = self.catalog.query(family="rhs", sort="mass", limit=3)
+        masses = [e.properties["mass"] for e in lightest]
+        self.assertEqual(len(lightest), 3)
+        self.assertEqual(masses, sorted(masses))
+        self.assertTrue(all(e.family == "RHS" for e in lightest))
+        with self.assertRaises(ValueError):
+            self.catalog.query({"depth": (0, 1)})
+        with self.assertRaises(ValueError):
+            self.catalog.query(family="UPN")
+        with self.assertRaises(ValueError):
+            self.catalog.query(limit=-3)
+        self.assertEqual(self.catalog.query(limit=0), [])
+
+    def test_warm(self):
+        catalog = SectionCatalog(rows=[
+            ("IPE200", "IPE", "beam", {"H": 200, "B": 100, "tw": 5.6, "tf": 8.5}),
+            ("SHS100X100X5", "SHS", "hollow", {"H": 100, "B": 100, "t": 5}),
+        ])
+        self.assertIsNone(catalog.dxf(catalog.get("IPE200")))
+        catalog.warm(DXFService(template=get_template_pool()).to_bytes)
+        content = catalog.dxf(catalog.get("SHS100X100X5"))
+        self.assertEqual(content.count(b"LWPOLYLINE"), 2)
+        self.assertEqual(catalog.warmed_bytes, len(content) + len(catalog.dxf(catalog.get("IPE200"))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.components.beam import IBeam
+from backend.components.column import Column
+from backend.services.section_properties import (component_properties, polygon_properties, batch_section_properties,
+                                                batch_polygon_properties)
+
+class TestSectionProperties(unittest.TestCase):
+
+    def test_rectangle(self):
+        props = component_properties(Column(width=100, height=200))
+        self.assertAlmostEqual(props["area"], 20000)
+        self.assertAlmostEqual(props["cx"], 50)
+        self.assertAlmostEqual(props["cy"], 100)
+        self.assertAlmostEqual(props["Ix"], 100 * 200 ** 3 / 12)
+        self.assertAlmostEqual(props["Iy"], 200 * 100 ** 3 / 12)
+        self.assertAlmostEqual(props["Sx"], 100 * 200 ** 2 / 6)
+        self.assertAlmostEqual(props["rx"], 200 / np.sqrt(12))
+
+    def test_ibeam_matches_closed_form(self):
+        H, B, tw, tf = 200, 100, 5.6, 8.5
+        props = component_properties(IBeam(H, B, tw, tf))
+        self.assertAlmostEqual(props["area"], 2 * B * tf + (H - 2 * tf) * tw)
+        self.assertAlmostEqual(props["cx"], 0)
+        self.assertAlmostEqual(props["cy"], 0)
+        self.assertAlmostEqual(props["Ix"], B * H ** 3 / 12 - (B - tw) * (H - 2 * tf) ** 3 / 12)
+        self.assertAlmostEqual(props["Iy"], 2 * tf * B ** 3 / 12 + (H - 2 * tf) * tw ** 3 / 12)
+        self.assertAlmostEqual(props["Sx"], props["Ix"] / (H / 2))
+
+    def test_winding_order_does_not_matter(self):
+        points = Column(width=30, height=70).get_points()
+        forward = polygon_properties(points)
+        backward = polygon_properties(points[::-1])
+        for name in forward:
+            self.assertAlmostEqual(forward[name], backward[name])
+
+    def test_batch_matches_single(self):
+        params = {"H": [200, 400, 96], "B": [100, 180, 100], "tw": [5.6, 8.6, 5], "tf": [8.5, 13.5, 8]}
+        batch = batch_section_properties("beam", params)
+        for i in range(3):
+            single = component_properties(IBeam(params["H"][i], params["B"][i], params["tw"][i], params["tf"][i]))
+            for name, value in single.items():
+                self.assertAlmostEqual(batch[name][i], value)
+
+    def test_degenerate_polygon(self):
+        with self.assertRaises(ValueError):
+            polygon_properties([(0, 0), (1, 1), (2, 2)])
+        vertices = np.array([[(0, 0), (2, 0), (2, 1), (0, 1)], [(0, 0), (1, 1), (2, 2), (3, 3)]], dtype=float)
+        properties = batch_polygon_properties(vertices, allow_degenerate=True)
+        self.assertEqual(properties["area"][0], 2)
+        self.assertTrue(all(np.isnan(values[1]) for values in properties.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.spatial_index import GridIndex, polyline_bounds
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def test_polyline_bounds(self):
+        entities = [{"points": [[0, 0], [4, 1], [2, 3]]}, {"points": []}, {"points": [(5, -1), (6, 2)]}]
+        bounds = polyline_bounds(entities)
+        self.assertEqual(bounds[0].tolist(), [0, 0, 4, 3])
+        self.assertTrue(np.isnan(bounds[1]).all())
+        self.assertEqual(bounds[2].tolist(), [5, -1, 6, 2])
+
+    def test_containing_matches_pairwise_check(self):
+        rng = np.random.default_rng(7)
+        low = rng.uniform(0, 1000, size=(400, 2))
+        size = rng.uniform(1, 120, size=(400, 2))
+        bounds = np.concatenate([low, low + size], axis=1)
+        # A sheet border spanning everything, on the coarsest level
+        bounds = np.concatenate([bounds, [[-1, -1, 2000, 2000]]])
+        children, parents = GridIndex(bounds).containing(bounds)
+        found = set(zip(children.tolist(), parents.tolist()))
+
+        expected = set()
+        for i, inner in enumerate(bounds):
+            for j, outer in enumerate(bounds):
+                if (outer[:2] < inner[:2]).all() and (outer[2:] > inner[2:]).all():
+                    expected.add((i, j))
+        self.assertEqual(found, expected)
+        self.assertIn((0, 400), found)
+
+    def test_mixed_box_sizes(self):
+        # Framed parts with many tiny markers: frames must not be checked against every query
+        parts = 400
+        origin = np.stack([np.arange(parts) % 20, np.arange(parts) // 20], axis=1) * 300.0
+        frames = np.concatenate([origin, origin + 200], axis=1)
+        holes = np.concatenate([origin + 10, origin + 190], axis=1)
+        markers = np.concatenate([np.repeat(origin, 8, axis=0) + [220, 0] + np.tile(np.arange(8)[:, None] * [0, 20], (parts, 1)),
+                                  np.repeat(origin, 8, axis=0) + [221, 1] + np.tile(np.arange(8)[:, None] * [0, 20], (parts, 1))], axis=1)
+        bounds = np.concatenate([frames, holes, markers])
+        index = GridIndex(bounds)
+        # Markers sit on the finest level; frames a few levels up cover at most 2 x 2 cells
+        self.assertEqual(index.cell_size, 1.0)
+        for _, _, cells, boxes in index.levels:
+            self.assertLessEqual(len(cells), 4 * len(np.unique(boxes)))
+
+        children, parents = index.containing(bounds)
+        self.assertEqual(sorted(zip(children.tolist(), parents.tolist())), [(parts + i, i) for i in range(parts)])
+
+    def test_empty_and_degenerate_boxes(self):
+        children, parents = GridIndex(np.empty((0, 4))).containing(np.empty((0, 4)))
+        self.assertEqual(len(children), 0)
+        bounds = np.array([[0, 0, 10, 10], [np.nan] * 4, [5, 5, 5, 5]])
+        children, parents = GridIndex(bounds).containing(bounds)
+        self.assertEqual(list(zip(children.tolist(), parents.tolist())), [(2, 0)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import io
+import zipfile
+import ezdxf
+import numpy as np
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.sweep import ParameterSweep, axis_values
+from backend.services.dxf_fast_writer import FastDXFWriter
+from backend.services.dxf_template import get_template_pool
+from backend.interfaces.validator import Validator
+
+class TestParameterSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.writer = FastDXFWriter(get_template_pool())
+
+    def test_axis_values(self):
+        np.testing.assert_allclose(axis_values("H", {"start": 100, "stop": 600, "step": 20}), np.arange(100, 601, 20))
+        np.testing.assert_allclose(axis_values("t", {"start": 0.1, "stop": 0.3, "step": 0.1}), [0.1, 0.2, 0.3])
+        np.testing.assert_allclose(axis_values("tw", 10), [10])
+        np.testing.assert_allclose(axis_values("tw", [8, 10]), [8, 10])
+        with self.assertRaises(ValueError):
+            axis_values("H", {"start": 100, "stop": 50, "step": 10})
+        with self.assertRaises(ValueError):
+            axis_values("H", {"start": 100, "stop": 200})
+        with self.assertRaises(ValueError):
+            axis_values("H", [200, 200])
+        with self.assertRaises(ValueError):
+            axis_values("H", {"start": 1e6, "stop": 1e6 + 1e-9, "step": 1e-12})
+
+    def test_lazy_expansion_matches_product(self):
+        sweep = ParameterSweep("column", {"width": [10, 20, 30], "height": {"start": 5, "stop": 15, "step": 5}}, block_size=4)
+        self.assertEqual((sweep.shape, sweep.total), ((3, 3), 9))
+        combinations = [(w, h) for _, block in sweep.iter_blocks() for w, h in zip(block["width"], block["height"])]
+        self.assertEqual(combinations, [(w, h) for w in (10, 20, 30) for h in (5, 10, 15)])
+
+    def test_pruning_matches_scalar_validation(self):
+        sweep = ParameterSweep("hollow", {"H": [20, 40, 60], "B": [10, 30], "t": [4, 8, 12]}, block_size=5)
+        kept = {(h, b, t) for _, block in sweep.iter_valid() for h, b, t in zip(block["H"], block["B"], block["t"])}
+        expected = {(h, b, t) for h in (20, 40, 60) for b in (10, 30) for t in (4, 8, 12)
+                    if Validator.check("hollow", {"H": h, "B": b, "t": t}).ok}
+        self.assertEqual(kept, expected)
+        self.assertEqual(sweep.count_valid(), len(expected))
+
+    def test_requires_every_parameter(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep("beam", {"H": 200, "B": 100, "tw": 10})
+        with self.assertRaises(ValueError):
+            ParameterSweep("column", {"width": 1, "height": 1, "depth": 1})
+
+    def test_combination_limit_checked_before_building_axes(self):
+        huge = {"width": {"start": 1, "stop": 1e12, "step": 1e-3}, "height": 100}
+        with self.assertRaises(ValueError) as context:
+            ParameterSweep("column", huge, max_combinations=1000)
+        self.assertIn("the limit is 1000", str(context.exception))
+        with self.assertRaises(ValueError):
+            ParameterSweep("column", {"width": {"start": 0, "stop": 1e300, "step": 1e-300}, "height": 1})
+
+    def test_layout_document(self):
+        sweep = ParameterSweep("beam", {"H": {"start": 100, "stop": 300, "step": 100}, "B": [50, 100], "tw": 10, "tf": 15})
+        estimate = sweep.estimate(self.writer)
+        content = b"".join(sweep.iter_layout(self.writer, spacing=10))
+        self.assertAlmostEqual(len(content), estimate["layout_bytes"], delta=0.1 * len(content))
+        polylines = ezdxf.read(io.StringIO(content.decode(self.writer.encoding))).modelspace().query("LWPOLYLINE")
+        self.assertEqual(len(polylines), 6)
+        # Grid cells don't overlap: the bounding boxes are disjoint
+        boxes = [np.array(p.get_points(format="xy")) for p in polylines]
+        boxes = [(b.min(axis=0), b.max(axis=0)) for b in boxes]
+        for i, (low_a, high_a) in enumerate(boxes):
+            for low_b, high_b in boxes[i + 1:]:
+                self.assertTrue((high_a < low_b).any() or (high_b < low_a).any())
+
+    def test_layout_beyond_reserved_handles(self):
+        writer = FastDXFWriter(get_template_pool())
+        writer.max_entities = 10  # stands in for the template's 65536 reserved handles
+        sweep = ParameterSweep("column", {"width": [1, 2, 3, 4, 5], "height": [1, 2, 3, 4, 5]})
+        content = b"".join(sweep.iter_layout(writer))
+        doc = ezdxf.read(io.StringIO(content.decode(writer.encoding)))
+        self.assertEqual(len(doc.modelspace()), 25)
+        self.assertEqual(int(doc.header["$HANDSEED"], 16), writer.first_handle + 25)
+
+    def test_zip(self):
+        sweep = ParameterSweep("hollow", {"H": [40, 50], "B": 40, "t": [5, 30]})
+        with zipfile.ZipFile(io.BytesIO(b"".join(sweep.iter_zip(self.writer)))) as archive:
+            names = archive.namelist()
+            self.assertEqual(names, ["hollow_H40_B40_t5.dxf", "hollow_H50_B40_t5.dxf"])
+            doc = ezdxf.read(io.StringIO(archive.read(names[0]).decode(self.writer.encoding)))
+            self.assertEqual(len(doc.modelspace().query("LWPOLYLINE")), 2)
+
+    def test_zip_names_keep_full_precision(self):
+        sweep = ParameterSweep("column", {"width": [100, 100.0000001, 100.0000002], "height": 100.5})
+        with zipfile.ZipFile(io.BytesIO(b"".join(sweep.iter_zip(self.writer)))) as archive:
+            self.assertEqual(archive.namelist(), ["column_width100_height100.5.dxf",
+                                                  "column_width100.0000001_height100.5.dxf",
+                                                  "column_width100.0000002_height100.5.dxf"])
+
+if __name__ == '__main__':
+    unittest.main()
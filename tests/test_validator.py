@@ -3,6 +3,7 @@ import sys
 import os
 from unittest.mock import patch
 import io
+import numpy as np
 
 # Add the project root to the sys.path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -11,25 +12,27 @@ from backend.interfaces.validator import Validator
 
 class TestValidator(unittest.TestCase):
 
-    def test_validate_float_valid(self):
-        rule = {'min': 10, 'max': 100, 'description': 'Test Value'}
-        self.assertTrue(Validator._validate_float(50, rule)[0])
-        self.assertTrue(Validator._validate_float(10, rule)[0])
-        self.assertTrue(Validator._validate_float(100, rule)[0])
-
-    def test_validate_float_out_of_range(self):
-        rule = {'min': 10, 'max': 100, 'description': 'Test Value'}
-        self.assertFalse(Validator._validate_float(5, rule)[0])
-        self.assertFalse(Validator._validate_float(105, rule)[0])
-        self.assertEqual(Validator._validate_float(5, rule)[1], "Error: Test Value must be between 10 and 100 mm.")
-        self.assertEqual(Validator._validate_float(105, rule)[1], "Error: Test Value must be between 10 and 100 mm.")
-
-    def test_validate_float_non_numeric(self):
-        rule = {'min': 10, 'max': 100, 'description': 'Test Value'}
-        self.assertFalse(Validator._validate_float("abc", rule)[0])
-        self.assertEqual(Validator._validate_float("abc", rule)[1], "Error: Test Value must be a number.")
-        self.assertFalse(Validator._validate_float(None, rule)[0])
-        self.assertEqual(Validator._validate_float(None, rule)[1], "Error: Test Value must be a number.")
+    def test_value_in_range(self):
+        for width in (1, 50, 100000):
+            self.assertTrue(Validator.check("column", {"width": width, "height": 100}).ok)
+
+    def test_value_out_of_range(self):
+        for width in (0.5, 100001):
+            result = Validator.check("column", {"width": width, "height": 100})
+            self.assertFalse(result.ok)
+            self.assertEqual(result.message, "Error: Width must be between 1 and 100000 mm.")
+
+    def test_value_non_numeric(self):
+        for width in ("abc", None):
+            result = Validator.check("column", {"width": width, "height": 100})
+            self.assertFalse(result.ok)
+            self.assertEqual(result.message, "Error: Width must be a number.")
+
+    def test_rules_are_compiled_on_first_use(self):
+        with patch.dict(Validator._compiled, clear=True):
+            self.assertNotIn("column", Validator._compiled)
+            compiled = Validator.compile("column")
+            self.assertIs(Validator.compile("column"), compiled)
 
     def test_validate_beam_valid(self):
         params = {'H': 200, 'B': 100, 'tw': 10, 'tf': 15}
@@ -58,10 +61,60 @@ class TestValidator(unittest.TestCase):
 
     def test_validate_beam_H_B_ratio_warning(self):
         params = {'H': 1500, 'B': 100, 'tw': 10, 'tf': 15} # H/B = 15 > 10
-        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+        with self.assertLogs('backend.interfaces.validator', level='WARNING') as logs:
             # This should still return True as it's a warning, not an error
             self.assertTrue(Validator.validate_beam(params)[0])
-            self.assertIn("Warning: H/B ratio exceeds 10", fake_out.getvalue())
+        self.assertIn("H/B ratio exceeds 10", logs.output[0])
+
+    def test_validate_does_not_print(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            Validator.validate_beam({'H': 200, 'B': 100, 'tw': 10, 'tf': 15})
+            Validator.validate_column({'width': 0, 'height': 500})
+        self.assertEqual(fake_out.getvalue(), "")
+
+    def test_check_reports_all_violations(self):
+        result = Validator.check('beam', {'H': 0, 'B': 100, 'tw': "x", 'tf': 15})
+        self.assertFalse(result.ok)
+        self.assertEqual(result.errors, [
+            "Error: Total depth (H) must be between 1 and 100000 mm.",
+            "Error: Web thickness (tw) must be a number.",
+        ])
+        self.assertEqual(result.warnings, [])
+
+    def test_check_warning_is_structured(self):
+        result = Validator.check('beam', {'H': 1500, 'B': 100, 'tw': 10, 'tf': 15})
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result.warnings), 1)
+        self.assertIn("H/B ratio exceeds 10", result.warnings[0])
+
+    def test_check_batch(self):
+        columns = {
+            'H': np.array([200, 0, 1500, 200]),
+            'B': np.array([100, 100, 100, 0]),
+            'tw': np.array([10, 10, 10, np.nan]),
+            'tf': np.array([15, 15, 15, 15]),
+        }
+        validation = Validator.check_batch('beam', columns)
+        self.assertFalse(validation.ok)
+        self.assertEqual(validation.invalid.tolist(), [False, True, False, True])
+        self.assertEqual(validation.invalid_count, 2)
+        errors = validation.errors()
+        self.assertEqual([index for index, _ in errors], [1, 3])
+        self.assertEqual(len(errors[1][1]), 2)  # B out of range and tw NaN
+        self.assertEqual(validation.errors(limit=1)[0][0], 1)
+        self.assertEqual([index for index, _ in validation.warnings()], [2])
+
+    def test_check_batch_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        columns = {name: rng.uniform(-10, 2000, 200) for name in ('width', 'height')}
+        validation = Validator.check_batch('column', columns)
+        for i in range(200):
+            scalar = Validator.check('column', {name: float(values[i]) for name, values in columns.items()})
+            self.assertEqual(scalar.ok, not validation.invalid[i])
+
+    def test_check_unknown_type(self):
+        self.assertEqual(Validator.check('channel', {}).errors, ["Invalid component type"])
+        self.assertIsNone(Validator.check_batch('channel', {}))
 
     def test_validate_column_valid(self):
         params = {'width': 100, 'height': 500}
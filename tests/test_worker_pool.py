@@ -0,0 +1,101 @@
+import unittest
+import asyncio
+import threading
+import sys
+import os
+
+# Add the project root to the sys.path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.worker_pool import WorkerPool, PoolSaturatedError
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=1, max_queue=1, retry_after=7)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_run_returns_result(self):
+        self.assertEqual(asyncio.run(self.pool.run(sum, [1, 2, 3])), 6)
+        self.assertEqual(self.pool.in_flight, 0)
+
+    def test_run_propagates_exceptions(self):
+        async def main():
+            return await self.pool.run(int, "not a number")
+        with self.assertRaises(ValueError):
+            asyncio.run(main())
+
+    def test_saturation_and_recovery(self):
+        gate = threading.Event()
+        running = self.pool.submit(gate.wait)
+        queued = self.pool.submit(gate.wait)
+        self.assertEqual(self.pool.in_flight, 2)
+        with self.assertRaises(PoolSaturatedError) as ctx:
+            self.pool.submit(gate.wait)
+        self.assertEqual(ctx.exception.retry_after, 7)
+
+        gate.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        self.assertEqual(asyncio.run(self.pool.run(len, "abc")), 3)
+
+    def test_cancelled_job_releases_its_slot(self):
+        gate = threading.Event()
+        running = self.pool.submit(gate.wait)
+        queued = self.pool.submit(gate.wait)
+        self.assertTrue(queued.cancel())
+        self.assertEqual(self.pool.in_flight, 1)
+        gate.set()
+        running.result(timeout=5)
+
+    def test_streams_hold_a_slot_until_closed(self):
+        first = self.pool.admit_stream(iter([b"a", b"b"]))
+        second = self.pool.admit_stream(iter([b"c"]))
+        self.assertEqual(self.pool.in_flight, 2)
+        with self.assertRaises(PoolSaturatedError):
+            self.pool.admit_stream(iter([]))
+
+        async def consume(stream):
+            return [chunk async for chunk in stream]
+        self.assertEqual(asyncio.run(consume(first)), [b"a", b"b"])
+        self.assertEqual(self.pool.in_flight, 1)
+        # A body that is never iterated releases its slot once dropped
+        del second
+        self.assertEqual(self.pool.in_flight, 0)
+        self.assertEqual(asyncio.run(self.pool.run(sum, [1])), 1)
+
+    def test_stream_chunks_are_produced_on_the_workers(self):
+        threads = []
+
+        def body():
+            for chunk in (b"a", b"b"):
+                threads.append(threading.current_thread().name)
+                yield chunk
+
+        async def consume():
+            return [chunk async for chunk in self.pool.admit_stream(body())]
+        self.assertEqual(asyncio.run(consume()), [b"a", b"b"])
+        self.assertTrue(all(name.startswith("dxf-worker") for name in threads))
+
+    def test_closing_a_stream_closes_its_body(self):
+        closed = threading.Event()
+
+        def body():
+            try:
+                yield b"a"
+                yield b"b"
+            finally:
+                closed.set()
+
+        async def first_chunk():
+            stream = self.pool.admit_stream(body())
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+        self.assertEqual(asyncio.run(first_chunk()), b"a")
+        self.assertTrue(closed.is_set())
+        self.assertEqual(self.pool.in_flight, 0)
+
+if __name__ == '__main__':
+    unittest.main()